@@ -92,6 +92,22 @@ class AdvancedSettingsWindow:
                        variable=self.config_vars['auto_save']).grid(row=row, column=0, sticky=tk.W, pady=2)
         row += 1
         
+        # Compression
+        self.config_vars['compression_enabled'] = tk.BooleanVar()
+        ttk.Checkbutton(general_frame, text="Comprimir gravações salvas", 
+                       variable=self.config_vars['compression_enabled']).grid(row=row, column=0, sticky=tk.W, pady=2)
+        self.config_vars['compression_method'] = tk.StringVar()
+        compression_combo = ttk.Combobox(general_frame, textvariable=self.config_vars['compression_method'],
+                                        values=["zlib", "lzma"], state="readonly", width=15)
+        compression_combo.grid(row=row, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        row += 1
+        
+        # Delta encoding
+        self.config_vars['delta_encoding'] = tk.BooleanVar()
+        ttk.Checkbutton(general_frame, text="Codificar eventos em delta (arquivos menores)", 
+                       variable=self.config_vars['delta_encoding']).grid(row=row, column=0, sticky=tk.W, pady=2)
+        row += 1
+        
         # Sound notification
         self.config_vars['sound_notification'] = tk.BooleanVar()
         ttk.Checkbutton(general_frame, text="Notificações sonoras", 
@@ -131,8 +147,14 @@ class AdvancedSettingsWindow:
                        variable=self.config_vars['include_mouse_moves']).grid(row=row, column=0, sticky=tk.W, pady=2)
         row += 1
         
-        # Max events
-        ttk.Label(capture_frame, text="Máximo de eventos:").grid(row=row, column=0, sticky=tk.W, pady=2)
+        # Streaming recording
+        self.config_vars['streaming_recording'] = tk.BooleanVar()
+        ttk.Checkbutton(capture_frame, text="Gravar em disco durante a captura (journal)", 
+                       variable=self.config_vars['streaming_recording']).grid(row=row, column=0, sticky=tk.W, pady=2)
+        row += 1
+        
+        # Max events (tamanho do segmento mantido em memória no modo streaming)
+        ttk.Label(capture_frame, text="Eventos por segmento:").grid(row=row, column=0, sticky=tk.W, pady=2)
         self.config_vars['max_events'] = tk.IntVar()
         max_events_spinbox = ttk.Spinbox(capture_frame, from_=1000, to=100000, 
                                         textvariable=self.config_vars['max_events'], width=10)
@@ -194,6 +216,30 @@ class AdvancedSettingsWindow:
         speed_spinbox.grid(row=row, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         row += 1
         
+        # Catch-up threshold
+        ttk.Label(timing_frame, text="Limite de atraso (ms):").grid(row=row, column=0, sticky=tk.W, pady=2)
+        self.config_vars['catch_up_threshold_ms'] = tk.IntVar()
+        catch_up_spinbox = ttk.Spinbox(timing_frame, from_=5, to=1000, increment=5,
+                                      textvariable=self.config_vars['catch_up_threshold_ms'], width=10)
+        catch_up_spinbox.grid(row=row, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        row += 1
+        
+        # Loop gap
+        ttk.Label(timing_frame, text="Intervalo entre loops (ms):").grid(row=row, column=0, sticky=tk.W, pady=2)
+        self.config_vars['loop_gap_ms'] = tk.IntVar()
+        loop_gap_spinbox = ttk.Spinbox(timing_frame, from_=0, to=60000, increment=100,
+                                      textvariable=self.config_vars['loop_gap_ms'], width=10)
+        loop_gap_spinbox.grid(row=row, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        row += 1
+        
+        # Smooth movement rate
+        ttk.Label(timing_frame, text="Taxa dos movimentos suaves (Hz):").grid(row=row, column=0, sticky=tk.W, pady=2)
+        self.config_vars['smooth_movement_rate'] = tk.IntVar()
+        smooth_rate_spinbox = ttk.Spinbox(timing_frame, from_=30, to=500, increment=10,
+                                         textvariable=self.config_vars['smooth_movement_rate'], width=10)
+        smooth_rate_spinbox.grid(row=row, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        row += 1
+        
         # Frame de comportamento
         behavior_frame = ttk.LabelFrame(frame, text="Comportamento", padding="10")
         behavior_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -206,6 +252,18 @@ class AdvancedSettingsWindow:
                        variable=self.config_vars['smooth_movements']).grid(row=row, column=0, sticky=tk.W, pady=2)
         row += 1
         
+        # Catch-up
+        self.config_vars['catch_up_moves'] = tk.BooleanVar()
+        ttk.Checkbutton(behavior_frame, text="Pular movimentos atrasados (recuperar atraso)", 
+                       variable=self.config_vars['catch_up_moves']).grid(row=row, column=0, sticky=tk.W, pady=2)
+        row += 1
+        
+        # Reposition on clicks/scroll
+        self.config_vars['reposition_actions'] = tk.BooleanVar()
+        ttk.Checkbutton(behavior_frame, text="Reposicionar o cursor em todo clique/scroll (corrige deslocamentos)", 
+                       variable=self.config_vars['reposition_actions']).grid(row=row, column=0, sticky=tk.W, pady=2)
+        row += 1
+        
         # Pause on error
         self.config_vars['pause_on_error'] = tk.BooleanVar()
         ttk.Checkbutton(behavior_frame, text="Pausar em caso de erro", 
@@ -347,6 +405,8 @@ Desenvolvido com Python e muito ❤️
             
     def refresh_performance(self) -> None:
         """Atualiza estatísticas de performance"""
+        # Relê as métricas gravadas pela janela principal (ex.: timing da última reprodução)
+        self.performance_monitor.load_metrics()
         report = self.performance_monitor.get_performance_report()
         
         self.performance_text.configure(state=tk.NORMAL)
@@ -364,11 +424,19 @@ Desenvolvido com Python e muito ❤️
         # Mapeia configurações para variáveis
         mapping = {
             'auto_save': 'auto_save',
+            'compression_enabled': 'compression_enabled',
+            'compression_method': 'compression_method',
+            'delta_encoding': 'delta_encoding',
             'sound_notification': 'sound_notification',
             'include_mouse_moves': 'include_mouse_moves',
+            'streaming_recording': 'streaming_recording',
             'max_events': 'max_events',
             'initial_delay': 'initial_delay',
             'default_speed': 'default_speed',
+            'catch_up_moves': 'catch_up_moves',
+            'catch_up_threshold_ms': 'catch_up_threshold_ms',
+            'loop_gap_ms': 'loop_gap_ms',
+            'smooth_movement_rate': 'smooth_movement_rate',
             'hotkey_record': 'hotkey_record',
             'hotkey_play': 'hotkey_play',
             'hotkey_stop': 'hotkey_stop'
@@ -384,7 +452,8 @@ Desenvolvido com Python e muito ❤️
         self.config_vars.get('capture_precision', tk.StringVar()).set(settings.get('capture_precision', 'Alta'))
         
         # Configurações booleanas com padrão False
-        bool_settings = ['ignore_rapid_clicks', 'smooth_movements', 'pause_on_error', 'continue_on_screen_change']
+        bool_settings = ['ignore_rapid_clicks', 'smooth_movements', 'reposition_actions', 'pause_on_error',
+                         'continue_on_screen_change']
         for setting in bool_settings:
             if setting in self.config_vars:
                 self.config_vars[setting].set(settings.get(setting, False))
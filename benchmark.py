@@ -0,0 +1,622 @@
+"""
+Benchmarks - Mouse Recorder
+Mede memória e desempenho das estruturas internas da aplicação
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from event_buffer import EventBuffer, EVENT_MOVE, NO_NAME
+from input_backends import FakeBackend, synthetic_moves
+
+
+def make_mixed_events(total_events: int) -> list:
+    """Gera eventos no estilo de exemplo_mouse_teclado.json (movimentos, cliques, teclas, scroll)"""
+    events = []
+    timestamp = 0.0
+    keys = ["h", "e", "l", "o", "space", "enter", "shift", "f5"]
+    while len(events) < total_events:
+        i = len(events)
+        x, y = 100 + i % 1200, 100 + (i * 7) % 700
+        events.append({"type": "move", "x": x, "y": y, "timestamp": timestamp})
+        events.append({"type": "click", "x": x, "y": y, "button": "left", "action": "press", "timestamp": timestamp + 0.05})
+        events.append({"type": "click", "x": x, "y": y, "button": "left", "action": "release", "timestamp": timestamp + 0.1})
+        key = keys[i % len(keys)]
+        events.append({"type": "key_press", "key": key, "timestamp": timestamp + 0.15})
+        events.append({"type": "key_release", "key": key, "timestamp": timestamp + 0.2})
+        events.append({"type": "scroll", "x": x, "y": y, "dx": 0, "dy": -1, "timestamp": timestamp + 0.25})
+        timestamp += 0.3
+    return events[:total_events]
+
+
+def _measure(build):
+    """Executa build() e retorna (resultado, segundos, pico de memória em bytes)"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark_event_buffer(total_events: int = 1_000_000) -> None:
+    """Compara lista de dicts com o EventBuffer colunar na captura de movimentos"""
+    print(f"=== Benchmark - Buffer de eventos ({total_events:,} movimentos) ===")
+
+    def build_dicts():
+        events = []
+        for i in range(total_events):
+            events.append({
+                "type": "move",
+                "x": i % 1920,
+                "y": i % 1080,
+                "timestamp": i * 0.001
+            })
+        return events
+
+    def build_buffer():
+        buffer = EventBuffer()
+        for i in range(total_events):
+            buffer.append(EVENT_MOVE, i % 1920, i % 1080, 0, 0, NO_NAME, i * 1_000_000)
+        return buffer
+
+    _, dict_time, dict_peak = _measure(build_dicts)
+    buffer, buffer_time, buffer_peak = _measure(build_buffer)
+
+    print(f"  Lista de dicts: {dict_time:.2f}s, {dict_peak / 1024 / 1024:.1f} MB "
+          f"({total_events / dict_time:,.0f} eventos/s)")
+    print(f"  EventBuffer:    {buffer_time:.2f}s, {buffer_peak / 1024 / 1024:.1f} MB "
+          f"({total_events / buffer_time:,.0f} eventos/s)")
+    print(f"  Memória reduzida em {dict_peak / max(buffer_peak, 1):.1f}x")
+
+    start = time.perf_counter()
+    buffer.to_events()
+    print(f"  Conversão para dicts sob demanda: {time.perf_counter() - start:.2f}s")
+
+
+def benchmark_capture_callbacks(total_events: int = 200_000) -> None:
+    """Mede o custo dos callbacks do hook no modo de captura com fila"""
+    from mouse_recorder import RecordingSession
+
+    print(f"\n=== Benchmark - Callbacks de captura ({total_events:,} movimentos) ===")
+
+    # Sem listeners: os callbacks são chamados diretamente, como faria o hook
+    session = RecordingSession(queued_capture=True, backend=FakeBackend())
+    session.start_recording(record_mouse=True, record_keyboard=False)
+
+    start = time.perf_counter()
+    for i in range(total_events):
+        session._push_mouse_move(i % 1920, i % 1080)
+    elapsed = time.perf_counter() - start
+    session.stop_recording()
+
+    stats = session.get_capture_stats()
+    print(f"  Custo médio por callback: {elapsed / total_events * 1e6:.2f}µs")
+    print(f"  Callback máximo: {stats['max_callback_us']:.1f}µs "
+          f"({stats['callbacks_over_budget']} acima de {stats['callback_budget_us']:.0f}µs)")
+    print(f"  Profundidade máxima da fila: {stats['max_queue_depth']}")
+    print(f"  Eventos armazenados: {session.get_event_count():,}")
+
+
+def benchmark_move_decimation(seconds: int = 10, rate: int = 1000) -> None:
+    """Mede a redução de movimentos gravados por precisão de captura (mouse a 1000 Hz)"""
+    import math
+    from mouse_recorder import RecordingSession
+
+    total_moves = seconds * rate
+    print(f"\n=== Benchmark - Filtro de movimentos ({total_moves:,} amostras a {rate} Hz) ===")
+
+    for min_distance in (0, 5):
+        for precision, max_rate in RecordingSession.MOVE_RATE_BY_PRECISION.items():
+            session = RecordingSession(queued_capture=False, max_move_rate=max_rate,
+                                       min_move_distance=min_distance, backend=FakeBackend())
+            session.start_recording(record_mouse=False, record_keyboard=False)
+            step_ns = 1_000_000_000 // rate
+            for i in range(total_moves):
+                # Trajetória circular (~600 px/s) com um clique a cada segundo
+                angle = 2 * i / rate
+                x = 960 + int(300 * math.cos(angle))
+                y = 540 + int(300 * math.sin(angle))
+                now_ns = session.start_time_ns + i * step_ns
+                session._store_mouse_move(now_ns, x, y)
+                if i % rate == rate - 1:
+                    session._store_mouse_click(now_ns, x, y, "left", True)
+            session.stop_recording()
+
+            recorded = session.get_event_count() - seconds
+            print(f"  {precision:<6} distância {min_distance}px: {recorded:>7,} movimentos gravados "
+                  f"({total_moves / max(recorded, 1):.1f}x menor)")
+
+
+def benchmark_playback_dispatch(total_events: int = 300_000) -> None:
+    """Mede eventos/segundo executados pela reprodução contra um controlador nulo"""
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Reprodução com controlador nulo ({total_events:,} eventos) ===")
+    events = make_mixed_events(total_events)
+
+    # Velocidade altíssima: todos os prazos já passaram, mede só o custo de despacho
+    start = time.perf_counter()
+    session = PlaybackSession(events, speed_multiplier=1e9, backend=FakeBackend(record_operations=False))
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    session.play(repetitions=1)
+    session.playback_thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"  Compilação: {compile_time:.3f}s ({total_events / compile_time:,.0f} eventos/s)")
+    print(f"  Execução:   {elapsed:.3f}s ({total_events / elapsed:,.0f} eventos/s)")
+
+
+def benchmark_fake_backend_timing(rate: int = 500, count: int = 1000) -> None:
+    """Grava um fluxo sintético pelo FakeBackend e mede a precisão da reprodução"""
+    from mouse_recorder import RecordingSession
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Gravação e reprodução sintéticas ({count:,} movimentos a {rate} Hz) ===")
+
+    recorder = RecordingSession(backend=FakeBackend(input_events=synthetic_moves(count), input_rate=rate))
+    recorder.start_recording(record_mouse=True, record_keyboard=False)
+    recorder.mouse_listener.join()
+    recorder.stop_recording()
+    events = recorder.collect_events()
+
+    backend = FakeBackend()
+    playback = PlaybackSession(events, backend=backend)
+    playback.play(repetitions=1)
+    playback.playback_thread.join()
+
+    start = backend.operations[0][0] - events[0]["timestamp"]
+    lateness = [executed - (start + event["timestamp"])
+                for (executed, _, _), event in zip(backend.operations, events)]
+    lateness.sort()
+    print(f"  Eventos gravados: {len(events):,} em {recorder.get_duration():.2f}s")
+    print(f"  Atraso na reprodução: mediana {lateness[len(lateness) // 2] * 1e6:.0f}µs, "
+          f"máximo {lateness[-1] * 1e6:.0f}µs")
+
+    summary = playback.total_lateness.summary()
+    print(f"  Histograma da sessão: p50 ≤{summary['p50'] * 1e6:.0f}µs, p95 ≤{summary['p95'] * 1e6:.0f}µs, "
+          f"p99 ≤{summary['p99'] * 1e6:.0f}µs, máximo {summary['max'] * 1e6:.0f}µs ({summary['count']:,} eventos)")
+
+
+class SlowFakeBackend(FakeBackend):
+    """FakeBackend em que cada movimento custa um tempo fixo (máquina sobrecarregada)"""
+
+    def __init__(self, move_cost: float):
+        super().__init__()
+        self.move_cost = move_cost
+
+    def record(self, operation, value):
+        if operation == "move":
+            end = time.perf_counter() + self.move_cost
+            while time.perf_counter() < end:
+                pass
+        super().record(operation, value)
+
+
+def benchmark_catch_up(moves: int = 2000, interval: float = 0.001, move_cost: float = 0.002) -> None:
+    """Compara a reprodução atrasada com e sem a política de recuperação de atraso"""
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Recuperação de atraso ({moves:,} movimentos a cada {interval * 1000:.0f}ms, "
+          f"{move_cost * 1000:.0f}ms por movimento) ===")
+
+    events = []
+    for i in range(moves):
+        timestamp = i * interval
+        events.append({"type": "move", "x": i % 1920, "y": i % 1080, "timestamp": timestamp})
+        if i % 100 == 99:
+            events.append({"type": "click", "x": i % 1920, "y": i % 1080, "button": "left",
+                           "action": "press", "timestamp": timestamp})
+            events.append({"type": "click", "x": i % 1920, "y": i % 1080, "button": "left",
+                           "action": "release", "timestamp": timestamp})
+    expected_clicks = sum(1 for e in events if e["type"] == "click")
+
+    for threshold in (None, 0.05):
+        backend = SlowFakeBackend(move_cost)
+        session = PlaybackSession(events, backend=backend, catch_up_threshold=threshold)
+        session.play(repetitions=1)
+        session.playback_thread.join()
+
+        clicks = sum(1 for _, op, _ in backend.operations if op in ("press", "release"))
+        overrun = backend.operations[-1][0] - backend.operations[0][0] - events[-1]["timestamp"]
+        label = "sem recuperação" if threshold is None else f"limite {threshold * 1000:.0f}ms"
+        print(f"  {label:<16} atraso final {overrun * 1000:7.1f}ms, "
+              f"{session.skipped_moves:>5,} movimentos pulados, "
+              f"{clicks}/{expected_clicks} press/release executados")
+
+
+def benchmark_elided_positions(total_events: int = 100_000, move_cost: float = 0.00002) -> None:
+    """Compara a reprodução com e sem a eliminação de reposicionamentos redundantes do cursor"""
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Reposicionamentos redundantes ({total_events:,} eventos, "
+          f"{move_cost * 1e6:.0f}µs por posicionamento) ===")
+    events = make_mixed_events(total_events)
+
+    for elide in (False, True):
+        backend = SlowFakeBackend(move_cost)
+        backend.record_operations = False
+        session = PlaybackSession(events, speed_multiplier=1e9, backend=backend, elide_positions=elide)
+        start = time.perf_counter()
+        session.play(repetitions=1)
+        session.playback_thread.join()
+        elapsed = time.perf_counter() - start
+
+        label = "com eliminação" if elide else "sem eliminação"
+        print(f"  {label}: {backend.operation_count:,} chamadas ao controlador "
+              f"({session.elided_positions:,} posicionamentos eliminados), execução {elapsed:.3f}s")
+
+
+def benchmark_loop_boundaries(loops: int = 20, gap: float = 0.05) -> None:
+    """Mede a precisão do início de cada volta no modo loop (mesma sessão, sem recriar controladores)"""
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Modo loop ({loops} voltas, intervalo de {gap * 1000:.0f}ms) ===")
+
+    events = [{"type": "move", "x": i, "y": i, "timestamp": i * 0.002} for i in range(50)]
+    duration = events[-1]["timestamp"]
+    backend = FakeBackend()
+    session = PlaybackSession(events, backend=backend)
+    session.play(loop=True, loop_gap=gap)
+    while session.current_repetition <= loops:
+        time.sleep(0.01)
+    session.stop()
+    session.playback_thread.join()
+
+    starts = [executed for executed, _, _ in backend.operations[::len(events)]][:loops]
+    errors = [abs(start - (starts[0] + k * (duration + gap))) for k, start in enumerate(starts)]
+    print(f"  Voltas executadas: {len(session.repetition_drifts)} com a mesma sessão")
+    print(f"  Erro no início das voltas: médio {sum(errors) / len(errors) * 1e6:.0f}µs, "
+          f"máximo {max(errors) * 1e6:.0f}µs")
+
+
+def benchmark_smooth_movements(seconds: int = 60, stored_rate: int = 20, smooth_rate: int = 120) -> None:
+    """Mede o custo e o resultado dos movimentos suaves sobre uma gravação esparsa"""
+    import math
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Movimentos suaves ({seconds}s gravados a {stored_rate} Hz, "
+          f"reproduzidos a {smooth_rate} Hz) ===")
+
+    events = []
+    for i in range(seconds * stored_rate):
+        angle = 2 * i / stored_rate
+        events.append({"type": "move", "x": 960 + int(300 * math.cos(angle)),
+                       "y": 540 + int(300 * math.sin(angle)), "timestamp": i / stored_rate})
+
+    def largest_jump(program):
+        positions = [instruction[2] for instruction in program]
+        return max(math.dist(a, b) for a, b in zip(positions, positions[1:]))
+
+    plain = PlaybackSession(events, backend=FakeBackend())
+    start = time.perf_counter()
+    smooth = PlaybackSession(events, backend=FakeBackend(), smooth_rate=smooth_rate)
+    elapsed = time.perf_counter() - start
+
+    print(f"  Movimentos armazenados: {len(events):,}; reproduzidos: {len(smooth.program):,} "
+          f"(arquivo {len(smooth.program) / len(events):.1f}x menor que a reprodução)")
+    print(f"  Maior salto do cursor: {largest_jump(plain.program):.0f}px sem suavização, "
+          f"{largest_jump(smooth.program):.0f}px com suavização")
+    print(f"  Compilação com interpolação: {elapsed * 1000:.0f}ms (antes da reprodução)")
+
+
+def benchmark_seek(total_events: int = 300_000, seeks: int = 1000) -> None:
+    """Mede o custo de um salto: busca binária no índice de prazos + entradas pressionadas no destino"""
+    import random
+    from bisect import bisect_left
+    from playback_session import PlaybackSession
+    from playback_program import held_checkpoints, held_inputs_at
+
+    print(f"\n=== Benchmark - Saltos na reprodução ({total_events:,} eventos, {seeks} saltos) ===")
+    session = PlaybackSession(make_mixed_events(total_events), backend=FakeBackend(record_operations=False))
+
+    start = time.perf_counter()
+    checkpoints = held_checkpoints(session.program)
+    checkpoint_time = time.perf_counter() - start
+
+    duration = session.offsets[-1]
+    targets = [random.random() * duration for _ in range(seeks)]
+    start = time.perf_counter()
+    for position in targets:
+        index = bisect_left(session.offsets, position)
+        held_inputs_at(session.program, checkpoints, index)
+    elapsed = time.perf_counter() - start
+
+    print(f"  Instantâneos de entradas pressionadas: {checkpoint_time * 1000:.0f}ms (no primeiro salto)")
+    print(f"  Custo médio por salto: {elapsed / seeks * 1e6:.0f}µs")
+
+
+def benchmark_playlist_transitions(items: int = 5, item_events: int = 20_000, item_seconds: float = 0.5) -> None:
+    """Mede o intervalo entre itens de uma playlist com pré-carregamento em segundo plano"""
+    import json
+    import os
+    import tempfile
+    from playlist import PlaylistPlayer, make_playlist_item
+
+    print(f"\n=== Benchmark - Transições de playlist ({items} itens de {item_events:,} eventos) ===")
+    with tempfile.TemporaryDirectory() as directory:
+        # Gravações curtas mas pesadas de carregar, para expor o custo de preparar cada item
+        events = make_mixed_events(item_events)
+        last = events[-1]["timestamp"]
+        for event in events:
+            event["timestamp"] = event["timestamp"] / last * item_seconds
+        playlist = []
+        for index in range(items):
+            path = os.path.join(directory, f"item_{index}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"events": events}, f)
+            playlist.append(make_playlist_item(path))
+
+        start = time.perf_counter()
+        player = PlaylistPlayer(playlist, backend=FakeBackend(record_operations=False),
+                                session_options={"catch_up_threshold": 0.05})
+        player.play()
+        player.player_thread.join()
+        elapsed = time.perf_counter() - start
+
+    gaps = player.transition_gaps
+    print(f"  Playlist completa: {elapsed:.2f}s")
+    print(f"  Espera pelo primeiro item: {player.preload_waits[0] * 1000:.0f}ms")
+    if gaps:
+        print(f"  Intervalo entre itens: média {sum(gaps) / len(gaps) * 1000:.2f}ms, máx {max(gaps) * 1000:.2f}ms")
+        print(f"  Espera por pré-carregamento nas transições: máx {max(player.preload_waits[1:]) * 1000:.2f}ms")
+
+
+def benchmark_first_event_latency(total_events: int = 100_000, countdown: float = 0.3, lead: float = 0.05) -> None:
+    """Mede o intervalo entre o fim da contagem regressiva e o primeiro evento executado"""
+    import threading
+    from playback_session import PlaybackSession
+
+    print(f"\n=== Benchmark - Primeiro evento após a contagem ({total_events:,} eventos) ===")
+    events = make_mixed_events(total_events)
+
+    # Sem preparação: a sessão é criada e compilada só quando a contagem termina
+    backend = FakeBackend()
+    start_at = time.perf_counter() + countdown
+    time.sleep(countdown)
+    session = PlaybackSession(events, backend=backend)
+    session.play()
+    while not backend.operations:
+        time.sleep(0.0005)
+    session.stop()
+    cold = backend.operations[0][0] - start_at
+
+    # Preparada durante a contagem: só resta a espera precisa até start_at
+    backend = FakeBackend()
+    start_at = time.perf_counter() + countdown
+    prepared = {}
+    thread = threading.Thread(target=lambda: prepared.update(session=PlaybackSession(events, backend=backend)))
+    thread.start()
+    time.sleep(countdown - lead)
+    thread.join()
+    session = prepared["session"]
+    session.play(start_at=start_at)
+    while not backend.operations:
+        time.sleep(0.0005)
+    session.stop()
+    warm = backend.operations[0][0] - start_at
+
+    print(f"  Criando a sessão no fim da contagem: {cold * 1000:.2f}ms")
+    print(f"  Preparada durante a contagem:        {warm * 1000:.3f}ms "
+          f"(worker pronto {session.start_latency * 1e6:.1f}µs após o prazo)")
+
+
+def benchmark_binary_format(sizes=(100_000, 1_000_000)) -> None:
+    """Compara tamanho e tempo de carga das gravações em JSON (indent=2) e no formato binário"""
+    import json
+    import os
+    import tempfile
+    from playback_session import PlaybackSession
+    from recording_format import read_recording, write_recording
+
+    for total_events in sizes:
+        print(f"\n=== Benchmark - Formato de arquivo ({total_events:,} eventos) ===")
+        events = make_mixed_events(total_events)
+        data = {"name": "benchmark", "duration": events[-1]["timestamp"], "total_events": total_events,
+                "events": events}
+
+        with tempfile.TemporaryDirectory() as directory:
+            for label, filename in (("JSON", "recording.json"), ("binário", "recording.mrec")):
+                path = os.path.join(directory, filename)
+                start = time.perf_counter()
+                write_recording(path, data)
+                save_time = time.perf_counter() - start
+
+                gc.collect()
+                start = time.perf_counter()
+                loaded = read_recording(path)
+                load_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                PlaybackSession(loaded["events"], backend=FakeBackend(record_operations=False))
+                compile_time = time.perf_counter() - start
+
+                print(f"  {label:<8} {os.path.getsize(path) / 1024 / 1024:7.1f}MB | salvar {save_time:6.3f}s | "
+                      f"carregar {load_time * 1000:8.1f}ms | compilar {compile_time:6.3f}s")
+                del loaded
+
+
+def benchmark_compression(total_events: int = 200_000) -> None:
+    """Mede tamanho, tempo e pico de memória ao salvar/carregar com compressão em fluxo"""
+    import os
+    import tempfile
+    from recording_format import read_recording, write_recording
+
+    print(f"\n=== Benchmark - Compressão ({total_events:,} eventos) ===")
+    events = make_mixed_events(total_events)
+    data = {"name": "benchmark", "duration": events[-1]["timestamp"], "total_events": total_events,
+            "events": events}
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Parte de uma gravação binária carregada (colunas mapeadas), como ao re-salvar
+        source_path = os.path.join(directory, "source.mrec")
+        write_recording(source_path, data)
+        source = read_recording(source_path)
+        raw_size = os.path.getsize(source_path)
+
+        for label, filename, compression in (("binário", "recording.mrec", None),
+                                             ("binário + zlib", "recording_zlib.mrec", "zlib"),
+                                             ("binário + lzma", "recording_lzma.mrec", "lzma"),
+                                             ("JSON + zlib", "recording_zlib.json", "zlib")):
+            path = os.path.join(directory, filename)
+            recording = source if filename.endswith(".mrec") else data
+            start = time.perf_counter()
+            write_recording(path, recording, compression)
+            save_time = time.perf_counter() - start
+
+            # Pico de memória medido à parte (tracemalloc deixa a escrita bem mais lenta)
+            tracemalloc.start()
+            write_recording(path, recording, compression)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            loaded = read_recording(path)
+            load_time = time.perf_counter() - start
+            assert len(loaded["events"]) == total_events
+            del loaded
+
+            print(f"  {label:<15} {os.path.getsize(path) / 1024:9.0f}KB ({os.path.getsize(path) / raw_size:5.1%} do binário) | "
+                  f"salvar {save_time:6.3f}s (pico {peak / 1024 / 1024:5.1f}MB) | carregar {load_time:6.3f}s")
+        source["events"].close()
+
+
+def benchmark_list_recordings(files: int = 200, file_events: int = 20_000) -> None:
+    """Compara listar a biblioteca lendo cada JSON por inteiro com o catálogo SQLite"""
+    import json
+    import os
+    import tempfile
+    from recording_format import write_recording
+    from utils import FileManager
+
+    print(f"\n=== Benchmark - Biblioteca de gravações ({files} arquivos de {file_events:,} eventos) ===")
+    events = make_mixed_events(file_events)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Auto-saves antigos: JSON com "events" antes dos metadados
+        for i in range(files):
+            with open(os.path.join(directory, f"auto_save_{i:04d}.json"), 'w', encoding='utf-8') as f:
+                json.dump({"events": events, "name": f"Gravação {i}", "duration": events[-1]["timestamp"],
+                           "total_events": file_events, "created_at": f"2025-01-{1 + i % 28:02d}T10:30:00"}, f)
+
+        start = time.perf_counter()
+        for filename in os.listdir(directory):
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                json.load(f)
+        full_time = time.perf_counter() - start
+
+        def timed(action):
+            start = time.perf_counter()
+            result = action()
+            return result, time.perf_counter() - start
+
+        manager = FileManager(directory)
+        _, cold_time = timed(manager.sync_library)
+        manager = FileManager(directory)
+        recordings, list_time = timed(manager.list_recordings)
+        assert len(recordings) == files
+        _, warm_sync_time = timed(manager.sync_library)
+
+        # Um arquivo alterado: só ele é relido
+        path = os.path.join(directory, "auto_save_0000.json")
+        write_recording(path, {"name": "Gravação 0", "total_events": file_events, "events": events})
+        _, changed_time = timed(manager.sync_library)
+
+        # Arquivo salvo pela aplicação: registrado com os dados em memória, sem reler
+        path = os.path.join(directory, "auto_save_new.mrec")
+        data = {"name": "Nova", "total_events": file_events, "events": events}
+        write_recording(path, data)
+        _, register_time = timed(lambda: manager.register_recording(path, data))
+
+        found, query_time = timed(lambda: manager.search_recordings(
+            name="Gravação 1", created_from="2025-01-10", created_before="2025-01-20",
+            min_events=1000, keys=["space"]))
+
+    print(f"  json.load de todos os arquivos:       {full_time:8.3f}s")
+    print(f"  Catálogo vazio (primeira leitura):    {cold_time:8.3f}s")
+    print(f"  Listagem pelo catálogo:               {list_time * 1000:8.2f}ms")
+    print(f"  Sincronização sem mudanças:           {warm_sync_time * 1000:8.2f}ms")
+    print(f"  Sincronização com 1 arquivo alterado: {changed_time * 1000:8.2f}ms")
+    print(f"  Registro de arquivo salvo:            {register_time * 1000:8.2f}ms")
+    print(f"  Busca (nome, datas, eventos, tecla):  {query_time * 1000:8.2f}ms ({len(found)} resultados)")
+
+
+def benchmark_delta_encoding(total_events: int = 200_000) -> None:
+    """
+    Mede codificação/decodificação delta/varint e o tamanho dos arquivos de uma
+    gravação típica (a reconstrução bit a bit é verificada em test_app.py)
+    """
+    import os
+    import tempfile
+    from delta_encoding import encode_events, decode_events
+    from recording_format import read_recording, write_recording
+
+    print(f"\n=== Benchmark - Codificação delta/varint ({total_events:,} eventos) ===")
+    buffer = EventBuffer.from_events(make_mixed_events(total_events))
+
+    start = time.perf_counter()
+    encoded = b"".join(encode_events(buffer))
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in decode_events([encoded], total_events):
+        pass
+    decode_time = time.perf_counter() - start
+
+    print(f"  Codificar:   {total_events / encode_time:12,.0f} eventos/s")
+    print(f"  Decodificar: {total_events / decode_time:12,.0f} eventos/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        data = {"name": "typical", "events": buffer}
+        sizes = {}
+        for label, filename, compression, delta in (("binário", "plain.mrec", None, False),
+                                                    ("delta", "delta.mrec", None, True),
+                                                    ("binário + zlib", "plain_zlib.mrec", "zlib", False),
+                                                    ("delta + zlib", "delta_zlib.mrec", "zlib", True)):
+            path = os.path.join(directory, filename)
+            write_recording(path, data, compression, delta=delta)
+            sizes[label] = os.path.getsize(path)
+            start = time.perf_counter()
+            loaded = read_recording(path)
+            load_time = time.perf_counter() - start
+            loaded["events"].close()
+            print(f"  Arquivo {label:<15} {sizes[label] / 1024:8.0f}KB "
+                  f"({sizes[label] / sizes['binário']:5.1%} do binário), carregar {load_time * 1000:7.1f}ms")
+
+
+def main():
+    """Executa todos os benchmarks"""
+    print("🧪 Mouse Recorder - Benchmarks")
+    print()
+
+    total_events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_event_buffer(total_events)
+    benchmark_capture_callbacks()
+    benchmark_move_decimation()
+    benchmark_playback_dispatch()
+    benchmark_fake_backend_timing()
+    benchmark_catch_up()
+    benchmark_elided_positions()
+    benchmark_loop_boundaries()
+    benchmark_seek()
+    benchmark_smooth_movements()
+    benchmark_playlist_transitions()
+    benchmark_first_event_latency()
+    benchmark_binary_format()
+    benchmark_compression()
+    benchmark_list_recordings()
+    benchmark_delta_encoding()
+
+
+if __name__ == "__main__":
+    main()
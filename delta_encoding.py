@@ -0,0 +1,170 @@
+"""
+Codificação Delta - Mouse Recorder
+Eventos codificados como diferenças em inteiros de tamanho variável (varint), em fluxo
+"""
+
+from typing import Iterable, Iterator, Optional, Tuple
+
+from event_buffer import NO_NAME, EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE, EVENT_SCROLL
+
+
+# Byte de cabeçalho de cada evento: código do tipo nos 3 bits baixos + campos presentes
+CODE_MASK = 0x07
+FLAG_POSITION = 0x08   # x, y diferentes do previsto (delta em relação à última posição)
+FLAG_SCROLL = 0x10     # dx, dy diferentes de zero
+FLAG_NAME = 0x20       # botão/tecla presente (identificador na tabela de nomes)
+
+# Tipos cuja posição é prevista como a última posição; os demais (teclas) preveem (0, 0)
+POSITIONED_CODES = (EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE, EVENT_SCROLL)
+
+# Eventos codificados por bloco entregue pelo gerador
+ENCODE_CHUNK_EVENTS = 65536
+
+# Linha de evento: (código, x, y, dx, dy, nome, timestamp_ns), como nas colunas do EventBuffer
+Row = Tuple[int, int, int, int, int, int, int]
+
+
+def zigzag(value: int) -> int:
+    """Mapeia inteiros com sinal para sem sinal (0, -1, 1, -2... -> 0, 1, 2, 3...)"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    """Inverso de zigzag"""
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """Acrescenta um inteiro sem sinal em varint (7 bits por byte, bit alto = continua)"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Lê um varint de data a partir de pos; retorna (valor, posição seguinte)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_events(columns, start: int = 0, stop: Optional[int] = None,
+                  chunk_events: int = ENCODE_CHUNK_EVENTS) -> Iterator[bytes]:
+    """
+    Codifica eventos em colunas (EventBuffer ou RecordingView) em blocos de bytes
+
+    Cada evento vira: byte de cabeçalho, delta do timestamp e, conforme as flags,
+    delta de posição, dx/dy e nome. Movimentos consecutivos custam poucos bytes.
+    O estado (último timestamp e posição) segue entre blocos, então os blocos
+    só podem ser decodificados em ordem, por decode_events
+    """
+    stop = len(columns) if stop is None else stop
+    types, xs, ys = columns.types, columns.xs, columns.ys
+    dxs, dys, name_ids, timestamps_ns = columns.dxs, columns.dys, columns.name_ids, columns.timestamps_ns
+    last_timestamp = 0
+    last_x = last_y = 0
+
+    for block_start in range(start, stop, chunk_events):
+        out = bytearray()
+        for index in range(block_start, min(block_start + chunk_events, stop)):
+            code = types[index]
+            x, y, dx, dy, name_id = xs[index], ys[index], dxs[index], dys[index], name_ids[index]
+            positioned = code in POSITIONED_CODES
+
+            header = code
+            if (x != last_x or y != last_y) if positioned else (x or y):
+                header |= FLAG_POSITION
+            if dx or dy:
+                header |= FLAG_SCROLL
+            if name_id != NO_NAME:
+                header |= FLAG_NAME
+            out.append(header)
+
+            timestamp = timestamps_ns[index]
+            write_varint(out, zigzag(timestamp - last_timestamp))
+            last_timestamp = timestamp
+
+            if header & FLAG_POSITION:
+                write_varint(out, zigzag(x - last_x))
+                write_varint(out, zigzag(y - last_y))
+            if positioned:
+                last_x, last_y = x, y
+            if header & FLAG_SCROLL:
+                write_varint(out, zigzag(dx))
+                write_varint(out, zigzag(dy))
+            if header & FLAG_NAME:
+                write_varint(out, name_id)
+        yield bytes(out)
+
+
+def decode_events(chunks: Iterable[bytes], count: Optional[int] = None) -> Iterator[Row]:
+    """
+    Decodifica o fluxo de encode_events, consumindo blocos de bytes de qualquer
+    tamanho (ex.: leituras de arquivo) e produzindo uma linha por evento
+
+    Args:
+        chunks: Blocos de bytes na ordem em que foram escritos
+        count: Número de eventos esperado; com ele a decodificação para ao
+            atingi-lo e lança ValueError se o fluxo terminar antes
+    """
+    last_timestamp = 0
+    last_x = last_y = 0
+    decoded = 0
+    pending = b""
+
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        pos = 0
+        size = len(data)
+        while pos < size and decoded != count:
+            event_start = pos
+            try:
+                header = data[pos]
+                pos += 1
+                code = header & CODE_MASK
+                value, pos = read_varint(data, pos)
+                timestamp = last_timestamp + unzigzag(value)
+
+                x = y = dx = dy = 0
+                name_id = NO_NAME
+                positioned = code in POSITIONED_CODES
+                if header & FLAG_POSITION:
+                    value, pos = read_varint(data, pos)
+                    x = last_x + unzigzag(value)
+                    value, pos = read_varint(data, pos)
+                    y = last_y + unzigzag(value)
+                elif positioned:
+                    x, y = last_x, last_y
+                if header & FLAG_SCROLL:
+                    value, pos = read_varint(data, pos)
+                    dx = unzigzag(value)
+                    value, pos = read_varint(data, pos)
+                    dy = unzigzag(value)
+                if header & FLAG_NAME:
+                    name_id, pos = read_varint(data, pos)
+            except IndexError:
+                # Evento cortado entre dois blocos: continua no próximo
+                pos = event_start
+                break
+
+            last_timestamp = timestamp
+            if positioned:
+                last_x, last_y = x, y
+            decoded += 1
+            yield code, x, y, dx, dy, name_id, timestamp
+
+        pending = data[pos:]
+        if decoded == count:
+            return
+
+    if count is not None and decoded != count:
+        raise ValueError(f"Fluxo de eventos truncado: {decoded} de {count} eventos")
+    if pending:
+        raise ValueError("Fluxo de eventos termina no meio de um evento")
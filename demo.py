@@ -3,9 +3,10 @@ Demo Script - Mouse Recorder
 Demonstra o uso programático das classes do Mouse Recorder
 """
 
-from mouse_recorder import RecordingSession, PlaybackSession, SettingsManager
+from mouse_recorder import RecordingSession, SettingsManager
+from playback_session import PlaybackSession
+from recording_format import write_recording
 import time
-import json
 
 def demo_recording():
     """Demonstração de gravação programática"""
@@ -34,13 +35,12 @@ def demo_recording():
     print("⏹️ Gravação finalizada!")
     
     # Mostra estatísticas
-    print(f"Eventos capturados: {len(session.events)}")
+    print(f"Eventos capturados: {session.get_event_count()}")
     print(f"Duração: {session.get_duration():.2f} segundos")
     
-    # Salva em arquivo de demo
+    # Salva em arquivo de demo (os eventos ficam em colunas; write_recording exporta o JSON)
     recording_data = session.to_dict("Demo_Recording")
-    with open("demo_recording.json", "w", encoding="utf-8") as f:
-        json.dump(recording_data, f, indent=2, ensure_ascii=False)
+    write_recording("demo_recording.json", recording_data)
     
     print("Gravação salva em: demo_recording.json")
     return recording_data
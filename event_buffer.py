@@ -0,0 +1,214 @@
+"""
+Buffer de Eventos - Mouse Recorder
+Armazenamento colunar e compacto dos eventos capturados durante a gravação
+"""
+
+from array import array
+from typing import Dict, List, Any, Iterator, Optional, Union
+
+
+# Códigos de tipo de evento armazenados na coluna "types"
+EVENT_MOVE = 0
+EVENT_CLICK_PRESS = 1
+EVENT_CLICK_RELEASE = 2
+EVENT_SCROLL = 3
+EVENT_KEY_PRESS = 4
+EVENT_KEY_RELEASE = 5
+
+# Identificador usado quando o evento não tem botão/tecla associado
+NO_NAME = -1
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def make_event(code: int, x: int, y: int, dx: int, dy: int, name: Optional[str], timestamp_ns: int) -> Dict[str, Any]:
+    """
+    Monta o dict legado de um evento a partir dos valores das colunas
+    O timestamp é armazenado em nanossegundos e exposto em segundos (float)
+    """
+    timestamp = timestamp_ns / NS_PER_SECOND
+    if code == EVENT_MOVE:
+        return {"type": "move", "x": x, "y": y, "timestamp": timestamp}
+    if code == EVENT_CLICK_PRESS or code == EVENT_CLICK_RELEASE:
+        return {
+            "type": "click",
+            "x": x,
+            "y": y,
+            "button": name,
+            "action": "press" if code == EVENT_CLICK_PRESS else "release",
+            "timestamp": timestamp
+        }
+    if code == EVENT_SCROLL:
+        return {"type": "scroll", "x": x, "y": y, "dx": dx, "dy": dy, "timestamp": timestamp}
+    return {
+        "type": "key_press" if code == EVENT_KEY_PRESS else "key_release",
+        "key": name,
+        "timestamp": timestamp
+    }
+
+
+class EventBuffer:
+    """
+    Buffer colunar pré-alocado para eventos de mouse e teclado
+    Cada campo fica em uma coluna tipada (array) em vez de um dict por evento,
+    e a lista de dicts legada só é montada quando solicitada
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self.types = array('B', bytes(self._capacity))
+        self.xs = array('i', [0]) * self._capacity
+        self.ys = array('i', [0]) * self._capacity
+        self.dxs = array('i', [0]) * self._capacity
+        self.dys = array('i', [0]) * self._capacity
+        self.name_ids = array('i', [NO_NAME]) * self._capacity
+        self.timestamps_ns = array('q', [0]) * self._capacity
+
+        # Tabela de nomes de botões e teclas (cada string é guardada uma vez)
+        self.names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+
+        # Eventos descartados por from_events (tipo desconhecido)
+        self.skipped_events = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.event_at(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("índice de evento fora do intervalo")
+        return self.event_at(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_events()
+
+    @classmethod
+    def from_events(cls, events: List[Dict[str, Any]]) -> "EventBuffer":
+        """
+        Monta um buffer a partir da lista de dicts legada (ex.: gravação JSON)
+        Coordenadas float são truncadas para int, como na captura; eventos de tipo
+        desconhecido são ignorados e contados em skipped_events
+        """
+        buffer = cls(len(events))
+        append = buffer.append
+        intern = buffer.intern
+        for event in events:
+            event_type = event["type"]
+            timestamp_ns = round(event["timestamp"] * NS_PER_SECOND)
+            if event_type == "move":
+                append(EVENT_MOVE, int(event["x"]), int(event["y"]), 0, 0, NO_NAME, timestamp_ns)
+            elif event_type == "click":
+                code = EVENT_CLICK_PRESS if event["action"] == "press" else EVENT_CLICK_RELEASE
+                append(code, int(event["x"]), int(event["y"]), 0, 0, intern(event["button"]), timestamp_ns)
+            elif event_type == "scroll":
+                append(EVENT_SCROLL, int(event["x"]), int(event["y"]), int(event["dx"]), int(event["dy"]),
+                       NO_NAME, timestamp_ns)
+            elif event_type == "key_press" or event_type == "key_release":
+                code = EVENT_KEY_PRESS if event_type == "key_press" else EVENT_KEY_RELEASE
+                append(code, 0, 0, 0, 0, intern(event["key"]), timestamp_ns)
+            else:
+                buffer.skipped_events += 1
+        return buffer
+
+    def _grow(self) -> None:
+        """Dobra a capacidade de todas as colunas"""
+        extra = self._capacity
+        self.types.extend(bytes(extra))
+        self.xs.extend(array('i', [0]) * extra)
+        self.ys.extend(array('i', [0]) * extra)
+        self.dxs.extend(array('i', [0]) * extra)
+        self.dys.extend(array('i', [0]) * extra)
+        self.name_ids.extend(array('i', [NO_NAME]) * extra)
+        self.timestamps_ns.extend(array('q', [0]) * extra)
+        self._capacity += extra
+
+    def intern(self, name: str) -> int:
+        """Retorna o identificador de um nome, registrando-o se for novo"""
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self._name_index[name] = name_id
+        return name_id
+
+    def append(self, code: int, x: int, y: int, dx: int, dy: int, name_id: int, timestamp_ns: int) -> None:
+        """Adiciona um evento ao final do buffer"""
+        n = self._size
+        if n == self._capacity:
+            self._grow()
+        self.types[n] = code
+        self.xs[n] = x
+        self.ys[n] = y
+        self.dxs[n] = dx
+        self.dys[n] = dy
+        self.name_ids[n] = name_id
+        self.timestamps_ns[n] = timestamp_ns
+        self._size = n + 1
+
+    def extend(self, other: "EventBuffer") -> None:
+        """Acrescenta os eventos de outro buffer, copiando as colunas e convertendo os nomes"""
+        count = len(other)
+        while self._size + count > self._capacity:
+            self._grow()
+        start, stop = self._size, self._size + count
+        for attribute in ("types", "xs", "ys", "dxs", "dys", "timestamps_ns"):
+            getattr(self, attribute)[start:stop] = getattr(other, attribute)[:count]
+
+        name_ids = [self.intern(name) for name in other.names]
+        if name_ids == list(range(len(other.names))):
+            self.name_ids[start:stop] = other.name_ids[:count]
+        else:
+            self.name_ids[start:stop] = array('i', (
+                name_ids[name_id] if name_id != NO_NAME else NO_NAME for name_id in other.name_ids[:count]
+            ))
+        self._size = stop
+
+    def clear(self) -> None:
+        """Descarta os eventos mantendo a capacidade e a tabela de nomes"""
+        self._size = 0
+
+    def last_timestamp_ns(self) -> int:
+        """Retorna o timestamp do último evento em nanossegundos (0 se vazio)"""
+        if not self._size:
+            return 0
+        return self.timestamps_ns[self._size - 1]
+
+    def last_timestamp(self) -> float:
+        """Retorna o timestamp do último evento em segundos (0.0 se vazio)"""
+        return self.last_timestamp_ns() / NS_PER_SECOND
+
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas (capacidade alocada)"""
+        columns = (self.types, self.xs, self.ys, self.dxs, self.dys, self.name_ids, self.timestamps_ns)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def event_at(self, index: int) -> Dict[str, Any]:
+        """Materializa um evento no formato de dict legado"""
+        name_id = self.name_ids[index]
+        return make_event(
+            self.types[index], self.xs[index], self.ys[index], self.dxs[index], self.dys[index],
+            self.names[name_id] if name_id != NO_NAME else None, self.timestamps_ns[index]
+        )
+
+    def row_at(self, index: int) -> List[Any]:
+        """Retorna um evento como linha compacta [tipo, x, y, dx, dy, nome, timestamp_ns]"""
+        name_id = self.name_ids[index]
+        return [
+            self.types[index], self.xs[index], self.ys[index], self.dxs[index], self.dys[index],
+            self.names[name_id] if name_id != NO_NAME else None, self.timestamps_ns[index]
+        ]
+
+    def iter_events(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Itera sobre os eventos como dicts legados, sem montar a lista inteira"""
+        stop = self._size if stop is None else min(stop, self._size)
+        for index in range(start, stop):
+            yield self.event_at(index)
+
+    def to_events(self) -> List[Dict[str, Any]]:
+        """Monta a lista de dicts legada usada em arquivos JSON e na reprodução"""
+        return list(self.iter_events())
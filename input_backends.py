@@ -0,0 +1,322 @@
+"""
+Backends de Entrada - Mouse Recorder
+Abstração dos controladores e listeners de mouse/teclado usados na gravação e reprodução
+"""
+
+import time
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+
+# Hotkeys globais da aplicação, que nunca são gravadas. F8/F6/F7 só agem durante a
+# reprodução, quando não há gravação, e por isso são gravadas como teclas comuns
+CONTROL_HOTKEYS = ("f9", "f10", "esc")
+
+
+class InputBackend(ABC):
+    """
+    Interface de backend de entrada
+    Cria controladores (reprodução) e listeners (gravação) e converte
+    botões/teclas entre os objetos do backend e os nomes gravados nos arquivos
+    """
+
+    @abstractmethod
+    def create_mouse_controller(self):
+        """Cria o controlador de mouse (position, press, release, scroll)"""
+
+    @abstractmethod
+    def create_keyboard_controller(self):
+        """Cria o controlador de teclado (press, release)"""
+
+    @abstractmethod
+    def create_mouse_listener(self, on_move=None, on_click=None, on_scroll=None):
+        """Cria um listener de mouse (start, stop) com os callbacks informados"""
+
+    @abstractmethod
+    def create_keyboard_listener(self, on_press=None, on_release=None):
+        """Cria um listener de teclado (start, stop) com os callbacks informados"""
+
+    @abstractmethod
+    def button_name(self, button) -> str:
+        """Converte um botão do backend para o nome gravado ("left", "right", "middle")"""
+
+    @abstractmethod
+    def resolve_button(self, name: str):
+        """Converte o nome gravado de um botão para o objeto do backend"""
+
+    @abstractmethod
+    def key_name(self, key) -> str:
+        """Converte uma tecla do backend para o nome gravado"""
+
+    @abstractmethod
+    def resolve_key(self, name: str):
+        """Converte o nome gravado de uma tecla para o objeto do backend (None = ignorar)"""
+
+
+class PynputBackend(InputBackend):
+    """
+    Backend real baseado em pynput
+    O pynput só é importado ao criar o backend, permitindo usar o restante
+    da aplicação em máquinas sem interface gráfica
+    """
+
+    def __init__(self):
+        from pynput import mouse, keyboard
+        self._mouse = mouse
+        self._keyboard = keyboard
+        self._buttons = {
+            "left": mouse.Button.left,
+            "right": mouse.Button.right,
+            "middle": mouse.Button.middle
+        }
+        self._special_keys: Optional[Dict[str, Any]] = None
+
+    def create_mouse_controller(self):
+        return self._mouse.Controller()
+
+    def create_keyboard_controller(self):
+        return self._keyboard.Controller()
+
+    def create_mouse_listener(self, on_move=None, on_click=None, on_scroll=None):
+        return self._mouse.Listener(on_move=on_move, on_click=on_click, on_scroll=on_scroll)
+
+    def create_keyboard_listener(self, on_press=None, on_release=None):
+        return self._keyboard.Listener(on_press=on_press, on_release=on_release, suppress=False)
+
+    def button_name(self, button) -> str:
+        Button = self._mouse.Button
+        return "left" if button == Button.left else \
+               "right" if button == Button.right else "middle"
+
+    def resolve_button(self, name: str):
+        return self._buttons.get(name, self._mouse.Button.middle)
+
+    def key_name(self, key) -> str:
+        try:
+            # Teclas alfanuméricas e símbolos
+            if hasattr(key, 'char') and key.char is not None:
+                return key.char
+            # Teclas especiais
+            elif hasattr(key, 'name'):
+                return key.name
+            # Fallback
+            else:
+                return str(key)
+        except AttributeError:
+            return str(key)
+
+    def get_special_keys(self) -> Dict[str, Any]:
+        """Tabela de teclas especiais, montada uma única vez"""
+        if self._special_keys is None:
+            Key = self._keyboard.Key
+            special_keys = {
+                'space': Key.space,
+                'enter': Key.enter,
+                'tab': Key.tab,
+                'shift': Key.shift,
+                'shift_l': Key.shift_l,
+                'shift_r': Key.shift_r,
+                'ctrl': Key.ctrl,
+                'ctrl_l': Key.ctrl_l,
+                'ctrl_r': Key.ctrl_r,
+                'alt': Key.alt,
+                'alt_l': Key.alt_l,
+                'alt_r': Key.alt_r,
+                'cmd': Key.cmd,
+                'esc': Key.esc,
+                'backspace': Key.backspace,
+                'delete': Key.delete,
+                'home': Key.home,
+                'end': Key.end,
+                'page_up': Key.page_up,
+                'page_down': Key.page_down,
+                'up': Key.up,
+                'down': Key.down,
+                'left': Key.left,
+                'right': Key.right,
+                'caps_lock': Key.caps_lock,
+                'num_lock': Key.num_lock,
+                'scroll_lock': Key.scroll_lock,
+                'print_screen': Key.print_screen,
+                'pause': Key.pause,
+                'insert': Key.insert,
+                'menu': Key.menu,
+            }
+
+            # Teclas F1-F20
+            for i in range(1, 21):
+                special_keys[f'f{i}'] = getattr(Key, f'f{i}')
+
+            self._special_keys = special_keys
+        return self._special_keys
+
+    def resolve_key(self, name: str):
+        try:
+            # Teclas de um caractere
+            if len(name) == 1:
+                return name
+
+            return self.get_special_keys().get(name.lower(), name)
+
+        except Exception as e:
+            print(f"Erro ao converter tecla {name}: {e}")
+            return None
+
+
+class FakeMouseController:
+    """Controlador de mouse em memória que registra as operações executadas"""
+
+    def __init__(self, backend: "FakeBackend"):
+        self._backend = backend
+        self._position = (0, 0)
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    @position.setter
+    def position(self, value: Tuple[int, int]) -> None:
+        self._position = value
+        self._backend.record("move", value)
+
+    def press(self, button) -> None:
+        self._backend.record("press", button)
+
+    def release(self, button) -> None:
+        self._backend.record("release", button)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        self._backend.record("scroll", (dx, dy))
+
+
+class FakeKeyboardController:
+    """Controlador de teclado em memória que registra as operações executadas"""
+
+    def __init__(self, backend: "FakeBackend"):
+        self._backend = backend
+
+    def press(self, key) -> None:
+        self._backend.record("key_press", key)
+
+    def release(self, key) -> None:
+        self._backend.record("key_release", key)
+
+
+class FakeListener:
+    """
+    Listener sintético: ao iniciar, entrega os eventos de entrada configurados
+    aos callbacks a uma taxa fixa, em uma thread própria
+    """
+
+    def __init__(self, handlers: Dict[str, Callable], events: List[Dict[str, Any]], rate: float):
+        self.handlers = handlers
+        self.events = events
+        self.rate = rate
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    def inject(self, event: Dict[str, Any]) -> None:
+        """Entrega um evento no formato de dict da gravação ao callback correspondente"""
+        event_type = event["type"]
+        if event_type == "move" and self.handlers.get("move"):
+            self.handlers["move"](event["x"], event["y"])
+        elif event_type == "click" and self.handlers.get("click"):
+            self.handlers["click"](event["x"], event["y"], event["button"], event["action"] == "press")
+        elif event_type == "scroll" and self.handlers.get("scroll"):
+            self.handlers["scroll"](event["x"], event["y"], event["dx"], event["dy"])
+        elif event_type == "key_press" and self.handlers.get("key_press"):
+            self.handlers["key_press"](event["key"])
+        elif event_type == "key_release" and self.handlers.get("key_release"):
+            self.handlers["key_release"](event["key"])
+
+    def _run(self) -> None:
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        start = time.perf_counter()
+        for index, event in enumerate(self.events):
+            if interval:
+                delay = start + index * interval - time.perf_counter()
+                if delay > 0 and self._stop_event.wait(delay):
+                    break
+            if self._stop_event.is_set():
+                break
+            self.inject(event)
+
+
+class FakeBackend(InputBackend):
+    """
+    Backend em memória para benchmarks e testes sem interface gráfica
+    Os controladores registram cada operação com timestamp (perf_counter) e os
+    listeners injetam fluxos sintéticos de entrada a uma taxa configurável
+    """
+
+    MOUSE_EVENT_TYPES = ("move", "click", "scroll")
+    KEYBOARD_EVENT_TYPES = ("key_press", "key_release")
+
+    def __init__(self, input_events: Optional[List[Dict[str, Any]]] = None, input_rate: float = 1000.0,
+                 record_operations: bool = True):
+        self.input_events = input_events or []
+        self.input_rate = input_rate
+        self.record_operations = record_operations
+        self.operations: List[Tuple[float, str, Any]] = []
+        self.operation_count = 0
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, value: Any) -> None:
+        """Registra uma operação executada por um controlador"""
+        self.operation_count += 1
+        if self.record_operations:
+            with self._lock:
+                self.operations.append((time.perf_counter(), operation, value))
+
+    def clear(self) -> None:
+        """Descarta as operações registradas"""
+        with self._lock:
+            self.operations = []
+            self.operation_count = 0
+
+    def create_mouse_controller(self):
+        return FakeMouseController(self)
+
+    def create_keyboard_controller(self):
+        return FakeKeyboardController(self)
+
+    def create_mouse_listener(self, on_move=None, on_click=None, on_scroll=None):
+        events = [e for e in self.input_events if e["type"] in self.MOUSE_EVENT_TYPES]
+        return FakeListener({"move": on_move, "click": on_click, "scroll": on_scroll}, events, self.input_rate)
+
+    def create_keyboard_listener(self, on_press=None, on_release=None):
+        events = [e for e in self.input_events if e["type"] in self.KEYBOARD_EVENT_TYPES]
+        return FakeListener({"key_press": on_press, "key_release": on_release}, events, self.input_rate)
+
+    def button_name(self, button) -> str:
+        return button
+
+    def resolve_button(self, name: str):
+        return name
+
+    def key_name(self, key) -> str:
+        return key
+
+    def resolve_key(self, name: str):
+        return name
+
+
+def synthetic_moves(count: int, width: int = 1920, height: int = 1080) -> List[Dict[str, Any]]:
+    """Gera um fluxo sintético de movimentos do mouse para o FakeBackend"""
+    return [
+        {"type": "move", "x": (i * 7) % width, "y": (i * 3) % height, "timestamp": 0.0}
+        for i in range(count)
+    ]
@@ -0,0 +1,188 @@
+"""
+Janela da Biblioteca - Mouse Recorder
+Busca gravações no catálogo por nome, data, duração, eventos e teclas usadas
+"""
+
+import datetime
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Dict, List, Any, Optional
+
+
+ANY_KEY = "Qualquer"
+
+
+class LibraryWindow:
+    """
+    Janela da biblioteca de gravações
+    As buscas consultam o catálogo SQLite do FileManager do gravador
+    """
+
+    def __init__(self, parent=None, recorder=None):
+        self.parent = parent
+        self.recorder = recorder
+        self.library = recorder.file_manager.library
+        self.window = tk.Toplevel(parent) if parent else tk.Tk()
+        self.window.title("Biblioteca - Mouse Recorder")
+        self.window.geometry("800x500")
+        self.window.resizable(True, True)
+
+        self.results: List[Dict[str, Any]] = []
+        self.filter_vars: Dict[str, tk.StringVar] = {}
+        self.sync_thread: Optional[threading.Thread] = None
+
+        self.setup_ui()
+        self.search()
+
+    def setup_ui(self) -> None:
+        """Configura a interface da janela da biblioteca"""
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # Filtros
+        filters_frame = ttk.LabelFrame(frame, text="Filtros", padding="5")
+        filters_frame.pack(fill=tk.X)
+
+        fields = (
+            ("name", "Nome:", 0, 0, 20),
+            ("created_from", "Criada de (AAAA-MM-DD):", 0, 2, 12),
+            ("created_to", "até:", 0, 4, 12),
+            ("min_duration", "Duração mín. (s):", 1, 0, 8),
+            ("max_duration", "máx.:", 1, 2, 8),
+            ("min_events", "Eventos mín.:", 2, 0, 8),
+            ("max_events", "máx.:", 2, 2, 8),
+        )
+        for key, label, row, column, width in fields:
+            self.filter_vars[key] = tk.StringVar()
+            ttk.Label(filters_frame, text=label).grid(row=row, column=column, sticky=tk.W, padx=(5, 2), pady=2)
+            entry = ttk.Entry(filters_frame, textvariable=self.filter_vars[key], width=width)
+            entry.grid(row=row, column=column + 1, sticky=tk.W, pady=2)
+            entry.bind("<Return>", lambda event: self.search())
+
+        self.filter_vars["key"] = tk.StringVar(value=ANY_KEY)
+        ttk.Label(filters_frame, text="Tecla usada:").grid(row=1, column=4, sticky=tk.W, padx=(5, 2), pady=2)
+        self.key_combo = ttk.Combobox(filters_frame, textvariable=self.filter_vars["key"], width=12)
+        self.key_combo.grid(row=1, column=5, sticky=tk.W, pady=2)
+        self.refresh_keys()
+
+        buttons_frame = ttk.Frame(filters_frame)
+        buttons_frame.grid(row=2, column=4, columnspan=2, sticky=tk.E, pady=2)
+        ttk.Button(buttons_frame, text="🔍 Buscar", command=self.search).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons_frame, text="🧹 Limpar", command=self.clear_filters).pack(side=tk.LEFT, padx=2)
+
+        # Resultados
+        results_frame = ttk.Frame(frame, padding=(0, 10, 0, 0))
+        results_frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("name", "created_at", "duration", "events", "file")
+        self.tree = ttk.Treeview(results_frame, columns=columns, show="headings", height=12)
+        self.tree.heading("name", text="Nome")
+        self.tree.heading("created_at", text="Criada em")
+        self.tree.heading("duration", text="Duração")
+        self.tree.heading("events", text="Eventos")
+        self.tree.heading("file", text="Arquivo")
+        self.tree.column("name", width=200)
+        self.tree.column("created_at", width=150)
+        self.tree.column("duration", width=80, anchor=tk.CENTER)
+        self.tree.column("events", width=80, anchor=tk.CENTER)
+        self.tree.column("file", width=220)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<Double-1>", lambda event: self.load_selected())
+
+        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Rodapé
+        bottom_frame = ttk.Frame(frame, padding=(0, 10, 0, 0))
+        bottom_frame.pack(fill=tk.X)
+        self.status_var = tk.StringVar()
+        ttk.Label(bottom_frame, textvariable=self.status_var).pack(side=tk.LEFT)
+        ttk.Button(bottom_frame, text="📁 Carregar", command=self.load_selected,
+                   style='Play.TButton').pack(side=tk.RIGHT, padx=2)
+        self.sync_btn = ttk.Button(bottom_frame, text="🔄 Atualizar catálogo", command=self.sync)
+        self.sync_btn.pack(side=tk.RIGHT, padx=2)
+
+    def refresh_keys(self) -> None:
+        """Atualiza as teclas disponíveis no filtro"""
+        self.key_combo["values"] = [ANY_KEY] + self.library.keys_used()
+
+    def clear_filters(self) -> None:
+        """Limpa os filtros e refaz a busca"""
+        for key, var in self.filter_vars.items():
+            var.set(ANY_KEY if key == "key" else "")
+        self.search()
+
+    def get_filters(self) -> Dict[str, Any]:
+        """Converte os campos em filtros de RecordingLibrary.query; lança ValueError se inválidos"""
+        values = {key: var.get().strip() for key, var in self.filter_vars.items()}
+        filters: Dict[str, Any] = {}
+
+        if values["name"]:
+            filters["name"] = values["name"]
+        if values["created_from"]:
+            filters["created_from"] = datetime.date.fromisoformat(values["created_from"]).isoformat()
+        if values["created_to"]:
+            # Data final inclusiva: tudo antes do dia seguinte
+            end = datetime.date.fromisoformat(values["created_to"]) + datetime.timedelta(days=1)
+            filters["created_before"] = end.isoformat()
+        for key in ("min_duration", "max_duration"):
+            if values[key]:
+                filters[key] = float(values[key])
+        for key in ("min_events", "max_events"):
+            if values[key]:
+                filters[key] = int(values[key])
+        if values["key"] and values["key"] != ANY_KEY:
+            filters["keys"] = [values["key"]]
+        return filters
+
+    def search(self) -> None:
+        """Busca no catálogo com os filtros atuais"""
+        try:
+            filters = self.get_filters()
+        except ValueError as e:
+            messagebox.showerror("Erro", f"Filtro inválido:\n{e}", parent=self.window)
+            return
+
+        self.results = self.library.query(**filters)
+        self.tree.delete(*self.tree.get_children())
+        for recording in self.results:
+            self.tree.insert("", tk.END, values=(
+                recording["name"],
+                recording["created_at"][:19].replace("T", " "),
+                f"{recording['duration'] or 0:.1f}s",
+                recording["total_events"],
+                recording["filename"]
+            ))
+        self.status_var.set(f"{len(self.results)} gravações")
+
+    def sync(self) -> None:
+        """Relê arquivos novos ou alterados em segundo plano e refaz a busca ao terminar"""
+        if self.sync_thread and self.sync_thread.is_alive():
+            return
+        self.sync_btn.configure(state=tk.DISABLED)
+        self.status_var.set("Atualizando catálogo...")
+        self.sync_thread = threading.Thread(target=self.library.sync, daemon=True)
+        self.sync_thread.start()
+        self.window.after(100, self._wait_sync)
+
+    def _wait_sync(self) -> None:
+        """Aguarda a sincronização sem travar a janela"""
+        if self.sync_thread.is_alive():
+            self.window.after(100, self._wait_sync)
+            return
+        self.sync_btn.configure(state=tk.NORMAL)
+        self.refresh_keys()
+        self.search()
+
+    def load_selected(self) -> None:
+        """Carrega a gravação selecionada na janela principal"""
+        selection = self.tree.selection()
+        if not selection or not self.recorder:
+            return
+        recording = self.results[self.tree.index(selection[0])]
+        try:
+            self.recorder.load_recording_path(recording["filepath"])
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao carregar gravação:\n{e}", parent=self.window)
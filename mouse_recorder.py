@@ -5,13 +5,10 @@ Desenvolvido para automação completa de tarefas em jogos e aplicações
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import json
 import time
 import threading
-from pynput import mouse, keyboard
-from pynput.mouse import Button, Listener as MouseListener
-from pynput.keyboard import Key, Listener as KeyboardListener
 import datetime
 import os
 import sys
@@ -48,8 +45,21 @@ def play_notification_sound(root=None):
         # Silently ignore audio errors
         pass
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import queue
+from event_buffer import (
+    EventBuffer, EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE,
+    EVENT_SCROLL, EVENT_KEY_PRESS, EVENT_KEY_RELEASE, NO_NAME, NS_PER_SECOND
+)
+from recording_journal import RecordingJournal
+from recording_format import (
+    read_recording, write_recording, validate_recording, RecordingView, count_event_types, BINARY_EXTENSION,
+    RECORDING_FILETYPES, compression_from_settings
+)
+from input_backends import InputBackend, PynputBackend, CONTROL_HOTKEYS
+from playback_session import PlaybackSession
+from utils import PerformanceMonitor, FileManager
+from playlist import PlaylistPlayer
 
 
 class RecordingSession:
@@ -58,333 +68,413 @@ class RecordingSession:
     Captura movimentos, cliques, scroll e teclas com timestamps precisos
     """
     
-    def __init__(self):
-        self.events: List[Dict[str, Any]] = []
-        self.start_time: float = 0
+    # Orçamento de tempo dos callbacks do hook do sistema no modo com fila
+    CALLBACK_BUDGET_NS = 1000
+    
+    # Espera máxima (segundos) pelo fim dos listeners ao parar a gravação
+    LISTENER_JOIN_TIMEOUT = 1.0
+    
+    # Taxa máxima de amostragem de movimentos (Hz) por precisão de captura (0 = sem limite)
+    MOVE_RATE_BY_PRECISION = {"Alta": 0, "Média": 120, "Baixa": 40}
+    
+    def __init__(self, queued_capture: bool = True, journal_dir: Optional[str] = None,
+                 segment_size: int = 50000, sync_events: int = 500, sync_interval: float = 0.25,
+                 max_move_rate: int = 0, min_move_distance: int = 0,
+                 backend: Optional[InputBackend] = None):
+        self.backend = backend or PynputBackend()
+        self.buffer = EventBuffer()
+        # Relógio monotônico de alta resolução (nanossegundos inteiros)
+        self.start_time_ns: int = 0
+        self._last_event_ns: int = 0
         self.is_recording: bool = False
-        self.mouse_listener: Optional[MouseListener] = None
-        self.keyboard_listener: Optional[KeyboardListener] = None
+        self.mouse_listener = None
+        self.keyboard_listener = None
         self.record_mouse: bool = True
         self.record_keyboard: bool = True
         
+        # Modo com fila: os callbacks só enfileiram tuplas brutas e uma
+        # thread consumidora faz a normalização e o armazenamento. Com journal
+        # a fila é obrigatória: o fsync nunca pode rodar na thread do hook do sistema
+        self.queued_capture = queued_capture or journal_dir is not None
+        self._raw_queue: Optional[queue.SimpleQueue] = None
+        self._consumer_thread: Optional[threading.Thread] = None
+        self._reset_capture_stats()
+        
+        # No modo direto os listeners de mouse e teclado gravam de threads distintas
+        self._direct_lock = threading.Lock()
+        
+        # Modo streaming: os eventos vão para um journal append-only em journal_dir
+        # (fsync a cada sync_events eventos ou sync_interval segundos) e a janela
+        # em memória é esvaziada a cada segment_size eventos
+        self.journal_dir = journal_dir
+        self.segment_size = max(1, segment_size)
+        self.sync_events = max(1, sync_events)
+        self.sync_interval_ns = int(sync_interval * 1_000_000_000)
+        self.journal: Optional[RecordingJournal] = None
+        self._spilled_duration: float = 0.0
+        self._journaled = 0
+        self._last_sync_ns: int = 0
+        
+        # Filtro de movimentos: descarta amostras mais frequentes que max_move_rate
+        # ou mais próximas que min_move_distance pixels do último ponto gravado
+        self.min_move_interval_ns = NS_PER_SECOND // max_move_rate if max_move_rate > 0 else 0
+        self.min_move_distance_sq = max(0, min_move_distance) ** 2
+        self._filter_moves = self.min_move_interval_ns > 0 or self.min_move_distance_sq > 0
+        self._last_move: Optional[tuple] = None
+        self._pending_move: Optional[tuple] = None
+        
+    def collect_events(self) -> EventBuffer:
+        """
+        Junta journal e janela em memória em um EventBuffer independente da sessão
+        (a janela é reutilizada na próxima gravação). Relê o journal inteiro a cada
+        chamada: guarde o resultado em vez de chamar de novo
+        """
+        events = self.journal.read_buffer() if self.journal else EventBuffer(len(self.buffer))
+        events.extend(self.buffer)
+        return events
+        
+    def iter_events(self):
+        """Itera sobre todos os eventos gravados (journal e janela em memória)"""
+        if self.journal:
+            yield from self.journal.iter_events()
+        yield from self.buffer.iter_events()
+        
     def start_recording(self, record_mouse: bool = True, record_keyboard: bool = True) -> None:
         """Inicia a gravação dos eventos do mouse e/ou teclado"""
-        self.events.clear()
-        self.start_time = time.time()
+        self.buffer.clear()
+        self._reset_capture_stats()
+        self._spilled_duration = 0.0
+        self._journaled = 0
+        self._last_move = None
+        self._pending_move = None
+        if self.journal_dir:
+            self.journal = RecordingJournal(RecordingJournal.new_path(self.journal_dir))
+            self.journal.open({
+                "record_mouse": record_mouse,
+                "record_keyboard": record_keyboard,
+                "segment_size": self.segment_size
+            })
+        self.start_time_ns = time.perf_counter_ns()
+        self._last_sync_ns = self.start_time_ns
+        self._last_event_ns = self.start_time_ns
         self.is_recording = True
         self.record_mouse = record_mouse
         self.record_keyboard = record_keyboard
         
+        if self.queued_capture:
+            self._raw_queue = queue.SimpleQueue()
+            self._consumer_thread = threading.Thread(target=self._consume_worker, daemon=True)
+            self._consumer_thread.start()
+            on_move, on_click, on_scroll = self._push_mouse_move, self._push_mouse_click, self._push_mouse_scroll
+            on_press, on_release = self._push_key_press, self._push_key_release
+        else:
+            on_move, on_click, on_scroll = self._on_mouse_move, self._on_mouse_click, self._on_mouse_scroll
+            on_press, on_release = self._on_key_press, self._on_key_release
+        
         # Configura listener do mouse se habilitado
         if self.record_mouse:
-            self.mouse_listener = MouseListener(
-                on_move=self._on_mouse_move,
-                on_click=self._on_mouse_click,
-                on_scroll=self._on_mouse_scroll
+            self.mouse_listener = self.backend.create_mouse_listener(
+                on_move=on_move,
+                on_click=on_click,
+                on_scroll=on_scroll
             )
             self.mouse_listener.start()
         
         # Configura listener do teclado se habilitado
         if self.record_keyboard:
-            self.keyboard_listener = KeyboardListener(
-                on_press=self._on_key_press,
-                on_release=self._on_key_release
+            self.keyboard_listener = self.backend.create_keyboard_listener(
+                on_press=on_press,
+                on_release=on_release
             )
             self.keyboard_listener.start()
         
-    def stop_recording(self) -> None:
-        """Para a gravação e finaliza os listeners"""
+    def stop_recording(self, saved_as: Optional[str] = None) -> None:
+        """
+        Para a gravação e finaliza os listeners
+        saved_as: arquivo onde a gravação será salva em seguida; fica no encerramento
+        do journal para que a recuperação saiba se o salvamento chegou a acontecer
+        """
         self.is_recording = False
         
-        if self.mouse_listener:
-            self.mouse_listener.stop()
-            self.mouse_listener = None
-            
-        if self.keyboard_listener:
-            self.keyboard_listener.stop()
-            self.keyboard_listener = None
+        # Um callback já em andamento pode passar pela verificação de is_recording
+        # antes dela mudar: os listeners são aguardados antes de fechar a fila e
+        # de despejar a janela, para que esse último evento não se perca
+        listeners = [listener for listener in (self.mouse_listener, self.keyboard_listener) if listener]
+        for listener in listeners:
+            listener.stop()
+        for listener in listeners:
+            if listener is not threading.current_thread():
+                listener.join(self.LISTENER_JOIN_TIMEOUT)
+        self.mouse_listener = None
+        self.keyboard_listener = None
+            
+        # Sinaliza fim da fila e aguarda a consumidora esvaziar o que restou; a fila
+        # só é trocada na próxima gravação, então um callback atrasado nunca a encontra None
+        if self._consumer_thread:
+            self._raw_queue.put(None)
+            self._consumer_thread.join()
+            self._consumer_thread = None
+            
+        # A posição final do cursor é sempre mantida
+        self._flush_pending_move()
+            
+        # Despeja a janela restante e fecha o journal
+        if self.journal:
+            duration = self.get_duration()
+            self._spill()
+            footer = {"duration": duration}
+            if saved_as:
+                footer["saved_as"] = saved_as
+            self.journal.close(footer)
+            
+    def _sync_journal(self, now_ns: int) -> None:
+        """Grava no journal os eventos ainda pendentes da janela e faz fsync"""
+        if self._journaled < len(self.buffer):
+            self._journaled += self.journal.write_events(self.buffer, self._journaled)
+            self.journal.sync()
+        self._last_sync_ns = now_ns
+            
+    def _spill(self) -> None:
+        """Fecha o segmento atual: grava o restante no journal e esvazia a janela"""
+        if len(self.buffer):
+            self._spilled_duration = self.buffer.last_timestamp()
+            self._sync_journal(time.perf_counter_ns())
+            self.buffer.clear()
+            self._journaled = 0
+            
+    def discard_journal(self) -> None:
+        """Remove o journal após os eventos terem sido materializados ou salvos"""
+        if self.journal:
+            self.journal.discard()
+            self.journal = None
+            
+    def _reset_capture_stats(self) -> None:
+        """Zera os contadores do caminho de captura"""
+        self.events_queued = 0
+        self.max_queue_depth = 0
+        self.max_callback_ns = 0
+        self.callbacks_over_budget = 0
+        self.moves_filtered = 0
+        
+    def get_capture_stats(self) -> Dict[str, Any]:
+        """Retorna contadores da fila de captura e da duração dos callbacks"""
+        return {
+            "queued_capture": self.queued_capture,
+            "events_queued": self.events_queued,
+            "max_queue_depth": self.max_queue_depth,
+            "max_callback_us": self.max_callback_ns / 1000,
+            "callback_budget_us": self.CALLBACK_BUDGET_NS / 1000,
+            "callbacks_over_budget": self.callbacks_over_budget,
+            "moves_filtered": self.moves_filtered
+        }
+        
+    # === Caminho do hook (modo com fila): apenas enfileira tuplas brutas ===
+    
+    def _note_callback(self, started_ns: int) -> None:
+        """Contabiliza a duração de um callback do hook"""
+        elapsed = time.perf_counter_ns() - started_ns
+        self.events_queued += 1
+        if elapsed > self.max_callback_ns:
+            self.max_callback_ns = elapsed
+        if elapsed > self.CALLBACK_BUDGET_NS:
+            self.callbacks_over_budget += 1
+            
+    def _push_mouse_move(self, x: int, y: int) -> None:
+        if not (self.is_recording and self.record_mouse):
+            return
+        now = time.perf_counter_ns()
+        self._raw_queue.put((EVENT_MOVE, now, x, y))
+        self._note_callback(now)
+        
+    def _push_mouse_click(self, x: int, y: int, button, pressed: bool) -> None:
+        if not (self.is_recording and self.record_mouse):
+            return
+        now = time.perf_counter_ns()
+        self._raw_queue.put((EVENT_CLICK_PRESS if pressed else EVENT_CLICK_RELEASE, now, x, y, button))
+        self._note_callback(now)
+        
+    def _push_mouse_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
+        if not (self.is_recording and self.record_mouse):
+            return
+        now = time.perf_counter_ns()
+        self._raw_queue.put((EVENT_SCROLL, now, x, y, dx, dy))
+        self._note_callback(now)
+        
+    def _push_key_press(self, key) -> None:
+        if not (self.is_recording and self.record_keyboard):
+            return
+        now = time.perf_counter_ns()
+        self._raw_queue.put((EVENT_KEY_PRESS, now, key))
+        self._note_callback(now)
+        
+    def _push_key_release(self, key) -> None:
+        if not (self.is_recording and self.record_keyboard):
+            return
+        now = time.perf_counter_ns()
+        self._raw_queue.put((EVENT_KEY_RELEASE, now, key))
+        self._note_callback(now)
+        
+    def _consume_worker(self) -> None:
+        """Thread consumidora: normaliza e armazena os eventos enfileirados"""
+        raw_queue = self._raw_queue
+        idle_timeout = self.sync_interval_ns / 1_000_000_000 if self.journal else None
+        while True:
+            try:
+                item = raw_queue.get(timeout=idle_timeout)
+            except queue.Empty:
+                # Sem eventos novos: garante que o journal não fique para trás
+                self._sync_journal(time.perf_counter_ns())
+                continue
+            if item is None:
+                break
+                
+            depth = raw_queue.qsize()
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+                
+            try:
+                code = item[0]
+                if code == EVENT_MOVE:
+                    self._store_mouse_move(item[1], item[2], item[3])
+                elif code == EVENT_SCROLL:
+                    self._store_mouse_scroll(item[1], item[2], item[3], item[4], item[5])
+                elif code == EVENT_CLICK_PRESS or code == EVENT_CLICK_RELEASE:
+                    self._store_mouse_click(item[1], item[2], item[3], item[4], code == EVENT_CLICK_PRESS)
+                else:
+                    self._store_key(item[1], item[2], code)
+            except Exception as e:
+                print(f"Erro ao processar evento capturado: {e}")
+                
+    # === Caminho direto: processa no próprio callback do hook ===
             
     def _on_mouse_move(self, x: int, y: int) -> None:
         """Callback para movimentos do mouse"""
         if self.is_recording and self.record_mouse:
-            timestamp = time.time() - self.start_time
-            self.events.append({
-                "type": "move",
-                "x": x,
-                "y": y,
-                "timestamp": timestamp
-            })
+            with self._direct_lock:
+                self._store_mouse_move(time.perf_counter_ns(), x, y)
             
-    def _on_mouse_click(self, x: int, y: int, button: Button, pressed: bool) -> None:
+    def _on_mouse_click(self, x: int, y: int, button, pressed: bool) -> None:
         """Callback para cliques do mouse"""
         if self.is_recording and self.record_mouse:
-            timestamp = time.time() - self.start_time
-            button_name = "left" if button == Button.left else \
-                         "right" if button == Button.right else "middle"
-            action = "press" if pressed else "release"
-            
-            self.events.append({
-                "type": "click",
-                "x": x,
-                "y": y,
-                "button": button_name,
-                "action": action,
-                "timestamp": timestamp
-            })
+            with self._direct_lock:
+                self._store_mouse_click(time.perf_counter_ns(), x, y, button, pressed)
             
     def _on_mouse_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
         """Callback para scroll do mouse"""
         if self.is_recording and self.record_mouse:
-            timestamp = time.time() - self.start_time
-            self.events.append({
-                "type": "scroll",
-                "x": x,
-                "y": y,
-                "dx": dx,
-                "dy": dy,
-                "timestamp": timestamp
-            })
+            with self._direct_lock:
+                self._store_mouse_scroll(time.perf_counter_ns(), x, y, dx, dy)
             
     def _on_key_press(self, key) -> None:
         """Callback para teclas pressionadas"""
-        # Não grava hotkeys globais para não interferir no controle
-        try:
-            if key in [keyboard.Key.f9, keyboard.Key.f10, keyboard.Key.esc]:
-                return  # Ignora hotkeys globais
-        except AttributeError:
-            pass
-            
         if self.is_recording and self.record_keyboard:
-            timestamp = time.time() - self.start_time
-            key_name = self._get_key_name(key)
-            
-            self.events.append({
-                "type": "key_press",
-                "key": key_name,
-                "timestamp": timestamp
-            })
+            with self._direct_lock:
+                self._store_key(time.perf_counter_ns(), key, EVENT_KEY_PRESS)
             
     def _on_key_release(self, key) -> None:
         """Callback para teclas liberadas"""
+        if self.is_recording and self.record_keyboard:
+            with self._direct_lock:
+                self._store_key(time.perf_counter_ns(), key, EVENT_KEY_RELEASE)
+            
+    # === Normalização e armazenamento ===
+    
+    def _append(self, code: int, x: int, y: int, dx: int, dy: int, name_id: int, now_ns: int) -> None:
+        """Grava um evento na janela, despejando-a no journal quando cheia"""
+        # Mouse e teclado leem o relógio em threads distintas antes de enfileirar:
+        # a consumidora pode receber um evento com instante anterior ao último
+        # gravado. Os timestamps são mantidos monotônicos (nunca voltam no tempo)
+        if now_ns < self._last_event_ns:
+            now_ns = self._last_event_ns
+        self._last_event_ns = now_ns
+        self.buffer.append(code, x, y, dx, dy, name_id, now_ns - self.start_time_ns)
+        if self.journal:
+            if len(self.buffer) >= self.segment_size:
+                self._spill()
+            elif (len(self.buffer) - self._journaled >= self.sync_events
+                  or now_ns - self._last_sync_ns >= self.sync_interval_ns):
+                self._sync_journal(now_ns)
+    
+    def _store_mouse_move(self, now_ns: int, x: int, y: int) -> None:
+        """Armazena um movimento do mouse, aplicando o filtro de taxa e distância"""
+        x, y = int(x), int(y)
+        if self._filter_moves and self._last_move is not None:
+            last_ns, last_x, last_y = self._last_move
+            dx, dy = x - last_x, y - last_y
+            if (now_ns - last_ns < self.min_move_interval_ns
+                    or dx * dx + dy * dy < self.min_move_distance_sq):
+                # Guarda o ponto para o caso de um clique/scroll vir em seguida
+                if self._pending_move is not None:
+                    self.moves_filtered += 1
+                self._pending_move = (now_ns, x, y)
+                return
+                
+        if self._pending_move is not None:
+            self.moves_filtered += 1
+            self._pending_move = None
+        self._last_move = (now_ns, x, y)
+        self._append(EVENT_MOVE, x, y, 0, 0, NO_NAME, now_ns)
+        
+    def _flush_pending_move(self) -> None:
+        """Grava o último movimento descartado pelo filtro (posição antes de clique/scroll)"""
+        if self._pending_move is not None:
+            now_ns, x, y = self._pending_move
+            self._pending_move = None
+            self._last_move = (now_ns, x, y)
+            self._append(EVENT_MOVE, x, y, 0, 0, NO_NAME, now_ns)
+        
+    def _store_mouse_click(self, now_ns: int, x: int, y: int, button, pressed: bool) -> None:
+        """Armazena um clique do mouse"""
+        self._flush_pending_move()
+        button_name = self.backend.button_name(button)
+        code = EVENT_CLICK_PRESS if pressed else EVENT_CLICK_RELEASE
+        
+        self._append(code, int(x), int(y), 0, 0, self.buffer.intern(button_name), now_ns)
+        
+    def _store_mouse_scroll(self, now_ns: int, x: int, y: int, dx: int, dy: int) -> None:
+        """Armazena um scroll do mouse"""
+        self._flush_pending_move()
+        self._append(EVENT_SCROLL, int(x), int(y), int(dx), int(dy), NO_NAME, now_ns)
+        
+    def _store_key(self, now_ns: int, key, code: int) -> None:
+        """Armazena uma tecla pressionada ou liberada"""
+        key_name = self.backend.key_name(key)
+        
         # Não grava hotkeys globais para não interferir no controle
-        try:
-            if key in [keyboard.Key.f9, keyboard.Key.f10, keyboard.Key.esc]:
-                return  # Ignora hotkeys globais
-        except AttributeError:
-            pass
+        if key_name in CONTROL_HOTKEYS:
+            return
             
-        if self.is_recording and self.record_keyboard:
-            timestamp = time.time() - self.start_time
-            key_name = self._get_key_name(key)
+        self._append(code, 0, 0, 0, 0, self.buffer.intern(key_name), now_ns)
             
-            self.events.append({
-                "type": "key_release",
-                "key": key_name,
-                "timestamp": timestamp
-            })
+    def get_elapsed(self) -> float:
+        """Tempo decorrido desde o início da gravação, em segundos"""
+        return (time.perf_counter_ns() - self.start_time_ns) / 1_000_000_000
             
-    def _get_key_name(self, key) -> str:
-        """Converte objeto de tecla para string"""
-        try:
-            # Teclas alfanuméricas e símbolos
-            if hasattr(key, 'char') and key.char is not None:
-                return key.char
-            # Teclas especiais
-            elif hasattr(key, 'name'):
-                return key.name
-            # Fallback
-            else:
-                return str(key)
-        except AttributeError:
-            return str(key)
+    def get_event_count(self) -> int:
+        """Retorna o número de eventos capturados"""
+        spilled = self.journal.events_written if self.journal else 0
+        return spilled + len(self.buffer)
             
     def get_duration(self) -> float:
         """Retorna a duração total da gravação"""
-        if not self.events:
-            return 0.0
-        return max(event["timestamp"] for event in self.events)
+        if not len(self.buffer):
+            return self._spilled_duration
+        return self.buffer.last_timestamp()
         
     def to_dict(self, name: str = "") -> Dict[str, Any]:
-        """Converte a sessão para dicionário para salvamento"""
+        """
+        Converte a sessão para dicionário para salvamento
+        "events" é um EventBuffer (não serializável com json.dump): salve com write_recording
+        """
         return {
             "name": name or f"Gravacao_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}",
             "duration": self.get_duration(),
-            "total_events": len(self.events),
+            "total_events": self.get_event_count(),
             "created_at": datetime.datetime.now().isoformat(),
-            "events": self.events
+            "events": self.collect_events()
         }
 
 
-class PlaybackSession:
-    """
-    Gerencia a reprodução de gravações
-    Executa eventos de mouse e teclado com timing preciso e suporte a repetições
-    """
-    
-    def __init__(self, events: List[Dict[str, Any]], speed_multiplier: float = 1.0):
-        self.events = events
-        self.speed_multiplier = speed_multiplier
-        self.is_playing = False
-        self.mouse_controller = mouse.Controller()
-        self.keyboard_controller = keyboard.Controller()
-        self.current_repetition = 0
-        self.total_repetitions = 1
-        self.playback_thread: Optional[threading.Thread] = None
-        self.stop_event = threading.Event()
-        
-    def play(self, repetitions: int = 1, callback_progress=None, callback_complete=None) -> None:
-        """
-        Inicia a reprodução dos eventos
-        
-        Args:
-            repetitions: Número de repetições
-            callback_progress: Função chamada para atualizar progresso
-            callback_complete: Função chamada ao completar
-        """
-        self.total_repetitions = repetitions
-        self.current_repetition = 0
-        self.is_playing = True
-        self.stop_event.clear()
-        
-        self.playback_thread = threading.Thread(
-            target=self._playback_worker,
-            args=(callback_progress, callback_complete),
-            daemon=True
-        )
-        self.playback_thread.start()
-        
-    def stop(self) -> None:
-        """Para a reprodução"""
-        self.is_playing = False
-        self.stop_event.set()
-        
-    def _playback_worker(self, callback_progress=None, callback_complete=None) -> None:
-        """Worker thread para reprodução dos eventos"""
-        try:
-            for rep in range(self.total_repetitions):
-                if self.stop_event.is_set():
-                    break
-                    
-                self.current_repetition = rep + 1
-                
-                if callback_progress:
-                    callback_progress(self.current_repetition, self.total_repetitions, 0)
-                
-                # Reproduz todos os eventos da gravação
-                last_timestamp = 0
-                total_events = len(self.events)
-                
-                for i, event in enumerate(self.events):
-                    if self.stop_event.is_set():
-                        break
-                        
-                    # Calcula delay baseado no timestamp e velocidade
-                    delay = (event["timestamp"] - last_timestamp) / self.speed_multiplier
-                    if delay > 0:
-                        time.sleep(delay)
-                        
-                    # Executa o evento
-                    self._execute_event(event)
-                    last_timestamp = event["timestamp"]
-                    
-                    # Atualiza progresso
-                    if callback_progress:
-                        progress = (i + 1) / total_events
-                        callback_progress(self.current_repetition, self.total_repetitions, progress)
-                        
-        except Exception as e:
-            print(f"Erro durante reprodução: {e}")
-        finally:
-            self.is_playing = False
-            if callback_complete:
-                callback_complete()
-                
-    def _execute_event(self, event: Dict[str, Any]) -> None:
-        """Executa um evento específico"""
-        try:
-            if event["type"] == "move":
-                self.mouse_controller.position = (event["x"], event["y"])
-                
-            elif event["type"] == "click":
-                self.mouse_controller.position = (event["x"], event["y"])
-                button = Button.left if event["button"] == "left" else \
-                        Button.right if event["button"] == "right" else Button.middle
-                        
-                if event["action"] == "press":
-                    self.mouse_controller.press(button)
-                else:
-                    self.mouse_controller.release(button)
-                    
-            elif event["type"] == "scroll":
-                self.mouse_controller.position = (event["x"], event["y"])
-                self.mouse_controller.scroll(event["dx"], event["dy"])
-                
-            elif event["type"] == "key_press":
-                key = self._string_to_key(event["key"])
-                if key:
-                    self.keyboard_controller.press(key)
-                    
-            elif event["type"] == "key_release":
-                key = self._string_to_key(event["key"])
-                if key:
-                    self.keyboard_controller.release(key)
-                
-        except Exception as e:
-            print(f"Erro ao executar evento: {e}")
-            
-    def _string_to_key(self, key_str: str):
-        """Converte string de volta para objeto de tecla"""
-        try:
-            # Teclas de um caractere
-            if len(key_str) == 1:
-                return key_str
-                
-            # Teclas especiais mapeadas
-            special_keys = {
-                'space': keyboard.Key.space,
-                'enter': keyboard.Key.enter,
-                'tab': keyboard.Key.tab,
-                'shift': keyboard.Key.shift,
-                'shift_l': keyboard.Key.shift_l,
-                'shift_r': keyboard.Key.shift_r,
-                'ctrl': keyboard.Key.ctrl,
-                'ctrl_l': keyboard.Key.ctrl_l,
-                'ctrl_r': keyboard.Key.ctrl_r,
-                'alt': keyboard.Key.alt,
-                'alt_l': keyboard.Key.alt_l,
-                'alt_r': keyboard.Key.alt_r,
-                'cmd': keyboard.Key.cmd,
-                'esc': keyboard.Key.esc,
-                'backspace': keyboard.Key.backspace,
-                'delete': keyboard.Key.delete,
-                'home': keyboard.Key.home,
-                'end': keyboard.Key.end,
-                'page_up': keyboard.Key.page_up,
-                'page_down': keyboard.Key.page_down,
-                'up': keyboard.Key.up,
-                'down': keyboard.Key.down,
-                'left': keyboard.Key.left,
-                'right': keyboard.Key.right,
-                'caps_lock': keyboard.Key.caps_lock,
-                'num_lock': keyboard.Key.num_lock,
-                'scroll_lock': keyboard.Key.scroll_lock,
-                'print_screen': keyboard.Key.print_screen,
-                'pause': keyboard.Key.pause,
-                'insert': keyboard.Key.insert,
-                'menu': keyboard.Key.menu,
-            }
-            
-            # Teclas F1-F20
-            for i in range(1, 21):
-                special_keys[f'f{i}'] = getattr(keyboard.Key, f'f{i}')
-            
-            return special_keys.get(key_str.lower(), key_str)
-            
-        except Exception as e:
-            print(f"Erro ao converter tecla {key_str}: {e}")
-            return None
-
-
 class SettingsManager:
     """
     Gerencia configurações da aplicação
@@ -405,7 +495,22 @@ class SettingsManager:
             "hotkey_play": "F10",
             "hotkey_stop": "ESC",
             "max_events": 50000,
+            "catch_up_moves": False,
+            "catch_up_threshold_ms": 50,
+            "loop_gap_ms": 500,
+            "smooth_movements": False,
+            "smooth_movement_rate": 120,
+            "reposition_actions": False,
+            "queued_capture": True,
+            "streaming_recording": True,
+            "journal_sync_events": 500,
+            "journal_sync_interval_ms": 250,
+            "capture_precision": "Alta",
+            "min_movement_distance": 5,
             "auto_save": True,
+            "compression_enabled": False,
+            "compression_method": "zlib",
+            "delta_encoding": False,
             "sound_notification": True
         }
         self.settings = self.load_settings()
@@ -448,6 +553,22 @@ class MouseRecorder:
     Gerencia interface gráfica e coordena todas as funcionalidades
     """
     
+    # Intervalo de atualização da barra de progresso durante a reprodução (~30 fps)
+    PROGRESS_FRAME_MS = 33
+    
+    # Salto das hotkeys F6/F7 durante a reprodução (segundos da gravação)
+    SEEK_STEP_SECONDS = 5.0
+    
+    # Antecedência com que o timer da contagem acorda; a sessão espera o resto com precisão
+    COUNTDOWN_LEAD_MS = 50
+    
+    # Intervalo de consulta à sessão ainda em preparação no fim da contagem
+    PREPARATION_POLL_MS = 5
+    
+    # Opções fixas do seletor de trecho
+    WHOLE_RECORDING = "Gravação inteira"
+    ALL_SEGMENTS = "Todos os trechos"
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Mouse & Keyboard Recorder - Automação Completa")
@@ -459,8 +580,12 @@ class MouseRecorder:
         
         # Gerenciadores
         self.settings = SettingsManager()
+        self.performance_monitor = PerformanceMonitor()
+        self.file_manager = FileManager("recordings", settings=self.settings)
+        self.input_backend: InputBackend = PynputBackend()
         self.recording_session: Optional[RecordingSession] = None
         self.playback_session: Optional[PlaybackSession] = None
+        self.playlist_player: Optional[PlaylistPlayer] = None
         self.current_recording_data: Optional[Dict[str, Any]] = None
         
         # Estado da aplicação
@@ -473,11 +598,18 @@ class MouseRecorder:
         
         # Queue para comunicação thread-safe
         self.update_queue = queue.Queue()
+        self._last_progress: Optional[Tuple[int, int, float]] = None
         
         # Configuração da interface
         self.setup_ui()
         self.setup_hotkeys()
         
+        # Recupera gravações interrompidas por travamento
+        self.recover_unfinished_recordings()
+        
+        # Atualiza o catálogo com arquivos alterados fora da aplicação, sem travar a interface
+        threading.Thread(target=self._sync_library, daemon=True).start()
+        
         # Timer para atualizar interface
         self.root.after(100, self.process_updates)
         
@@ -525,6 +657,8 @@ class MouseRecorder:
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(status_frame, variable=self.progress_var, length=400)
         self.progress_bar.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        # Clique na barra salta para o ponto correspondente da reprodução
+        self.progress_bar.bind("<Button-1>", self.on_progress_click)
         
         # === SEÇÃO DE CONTROLES PRINCIPAIS ===
         controls_frame = ttk.LabelFrame(main_frame, text="Controles Principais", padding="10")
@@ -544,6 +678,9 @@ class MouseRecorder:
         self.stop_btn = ttk.Button(buttons_frame, text="⏹️ Parar", command=self.stop_all, style='Stop.TButton')
         self.stop_btn.grid(row=0, column=2, padx=5)
         
+        self.pause_btn = ttk.Button(buttons_frame, text="⏸️ Pausar", command=self.toggle_pause, state=tk.DISABLED)
+        self.pause_btn.grid(row=0, column=3, padx=5)
+        
         # Opções de gravação
         record_options_frame = ttk.Frame(controls_frame)
         record_options_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0))
@@ -580,6 +717,9 @@ class MouseRecorder:
         # Callback para atualizar label da velocidade
         def update_speed_label(*args):
             self.speed_label_var.set(f"{self.speed_var.get():.1f}x")
+            # Aplica a nova velocidade à reprodução em andamento
+            if self.is_playing and self.playback_session:
+                self.playback_session.set_speed(self.speed_var.get())
         self.speed_var.trace('w', update_speed_label)
         
         # Ação final
@@ -590,6 +730,16 @@ class MouseRecorder:
                                         state="readonly", width=20)
         final_action_combo.grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=2)
         
+        # Trecho (segmentos marcados na gravação)
+        ttk.Label(playback_frame, text="Trecho:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.segment_var = tk.StringVar(value=self.WHOLE_RECORDING)
+        self.segment_combo = ttk.Combobox(playback_frame, textvariable=self.segment_var,
+                                          values=[self.WHOLE_RECORDING], state="readonly", width=20)
+        self.segment_combo.grid(row=3, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        
+        add_segment_btn = ttk.Button(playback_frame, text="➕ Trecho", command=self.add_segment)
+        add_segment_btn.grid(row=3, column=2, sticky=tk.W, padx=(5, 0), pady=2)
+        
         # === SEÇÃO DE ARQUIVOS ===
         files_frame = ttk.LabelFrame(main_frame, text="Gerenciamento de Arquivos", padding="10")
         files_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -607,6 +757,12 @@ class MouseRecorder:
         self.settings_btn = ttk.Button(file_buttons_frame, text="⚙️ Configurações", command=self.open_settings, style='Save.TButton')
         self.settings_btn.grid(row=0, column=2, padx=5)
         
+        self.playlist_btn = ttk.Button(file_buttons_frame, text="📜 Playlist", command=self.open_playlist, style='Save.TButton')
+        self.playlist_btn.grid(row=0, column=3, padx=5)
+        
+        self.library_btn = ttk.Button(file_buttons_frame, text="📚 Biblioteca", command=self.open_library, style='Save.TButton')
+        self.library_btn.grid(row=0, column=4, padx=5)
+        
         # === SEÇÃO DE INFORMAÇÕES ===
         info_frame = ttk.LabelFrame(main_frame, text="Informações da Gravação", padding="10")
         info_frame.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -641,6 +797,8 @@ class MouseRecorder:
         # Inicializa interface
         self.update_ui_state()
         self.log_message("Aplicação iniciada. Use F9 para gravar, F10 para reproduzir, ESC para parar.")
+        self.log_message("Durante a reprodução: F8 pausa/retoma, F6/F7 voltam/avançam "
+                         f"{self.SEEK_STEP_SECONDS:.0f}s e clicar na barra de progresso salta para o ponto.")
         self.log_message("💡 Dica: Selecione 'Mouse' e/ou 'Teclado' para escolher o que gravar!")
         
     def setup_hotkeys(self) -> None:
@@ -654,28 +812,46 @@ class MouseRecorder:
                     pass
             
             # Cria novo listener para hotkeys globais
-            self.hotkey_listener = KeyboardListener(
-                on_press=self.on_key_press,
-                suppress=False  # Não suprime outras teclas
+            self.hotkey_listener = self.input_backend.create_keyboard_listener(
+                on_press=self.on_key_press  # Não suprime outras teclas
             )
             self.hotkey_listener.start()
-            self.log_message("✅ Hotkeys configuradas: F9 (gravar), F10 (reproduzir), ESC (parar)")
+            self.log_message("✅ Hotkeys configuradas: F9 (gravar), F10 (reproduzir), ESC (parar), "
+                             "F8 (pausar), F6/F7 (voltar/avançar)")
         except Exception as e:
             self.log_message(f"Erro ao configurar hotkeys: {e}")
             
     def on_key_press(self, key) -> None:
         """Callback para teclas pressionadas"""
         try:
+            key_name = self.input_backend.key_name(key)
+            
+            # Teclas enviadas pela própria reprodução (uma gravação com F8/F6/F7)
+            # não podem pausar nem saltar a reprodução
+            player = self.playlist_player
+            session = player.current_session if player else self.playback_session
+            if self.is_playing and session and session.is_injected_key(key_name):
+                return
+            
             # Hotkeys globais sempre funcionam, mesmo durante gravação
-            if key == keyboard.Key.f9:
+            if key_name == "f9":
                 self.update_queue.put(('hotkey', 'record'))
                 return  # Não processa mais nada
-            elif key == keyboard.Key.f10:
+            elif key_name == "f10":
                 self.update_queue.put(('hotkey', 'play'))
                 return  # Não processa mais nada
-            elif key == keyboard.Key.esc:
+            elif key_name == "esc":
                 self.update_queue.put(('hotkey', 'stop'))
                 return  # Não processa mais nada
+            elif key_name == "f8":
+                self.update_queue.put(('hotkey', 'pause'))
+                return
+            elif key_name == "f6":
+                self.update_queue.put(('hotkey', 'seek_back'))
+                return
+            elif key_name == "f7":
+                self.update_queue.put(('hotkey', 'seek_forward'))
+                return
         except AttributeError:
             pass  # Teclas especiais podem não ter nome
             
@@ -692,14 +868,44 @@ class MouseRecorder:
                         self.start_playback()
                     elif data == 'stop':
                         self.stop_all()
+                    elif data == 'pause':
+                        self.toggle_pause()
+                    elif data == 'seek_back':
+                        self.seek_playback(-self.SEEK_STEP_SECONDS)
+                    elif data == 'seek_forward':
+                        self.seek_playback(self.SEEK_STEP_SECONDS)
                         
-                elif action_type == 'progress':
-                    current_rep, total_rep, progress = data
-                    self.update_progress(current_rep, total_rep, progress)
+                elif action_type == 'timing':
+                    lateness = data['lateness']
+                    self.log_message(f"⏱️ Repetição {data['repetition']}: desvio acumulado "
+                                     f"{data['drift'] * 1000:+.2f}ms | atraso p50 {lateness['p50'] * 1000:.2f}ms, "
+                                     f"p95 {lateness['p95'] * 1000:.2f}ms, p99 {lateness['p99'] * 1000:.2f}ms, "
+                                     f"máx {lateness['max'] * 1000:.2f}ms")
+                    if data.get('skipped'):
+                        self.log_message(f"⏩ {data['skipped']} movimentos atrasados pulados na repetição")
+                    if data['repetition'] == 1 and data.get('start_latency') is not None:
+                        self.log_message(f"🚀 Reprodução pronta {data['start_latency'] * 1000:.2f}ms "
+                                         f"após o fim da contagem")
+                    self.performance_monitor.record_playback_timing(data)
                     
                 elif action_type == 'complete':
                     self.on_playback_complete()
                     
+                elif action_type == 'playlist_item':
+                    self.on_playlist_item(*data)
+                    
+                elif action_type == 'playlist_error':
+                    index, item, error = data
+                    self.log_message(f"❌ Item {index + 1} da playlist ignorado ({os.path.basename(item['path'])}): {error}")
+                    
+                elif action_type == 'playlist_complete':
+                    self.on_playlist_complete()
+                    
+                elif action_type == 'library_synced':
+                    updated, removed = data
+                    if updated or removed:
+                        self.log_message(f"📚 Biblioteca atualizada: {updated} arquivos lidos, {removed} removidos")
+                    
         except queue.Empty:
             pass
         
@@ -728,7 +934,18 @@ class MouseRecorder:
             return
             
         try:
-            self.recording_session = RecordingSession()
+            streaming = self.settings.get("streaming_recording", True)
+            self.recording_session = RecordingSession(
+                queued_capture=self.settings.get("queued_capture", True),
+                journal_dir="recordings" if streaming else None,
+                segment_size=self.settings.get("max_events", 50000),
+                sync_events=self.settings.get("journal_sync_events", 500),
+                sync_interval=self.settings.get("journal_sync_interval_ms", 250) / 1000,
+                max_move_rate=RecordingSession.MOVE_RATE_BY_PRECISION.get(
+                    self.settings.get("capture_precision", "Alta"), 0),
+                min_move_distance=self.settings.get("min_movement_distance", 5),
+                backend=self.input_backend
+            )
             self.recording_session.start_recording(record_mouse, record_keyboard)
             self.is_recording = True
             
@@ -755,19 +972,34 @@ class MouseRecorder:
             return
             
         try:
-            self.recording_session.stop_recording()
+            # O nome do auto-save é escolhido antes de fechar o journal, que o registra
+            auto_save_path = self.new_auto_save_path() if self.settings.get("auto_save", True) else None
+            self.recording_session.stop_recording(saved_as=auto_save_path)
             self.is_recording = False
             
             # Salva dados da gravação
-            self.current_recording_data = self.recording_session.to_dict()
-            
-            self.log_message(f"⏹️ Gravação finalizada - {len(self.recording_session.events)} eventos capturados")
+            self.set_current_recording(self.recording_session.to_dict())
+            
+            self.log_message(f"⏹️ Gravação finalizada - {self.recording_session.get_event_count()} eventos capturados")
+            
+            capture_stats = self.recording_session.get_capture_stats()
+            if capture_stats["queued_capture"]:
+                self.log_message(
+                    f"⏱️ Captura: callback máx {capture_stats['max_callback_us']:.1f}µs, "
+                    f"fila máx {capture_stats['max_queue_depth']}, "
+                    f"{capture_stats['callbacks_over_budget']} acima de {capture_stats['callback_budget_us']:.0f}µs"
+                )
+            if capture_stats["moves_filtered"]:
+                self.log_message(f"🧹 {capture_stats['moves_filtered']} movimentos filtrados na captura")
             self.update_recording_info()
             self.update_ui_state()
             
             # Auto-save se habilitado
-            if self.settings.get("auto_save", True):
-                self.auto_save_recording()
+            if auto_save_path:
+                self.auto_save_recording(auto_save_path)
+                
+            # Eventos já estão em memória (e no auto-save); o journal não é mais necessário
+            self.recording_session.discard_journal()
                 
         except Exception as e:
             self.log_message(f"Erro ao parar gravação: {e}")
@@ -798,12 +1030,16 @@ class MouseRecorder:
             self.progress_var.set(0)
             self.timer_var.set("00:00")
                 
-            # Delay inicial configurável
+            # Delay inicial configurável: controladores, tabelas de teclas e programa
+            # são preparados durante a contagem, em segundo plano
             initial_delay = self.settings.get("initial_delay", 3.0)
             if initial_delay > 0:
                 self.log_message(f"⏱️ Aguardando {initial_delay} segundos antes de iniciar...")
                 self.status_var.set(f"Aguardando {initial_delay}s...")
-                self.root.after(int(initial_delay * 1000), self._start_playback_delayed)
+                start_at = time.perf_counter() + initial_delay
+                preparation = self._prepare_playback_session(events)
+                wake_ms = max(0, int(initial_delay * 1000) - self.COUNTDOWN_LEAD_MS)
+                self.root.after(wake_ms, lambda: self._start_playback_delayed(preparation, start_at))
             else:
                 self._start_playback_delayed()
                 
@@ -814,8 +1050,30 @@ class MouseRecorder:
             self.is_playing = False
             self.update_ui_state()
             
-    def _start_playback_delayed(self) -> None:
-        """Inicia reprodução após delay"""
+    def _prepare_playback_session(self, events: List[Dict[str, Any]]) -> Tuple[threading.Thread, Dict[str, Any]]:
+        """Cria a sessão (controladores, teclas resolvidas e programa compilado) em segundo plano"""
+        result: Dict[str, Any] = {"speed": self.speed_var.get(), "events": events}
+        
+        def work():
+            try:
+                result["session"] = PlaybackSession(events, result["speed"], backend=self.input_backend,
+                                                    **self.get_session_options())
+            except Exception as e:
+                result["error"] = e
+                
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        return thread, result
+        
+    def _start_playback_delayed(self, preparation: Optional[Tuple[threading.Thread, Dict[str, Any]]] = None,
+                                start_at: Optional[float] = None) -> None:
+        """
+        Inicia reprodução após delay
+        
+        Args:
+            preparation: Sessão preparada durante a contagem (None = cria agora)
+            start_at: Fim da contagem (perf_counter); a sessão começa exatamente nele
+        """
         # Verifica se ainda é válido iniciar (usuário pode ter cancelado)
         if self.is_recording or self.is_playing:
             self.log_message("⚠️ Reprodução cancelada - estado mudou durante delay")
@@ -825,19 +1083,54 @@ class MouseRecorder:
             events = self.current_recording_data["events"]
             speed = self.speed_var.get()
             repetitions = self.repetitions_var.get()
-            
-            self.playback_session = PlaybackSession(events, speed)
+            loop = self.final_action_var.get() == "Repetir infinitamente"
+            segments = self.get_selected_segments()
+            loop_gap = self.settings.get("loop_gap_ms", 500) / 1000 if loop else 0.0
+            
+            # Usa a sessão preparada se ainda corresponde à gravação e à velocidade
+            # atuais; se a compilação ainda não terminou, volta a conferir sem
+            # bloquear a interface
+            session = None
+            if preparation:
+                thread, result = preparation
+                if thread.is_alive():
+                    self.root.after(self.PREPARATION_POLL_MS,
+                                    lambda: self._start_playback_delayed(preparation, start_at))
+                    return
+                if "error" in result:
+                    raise result["error"]
+                if result["events"] is events and result["speed"] == speed:
+                    session = result["session"]
+            if session is None:
+                session = PlaybackSession(events, speed, backend=self.input_backend,
+                                          **self.get_session_options())
+                start_at = None
+            self.playback_session = session
             self.is_playing = True
             
-            self.log_message(f"▶️ Reprodução iniciada - {repetitions} repetições a {speed}x")
+            if session.skipped_events:
+                self.log_message(f"⚠️ {session.skipped_events} eventos inválidos ignorados na reprodução")
+            if segments:
+                self.log_message(f"🎬 Trechos: {', '.join(segment['name'] for segment in segments)}")
+            if loop:
+                self.log_message(f"▶️ Reprodução iniciada - loop infinito a {speed}x "
+                                 f"(intervalo de {loop_gap * 1000:.0f}ms)")
+            else:
+                self.log_message(f"▶️ Reprodução iniciada - {repetitions} repetições a {speed}x")
             self.update_ui_state()
             
-            # Inicia reprodução com callbacks
+            # Inicia reprodução com callbacks; o progresso é amostrado pela interface
             self.playback_session.play(
                 repetitions=repetitions,
-                callback_progress=lambda c, t, p: self.update_queue.put(('progress', (c, t, p))),
-                callback_complete=lambda: self.update_queue.put(('complete', None))
+                callback_complete=lambda: self.update_queue.put(('complete', None)),
+                callback_timing=lambda report: self.update_queue.put(('timing', report)),
+                loop=loop,
+                loop_gap=loop_gap,
+                segments=segments,
+                start_at=start_at
             )
+            self._last_progress = None
+            self.poll_playback_progress()
             
         except Exception as e:
             self.log_message(f"Erro durante reprodução: {e}")
@@ -846,6 +1139,102 @@ class MouseRecorder:
             self.timer_var.set("00:00")
             self.update_ui_state()
             
+    def get_session_options(self) -> Dict[str, Any]:
+        """Opções de PlaybackSession vindas das configurações (pular atrasados e suavização)"""
+        catch_up_threshold = None
+        if self.settings.get("catch_up_moves", False):
+            catch_up_threshold = self.settings.get("catch_up_threshold_ms", 50) / 1000
+        
+        smooth_rate = None
+        if self.settings.get("smooth_movements", False):
+            smooth_rate = self.settings.get("smooth_movement_rate", 120)
+            
+        return {"catch_up_threshold": catch_up_threshold, "smooth_rate": smooth_rate,
+                "reposition_actions": self.settings.get("reposition_actions", False)}
+        
+    def start_playlist(self, items: List[Dict[str, Any]]) -> None:
+        """Inicia a reprodução de uma playlist (após o delay inicial)"""
+        if self.is_recording:
+            messagebox.showwarning("Aviso", "Pare a gravação antes de reproduzir.")
+            return
+            
+        if self.is_playing:
+            messagebox.showwarning("Aviso", "Reprodução já está em andamento.")
+            return
+            
+        initial_delay = self.settings.get("initial_delay", 3.0)
+        if initial_delay > 0:
+            self.log_message(f"⏱️ Aguardando {initial_delay} segundos antes de iniciar a playlist...")
+            self.status_var.set(f"Aguardando {initial_delay}s...")
+            self.root.after(int(initial_delay * 1000), lambda: self._start_playlist_delayed(items))
+        else:
+            self._start_playlist_delayed(items)
+            
+    def _start_playlist_delayed(self, items: List[Dict[str, Any]]) -> None:
+        """Inicia a playlist após delay"""
+        if self.is_recording or self.is_playing:
+            self.log_message("⚠️ Playlist cancelada - estado mudou durante delay")
+            return
+            
+        try:
+            self.playlist_player = PlaylistPlayer(items, backend=self.input_backend,
+                                                  session_options=self.get_session_options())
+            self.playback_session = None
+            self.is_playing = True
+            self.log_message(f"📜 Playlist iniciada - {len(items)} itens")
+            self.update_ui_state()
+            
+            self.playlist_player.play(
+                callback_item=lambda index, item, session: self.update_queue.put(('playlist_item', (index, item, session))),
+                callback_complete=lambda: self.update_queue.put(('playlist_complete', None)),
+                callback_timing=lambda report: self.update_queue.put(('timing', report)),
+                callback_error=lambda index, item, error: self.update_queue.put(('playlist_error', (index, item, error)))
+            )
+            
+        except Exception as e:
+            self.log_message(f"Erro ao iniciar playlist: {e}")
+            self.is_playing = False
+            self.playlist_player = None
+            self.update_ui_state()
+            
+    def on_playlist_item(self, index: int, item: Dict[str, Any], session: PlaybackSession) -> None:
+        """Um novo item da playlist começou a tocar"""
+        if not self.is_playing:
+            return
+            
+        # O amostrador de progresso continua entre itens; só é iniciado no primeiro
+        start_polling = self.playback_session is None
+        self.playback_session = session
+        segment = f" - trecho '{item['segment']}'" if item.get("segment") else ""
+        self.log_message(f"▶️ Playlist {index + 1}/{len(self.playlist_player.items)}: "
+                         f"{os.path.basename(item['path'])} ({item['repetitions']}x a {item['speed']}x{segment})")
+        if session.skipped_events:
+            self.log_message(f"⚠️ {session.skipped_events} eventos inválidos ignorados neste item")
+        self._last_progress = None
+        if start_polling:
+            self.poll_playback_progress()
+        
+    def on_playlist_complete(self) -> None:
+        """Callback chamado quando a playlist termina"""
+        player = self.playlist_player
+        self.playlist_player = None
+        self.is_playing = False
+        self.performance_monitor.flush()
+        
+        if player and player.transition_gaps:
+            gaps = player.transition_gaps
+            self.log_message(f"⏱️ Transições entre itens: média {sum(gaps) / len(gaps) * 1000:.2f}ms, "
+                             f"máx {max(gaps) * 1000:.2f}ms | espera por pré-carregamento máx "
+                             f"{max(player.preload_waits[1:], default=0.0) * 1000:.2f}ms")
+        if player and player.stop_event.is_set():
+            self.log_message("⏹️ Playlist interrompida")
+        else:
+            self.log_message("✅ Playlist concluída")
+        self.progress_var.set(0)
+        self.timer_var.set("00:00")
+        self.status_var.set("Pronto")
+        self.update_ui_state()
+        
     def stop_all(self) -> None:
         """Para todas as operações (gravação e reprodução)"""
         stopped_something = False
@@ -862,6 +1251,8 @@ class MouseRecorder:
         # Para reprodução se estiver ativa
         if self.is_playing:
             try:
+                if self.playlist_player:
+                    self.playlist_player.stop()
                 if self.playback_session:
                     self.playback_session.stop()
                 self.is_playing = False
@@ -882,23 +1273,72 @@ class MouseRecorder:
         if not stopped_something:
             self.log_message("ℹ️ ESC pressionado - Nenhuma operação em andamento")
             
+    def toggle_pause(self) -> None:
+        """Pausa ou retoma a reprodução em andamento"""
+        if not self.is_playing or not self.playback_session:
+            return
+            
+        if self.playback_session.toggle_pause():
+            position = self.playback_session.get_position()
+            self.log_message(f"⏸️ Reprodução pausada em {position:.1f}s")
+            self.pause_btn.configure(text="▶️ Retomar")
+            self.status_var.set("Pausado")
+        else:
+            self.log_message("▶️ Reprodução retomada")
+            self.pause_btn.configure(text="⏸️ Pausar")
+            self.status_var.set("Reproduzindo...")
+            
+    def seek_playback(self, seconds: float) -> None:
+        """Avança ou volta a reprodução em andamento"""
+        if not self.is_playing or not self.playback_session:
+            return
+            
+        target = self.playback_session.get_position() + seconds
+        self.playback_session.seek_to_time(target)
+        self.log_message(f"{'⏩' if seconds > 0 else '⏪'} Salto para "
+                         f"{min(max(target, 0.0), self.playback_session.get_duration()):.1f}s")
+        
+    def on_progress_click(self, event) -> None:
+        """Salta para o ponto clicado na barra de progresso"""
+        if not self.is_playing or not self.playback_session:
+            return
+            
+        width = self.progress_bar.winfo_width()
+        if width <= 0:
+            return
+        percent = min(max(event.x / width * 100, 0.0), 100.0)
+        self.playback_session.seek_to_percent(percent)
+        self.progress_var.set(percent)
+        self.log_message(f"🎯 Salto para {percent:.0f}% da reprodução")
+        
+    def poll_playback_progress(self) -> None:
+        """Amostra o progresso da reprodução a uma taxa fixa, independente da taxa de eventos"""
+        if not self.is_playing or not self.playback_session:
+            return
+            
+        progress = self.playback_session.get_progress()
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self.update_progress(*progress)
+            
+        self.root.after(self.PROGRESS_FRAME_MS, self.poll_playback_progress)
+        
     def update_progress(self, current_rep: int, total_rep: int, progress: float) -> None:
-        """Atualiza barra de progresso e timer"""
-        overall_progress = ((current_rep - 1) + progress) / total_rep * 100
+        """Atualiza barra de progresso e timer (total_rep = 0 no modo loop)"""
+        state = "Pausado" if self.playback_session and self.playback_session.paused else "Reproduzindo"
+        if self.playback_session and self.playback_session.current_pass[4]:
+            state = f"{state} '{self.playback_session.current_pass[4]}'"
+        if total_rep:
+            overall_progress = ((current_rep - 1) + progress) / total_rep * 100
+            self.status_var.set(f"{state} - {current_rep}/{total_rep}")
+        else:
+            overall_progress = progress * 100
+            self.status_var.set(f"{state} - loop {current_rep}")
         self.progress_var.set(overall_progress)
-        self.status_var.set(f"Reproduzindo - {current_rep}/{total_rep}")
         
-        # Calcula tempo estimado restante
-        if hasattr(self, 'current_recording_data') and self.current_recording_data:
-            recording_duration = self.current_recording_data.get("duration", 0)
-            speed = self.speed_var.get()
-            adjusted_duration = recording_duration / speed
-            
-            # Tempo restante para repetição atual
-            current_remaining = adjusted_duration * (1 - progress)
-            # Tempo das repetições restantes
-            remaining_reps = total_rep - current_rep
-            remaining_time = current_remaining + (remaining_reps * adjusted_duration)
+        # Calcula tempo estimado restante (trechos e velocidade atual considerados)
+        if self.playback_session:
+            remaining_time = self.playback_session.get_remaining_time()
             
             minutes = int(remaining_time // 60)
             seconds = int(remaining_time % 60)
@@ -907,19 +1347,22 @@ class MouseRecorder:
     def on_playback_complete(self) -> None:
         """Callback chamado quando reprodução termina"""
         self.is_playing = False
+        self.performance_monitor.flush()
+        
+        # Parada pedida (ESC/hotkey) ou fim por conta própria (repetições esgotadas ou erro)
+        session = self.playback_session
+        stopped = session is not None and session.stop_event.is_set()
+        repetitions = session.current_repetition if session else 0
         
         # Executa ação final
         final_action = self.final_action_var.get()
         
         if final_action == "Repetir infinitamente":
-            # Verifica se ainda deve continuar (usuário pode ter parado)
-            if hasattr(self, 'playback_session') and self.playback_session and not self.playback_session.stop_event.is_set():
-                self.log_message("🔄 Reiniciando reprodução infinita...")
-                # Pequeno delay antes de reiniciar
-                self.root.after(500, self._restart_infinite_playback)
-                return
+            # O loop roda dentro da própria sessão e só termina com stop() ou por erro
+            if stopped:
+                self.log_message(f"⏹️ Reprodução infinita interrompida pelo usuário após {repetitions} repetições")
             else:
-                self.log_message("⏹️ Reprodução infinita interrompida pelo usuário")
+                self.log_message(f"⚠️ Reprodução infinita encerrada inesperadamente após {repetitions} repetições")
                 
         elif final_action == "Tocar som":
             if self.settings.get("sound_notification", True):
@@ -936,18 +1379,12 @@ class MouseRecorder:
             except:
                 self.log_message("❌ Erro ao minimizar janela")
                 
-        self.log_message("✅ Reprodução concluída")
+        if not stopped:
+            self.log_message("✅ Reprodução concluída")
         self.progress_var.set(0)
         self.timer_var.set("00:00")
         self.update_ui_state()
         
-    def _restart_infinite_playback(self) -> None:
-        """Reinicia reprodução infinita com verificação de estado"""
-        if not self.is_recording and not self.is_playing:
-            self.start_playback()
-        else:
-            self.log_message("⚠️ Não é possível reiniciar - operação em andamento")
-        
     def save_recording(self) -> None:
         """Salva gravação em arquivo"""
         if not self.current_recording_data:
@@ -956,14 +1393,16 @@ class MouseRecorder:
             
         try:
             filename = filedialog.asksaveasfilename(
-                defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                defaultextension=BINARY_EXTENSION,
+                filetypes=RECORDING_FILETYPES,
                 title="Salvar Gravação"
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(self.current_recording_data, f, indent=2, ensure_ascii=False)
+                # Binário por padrão; .json exporta no formato texto
+                write_recording(filename, self.current_recording_data, self.get_compression(),
+                                delta=self.settings.get("delta_encoding", False))
+                self.file_manager.register_recording(filename, self.current_recording_data)
                     
                 self.log_message(f"💾 Gravação salva: {os.path.basename(filename)}")
                 messagebox.showinfo("Sucesso", "Gravação salva com sucesso!")
@@ -972,102 +1411,185 @@ class MouseRecorder:
             self.log_message(f"Erro ao salvar: {e}")
             messagebox.showerror("Erro", f"Erro ao salvar gravação:\n{e}")
             
-    def auto_save_recording(self) -> None:
+    def get_compression(self) -> Optional[str]:
+        """Método de compressão dos arquivos salvos (None se a compressão estiver desativada)"""
+        return compression_from_settings(self.settings)
+        
+    def new_auto_save_path(self) -> str:
+        """Caminho de um novo arquivo de auto-save"""
+        return f"recordings/auto_save_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}{BINARY_EXTENSION}"
+        
+    def auto_save_recording(self, filename: Optional[str] = None) -> None:
         """Salva automaticamente a gravação"""
         try:
             if not os.path.exists("recordings"):
                 os.makedirs("recordings")
                 
-            filename = f"recordings/auto_save_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.current_recording_data, f, indent=2, ensure_ascii=False)
+            filename = filename or self.new_auto_save_path()
+            write_recording(filename, self.current_recording_data, self.get_compression(),
+                            delta=self.settings.get("delta_encoding", False))
+            self.file_manager.register_recording(filename, self.current_recording_data)
                 
             self.log_message(f"💾 Auto-save: {os.path.basename(filename)}")
             
         except Exception as e:
             self.log_message(f"Erro no auto-save: {e}")
             
+    def recover_unfinished_recordings(self) -> None:
+        """Reconstrói gravações a partir de journals não encerrados"""
+        for journal in RecordingJournal.find_unfinished("recordings"):
+            try:
+                data = journal.recover()
+                if data["total_events"] == 0:
+                    journal.discard()
+                    continue
+                    
+                filename = os.path.join("recordings", f"{data['name'].lower()}{BINARY_EXTENSION}")
+                write_recording(filename, data, self.get_compression(),
+                                delta=self.settings.get("delta_encoding", False))
+                self.file_manager.register_recording(filename, data)
+                journal.discard()
+                
+                # A gravação recuperada mais recente fica carregada
+                self.set_current_recording(data)
+                self.log_message(f"♻️ Gravação interrompida recuperada: {os.path.basename(filename)} "
+                                 f"({data['total_events']} eventos)")
+            except Exception as e:
+                self.log_message(f"Erro ao recuperar {os.path.basename(journal.path)}: {e}")
+                
+        if self.current_recording_data:
+            self.update_recording_info()
+            self.update_ui_state()
+            
     def load_recording(self) -> None:
         """Carrega gravação de arquivo"""
         try:
             filename = filedialog.askopenfilename(
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=RECORDING_FILETYPES,
                 title="Carregar Gravação"
             )
             
             if filename:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Valida estrutura do arquivo
-                if not self.validate_recording_data(data):
-                    messagebox.showerror("Erro", "Arquivo de gravação inválido.")
-                    return
-                    
-                self.current_recording_data = data
-                self.update_recording_info()
-                
-                # CORREÇÃO: Atualiza estado da interface após carregar
-                self.update_ui_state()
-                
-                self.log_message(f"📁 Gravação carregada: {os.path.basename(filename)}")
-                self.log_message(f"✅ Botão reproduzir habilitado - {len(data.get('events', []))} eventos disponíveis")
-                messagebox.showinfo("Sucesso", "Gravação carregada com sucesso!")
+                self.load_recording_path(filename)
                 
         except Exception as e:
             self.log_message(f"Erro ao carregar: {e}")
             messagebox.showerror("Erro", f"Erro ao carregar gravação:\n{e}")
             
+    def load_recording_path(self, filename: str) -> bool:
+        """Carrega e valida a gravação de um arquivo (também usada pela biblioteca)"""
+        # Binário (mapeado em memória, sem parsing) ou JSON, detectado pelo conteúdo
+        data = read_recording(filename)
+            
+        # Valida estrutura do arquivo
+        if not self.validate_recording_data(data):
+            if isinstance(data, dict) and isinstance(data.get("events"), RecordingView):
+                data["events"].close()
+            messagebox.showerror("Erro", "Arquivo de gravação inválido.")
+            return False
+            
+        self.set_current_recording(data)
+        self.update_recording_info()
+        
+        # CORREÇÃO: Atualiza estado da interface após carregar
+        self.update_ui_state()
+        
+        self.log_message(f"📁 Gravação carregada: {os.path.basename(filename)}")
+        self.log_message(f"✅ Botão reproduzir habilitado - {len(data.get('events', []))} eventos disponíveis")
+        messagebox.showinfo("Sucesso", "Gravação carregada com sucesso!")
+        return True
+            
+    def set_current_recording(self, data: Dict[str, Any]) -> None:
+        """
+        Troca a gravação atual, fechando o mmap da anterior: no Windows um arquivo
+        mapeado não pode ser regravado nem apagado (ex.: pela limpeza de arquivos)
+        """
+        previous = self.current_recording_data
+        self.current_recording_data = data
+        previous_events = previous.get("events") if previous else None
+        if isinstance(previous_events, RecordingView) and previous_events is not data.get("events"):
+            previous_events.close()
+            
     def validate_recording_data(self, data: Dict[str, Any]) -> bool:
         """Valida estrutura dos dados de gravação com logging detalhado"""
         try:
-            # Verifica se é um dicionário
-            if not isinstance(data, dict):
-                self.log_message("❌ Validação falhou: dados não são um dicionário")
-                return False
-            
-            # Verifica chaves obrigatórias
-            required_keys = ["events", "duration"]
-            missing_keys = [key for key in required_keys if key not in data]
-            if missing_keys:
-                self.log_message(f"❌ Validação falhou: chaves ausentes: {missing_keys}")
+            # Mesma validação usada pela playlist (todos os eventos, colunas do binário e trechos)
+            try:
+                validate_recording(data)
+            except ValueError as e:
+                self.log_message(f"❌ Validação falhou: {e}")
                 return False
                 
-            events = data["events"]
-            if not isinstance(events, list):
-                self.log_message("❌ Validação falhou: 'events' não é uma lista")
+            # Chave usada pela interface e pelos trechos
+            if "duration" not in data:
+                self.log_message("❌ Validação falhou: chaves ausentes: ['duration']")
                 return False
             
-            # Verifica se tem pelo menos um evento
+            events = data["events"]
             if len(events) == 0:
                 self.log_message("⚠️ Aviso: gravação vazia (sem eventos)")
                 return True  # Permite gravações vazias
-            
-            # Valida alguns eventos (máximo 10 para não demorar)
-            events_to_check = min(10, len(events))
-            for i, event in enumerate(events[:events_to_check]):
-                if not isinstance(event, dict):
-                    self.log_message(f"❌ Validação falhou: evento {i} não é um dicionário")
-                    return False
                     
-                if "type" not in event:
-                    self.log_message(f"❌ Validação falhou: evento {i} sem 'type'")
-                    return False
-                    
-                if "timestamp" not in event:
-                    self.log_message(f"❌ Validação falhou: evento {i} sem 'timestamp'")
-                    return False
-                    
-            self.log_message(f"✅ Validação passou: {len(events)} eventos, {events_to_check} verificados")
+            self.log_message(f"✅ Validação passou: {len(events)} eventos verificados")
             return True
             
         except Exception as e:
             self.log_message(f"❌ Erro durante validação: {e}")
             return False
             
+    def get_selected_segments(self) -> Optional[List[Dict[str, Any]]]:
+        """Trechos escolhidos no seletor (None = gravação inteira)"""
+        choice = self.segment_var.get()
+        segments = self.current_recording_data.get("segments", []) if self.current_recording_data else []
+        if choice == self.ALL_SEGMENTS:
+            return segments or None
+        selected = [segment for segment in segments if segment.get("name") == choice]
+        return selected or None
+        
+    def refresh_segment_choices(self) -> None:
+        """Atualiza as opções do seletor de trecho com os trechos da gravação"""
+        segments = self.current_recording_data.get("segments", []) if self.current_recording_data else []
+        choices = [self.WHOLE_RECORDING]
+        if segments:
+            choices.append(self.ALL_SEGMENTS)
+            choices.extend(segment.get("name", "") for segment in segments)
+        self.segment_combo.configure(values=choices)
+        if self.segment_var.get() not in choices:
+            self.segment_var.set(self.WHOLE_RECORDING)
+            
+    def add_segment(self) -> None:
+        """Marca um novo trecho (nome, início, fim e repetições) na gravação atual"""
+        if not self.current_recording_data:
+            messagebox.showwarning("Aviso", "Nenhuma gravação carregada.")
+            return
+            
+        duration = self.current_recording_data.get("duration", 0.0)
+        segments = self.current_recording_data.setdefault("segments", [])
+        name = simpledialog.askstring("Novo trecho", "Nome do trecho:", parent=self.root,
+                                      initialvalue=f"Trecho {len(segments) + 1}")
+        if not name:
+            return
+        start = simpledialog.askfloat("Novo trecho", f"Início (0 - {duration:.2f}s):", parent=self.root,
+                                      minvalue=0.0, maxvalue=duration, initialvalue=0.0)
+        if start is None:
+            return
+        end = simpledialog.askfloat("Novo trecho", f"Fim ({start:.2f} - {duration:.2f}s):", parent=self.root,
+                                    minvalue=start, maxvalue=duration, initialvalue=duration)
+        if end is None or end <= start:
+            return
+        repetitions = simpledialog.askinteger("Novo trecho", "Repetições do trecho:", parent=self.root,
+                                              minvalue=1, maxvalue=9999, initialvalue=1)
+        if repetitions is None:
+            return
+            
+        segments.append({"name": name, "start": start, "end": end, "repetitions": repetitions})
+        self.update_recording_info()
+        self.segment_var.set(name)
+        self.log_message(f"🎬 Trecho '{name}' marcado: {start:.2f}s - {end:.2f}s x{repetitions}")
+        
     def update_recording_info(self) -> None:
         """Atualiza informações da gravação na interface"""
+        self.refresh_segment_choices()
         if not self.current_recording_data:
             self.info_text.delete(1.0, tk.END)
             return
@@ -1081,22 +1603,26 @@ class MouseRecorder:
             created_at = datetime.datetime.fromisoformat(self.current_recording_data["created_at"])
             info.append(f"Criado em: {created_at.strftime('%d/%m/%Y %H:%M:%S')}")
             
+        segments = self.current_recording_data.get("segments", [])
+        if segments:
+            info.append("\nTrechos:")
+            for segment in segments:
+                info.append(f"  🎬 {segment.get('name', '')}: {segment.get('start', 0):.2f}s - "
+                            f"{segment.get('end', 0):.2f}s x{segment.get('repetitions', 1)}")
+            
         # Análise dos eventos
         events = self.current_recording_data.get("events", [])
         if events:
-            event_types = {}
+            event_types = count_event_types(events)
             mouse_events = 0
             keyboard_events = 0
             
-            for event in events:
-                event_type = event.get("type", "unknown")
-                event_types[event_type] = event_types.get(event_type, 0) + 1
-                
+            for event_type, count in event_types.items():
                 # Categorizar eventos
                 if event_type in ["move", "click", "scroll"]:
-                    mouse_events += 1
+                    mouse_events += count
                 elif event_type in ["key_press", "key_release"]:
-                    keyboard_events += 1
+                    keyboard_events += count
                 
             info.append(f"\nEstatísticas:")
             info.append(f"  • Eventos de mouse: {mouse_events}")
@@ -1119,7 +1645,7 @@ class MouseRecorder:
     def update_recording_timer(self) -> None:
         """Atualiza timer durante gravação"""
         if self.is_recording and self.recording_session:
-            duration = time.time() - self.recording_session.start_time
+            duration = self.recording_session.get_elapsed()
             minutes = int(duration // 60)
             seconds = int(duration % 60)
             self.timer_var.set(f"{minutes:02d}:{seconds:02d}")
@@ -1141,11 +1667,13 @@ class MouseRecorder:
             self.record_btn.configure(state=tk.DISABLED)
             self.play_btn.configure(state=tk.DISABLED)
             self.stop_btn.configure(state=tk.NORMAL)
+            self.pause_btn.configure(state=tk.NORMAL)
             self.status_var.set("Reproduzindo...")
         else:
             self.record_btn.configure(text="🔴 Gravar", style='Record.TButton', state=tk.NORMAL)
             self.play_btn.configure(state=tk.NORMAL if self.current_recording_data else tk.DISABLED)
             self.stop_btn.configure(state=tk.DISABLED)
+            self.pause_btn.configure(text="⏸️ Pausar", state=tk.DISABLED)
             self.status_var.set("Pronto")
             
         # Botões de arquivo
@@ -1162,6 +1690,31 @@ class MouseRecorder:
         self.log_text.see(tk.END)
         self.log_text.configure(state=tk.DISABLED)
         
+    def open_playlist(self) -> None:
+        """Abre a janela de playlist"""
+        try:
+            from playlist_window import PlaylistWindow
+            PlaylistWindow(parent=self.root, recorder=self)
+        except Exception as e:
+            self.log_message(f"Erro ao abrir playlist: {e}")
+            messagebox.showerror("Erro", f"Erro ao abrir playlist:\n{e}")
+        
+    def open_library(self) -> None:
+        """Abre a janela de busca na biblioteca de gravações"""
+        try:
+            from library_window import LibraryWindow
+            LibraryWindow(parent=self.root, recorder=self)
+        except Exception as e:
+            self.log_message(f"Erro ao abrir biblioteca: {e}")
+            messagebox.showerror("Erro", f"Erro ao abrir biblioteca:\n{e}")
+            
+    def _sync_library(self) -> None:
+        """Sincroniza o catálogo de gravações (executado em segundo plano)"""
+        try:
+            self.update_queue.put(('library_synced', self.file_manager.sync_library()))
+        except Exception as e:
+            print(f"Erro ao sincronizar biblioteca: {e}")
+        
     def open_settings(self) -> None:
         """Abre janela de configurações avançadas"""
         try:
@@ -1192,8 +1745,9 @@ class MouseRecorder:
                 except:
                     pass
                 
-            # Salva configurações
+            # Salva configurações e métricas pendentes
             self.settings.save_settings()
+            self.performance_monitor.flush()
             
             self.log_message("👋 Aplicação finalizada")
             
@@ -0,0 +1,449 @@
+"""
+Programa de Reprodução - Mouse Recorder
+Compila a lista de eventos em uma sequência compacta de instruções prontas para execução
+"""
+
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from event_buffer import (
+    NO_NAME, NS_PER_SECOND, EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE, EVENT_SCROLL, EVENT_KEY_PRESS,
+    EVENT_KEY_RELEASE
+)
+
+
+# Opcodes das instruções
+OP_MOVE = 0
+OP_BUTTON_PRESS = 1
+OP_BUTTON_RELEASE = 2
+OP_SCROLL = 3
+OP_KEY_PRESS = 4
+OP_KEY_RELEASE = 5
+
+# Instrução: (opcode, prazo relativo ao início da repetição em segundos, argumento, argumento)
+Instruction = Tuple[int, float, Any, Any]
+
+# Limites superiores (segundos) dos buckets do histograma de atraso: série 1-2-5 de 1µs a 10s
+LATENESS_BUCKETS = tuple(
+    mantissa * 10.0 ** exponent
+    for exponent in range(-6, 1)
+    for mantissa in (1, 2, 5)
+) + (10.0,)
+
+
+def compile_program(events: List[Dict[str, Any]], speed_multiplier: float,
+                    resolve_button: Callable[[str], Any],
+                    resolve_key: Callable[[str], Any]) -> Tuple[List[Instruction], int]:
+    """
+    Converte eventos em instruções com botões/teclas já resolvidos e prazos já escalados
+
+    Args:
+        events: Eventos no formato de dict da gravação
+        speed_multiplier: Multiplicador de velocidade aplicado aos timestamps
+        resolve_button: Converte o nome do botão no objeto do controlador
+        resolve_key: Converte o nome da tecla no objeto do controlador (None = ignorar)
+
+    Retorna o programa e a quantidade de eventos malformados ou de tipo desconhecido
+    pulados, sem interromper a compilação do restante
+    """
+    # Armazenamento colunar (EventBuffer, RecordingView): lê as colunas direto
+    if hasattr(events, "timestamps_ns"):
+        return compile_columns(events, speed_multiplier, resolve_button, resolve_key)
+
+    program: List[Instruction] = []
+    buttons: Dict[str, Any] = {}
+    keys: Dict[str, Any] = {}
+    skipped = 0
+
+    for event in events:
+        try:
+            event_type = event["type"]
+            deadline = event["timestamp"] / speed_multiplier
+
+            if event_type == "move":
+                program.append((OP_MOVE, deadline, (event["x"], event["y"]), None))
+
+            elif event_type == "click":
+                name = event["button"]
+                if name not in buttons:
+                    buttons[name] = resolve_button(name)
+                opcode = OP_BUTTON_PRESS if event["action"] == "press" else OP_BUTTON_RELEASE
+                program.append((opcode, deadline, (event["x"], event["y"]), buttons[name]))
+
+            elif event_type == "scroll":
+                program.append((OP_SCROLL, deadline, (event["x"], event["y"]), (event["dx"], event["dy"])))
+
+            elif event_type == "key_press" or event_type == "key_release":
+                name = event["key"]
+                if name not in keys:
+                    keys[name] = resolve_key(name)
+                if keys[name] is None:
+                    continue
+                opcode = OP_KEY_PRESS if event_type == "key_press" else OP_KEY_RELEASE
+                program.append((opcode, deadline, keys[name], None))
+
+            else:
+                skipped += 1
+
+        except (KeyError, TypeError, ValueError, AttributeError):
+            skipped += 1
+
+    return program, skipped
+
+
+def compile_columns(columns, speed_multiplier: float, resolve_button: Callable[[str], Any],
+                    resolve_key: Callable[[str], Any]) -> Tuple[List[Instruction], int]:
+    """
+    Equivalente a compile_program para eventos em colunas (EventBuffer ou RecordingView),
+    sem montar um dict por evento. Botões e teclas são resolvidos uma vez por nome
+    """
+    program: List[Instruction] = []
+    append = program.append
+    names = columns.names
+    buttons: Dict[int, Any] = {}
+    keys: Dict[int, Any] = {}
+    skipped = 0
+    scale = 1.0 / (NS_PER_SECOND * speed_multiplier)
+    types, xs, ys = columns.types, columns.xs, columns.ys
+    dxs, dys, name_ids, timestamps_ns = columns.dxs, columns.dys, columns.name_ids, columns.timestamps_ns
+
+    for index in range(len(columns)):
+        code = types[index]
+        deadline = timestamps_ns[index] * scale
+
+        if code == EVENT_MOVE:
+            append((OP_MOVE, deadline, (xs[index], ys[index]), None))
+
+        elif code == EVENT_CLICK_PRESS or code == EVENT_CLICK_RELEASE:
+            name_id = name_ids[index]
+            if name_id not in buttons:
+                try:
+                    buttons[name_id] = resolve_button(names[name_id] if name_id != NO_NAME else None)
+                except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+                    skipped += 1
+                    continue
+            opcode = OP_BUTTON_PRESS if code == EVENT_CLICK_PRESS else OP_BUTTON_RELEASE
+            append((opcode, deadline, (xs[index], ys[index]), buttons[name_id]))
+
+        elif code == EVENT_SCROLL:
+            append((OP_SCROLL, deadline, (xs[index], ys[index]), (dxs[index], dys[index])))
+
+        elif code == EVENT_KEY_PRESS or code == EVENT_KEY_RELEASE:
+            name_id = name_ids[index]
+            if name_id not in keys:
+                try:
+                    keys[name_id] = resolve_key(names[name_id]) if name_id != NO_NAME else None
+                except (IndexError, KeyError, TypeError, ValueError, AttributeError):
+                    skipped += 1
+                    continue
+            if keys[name_id] is None:
+                continue
+            opcode = OP_KEY_PRESS if code == EVENT_KEY_PRESS else OP_KEY_RELEASE
+            append((opcode, deadline, keys[name_id], None))
+
+        else:
+            skipped += 1
+
+    return program, skipped
+
+
+# Opcodes que posicionam o cursor (arg1 = (x, y))
+POSITIONED_OPCODES = (OP_MOVE, OP_BUTTON_PRESS, OP_BUTTON_RELEASE, OP_SCROLL)
+
+
+def interpolate_moves(program: List[Instruction], rate: float, max_gap: float = 0.25) -> List[Instruction]:
+    """
+    Gera um novo programa com movimentos intermediários interpolados entre posições
+    consecutivas do cursor, a rate posições por segundo
+    
+    Todo o trajeto é calculado de uma vez, antes da reprodução; o laço de execução
+    só vê instruções OP_MOVE comuns. Em intervalos maiores que max_gap o cursor fica
+    parado e desliza apenas nos últimos max_gap segundos antes da próxima posição.
+    Instruções sem posição (teclas) entre duas posições são intercaladas por prazo
+    """
+    if rate <= 0 or not program:
+        return list(program)
+
+    step = 1.0 / rate
+    smoothed: List[Instruction] = []
+    pending: List[Instruction] = []
+    last_time: Optional[float] = None
+    last_x = last_y = 0
+
+    for instruction in program:
+        opcode, deadline = instruction[0], instruction[1]
+        if opcode not in POSITIONED_OPCODES:
+            pending.append(instruction)
+            continue
+
+        x, y = instruction[2]
+        path: List[Instruction] = []
+        if last_time is not None and (x != last_x or y != last_y):
+            start = max(last_time, deadline - max_gap)
+            count = int((deadline - start) * rate)
+            if count > 1:
+                dx = (x - last_x) / count
+                dy = (y - last_y) / count
+                path = [
+                    (OP_MOVE, start + k * step, (last_x + round(k * dx), last_y + round(k * dy)), None)
+                    for k in range(1, count)
+                ]
+
+        if pending:
+            smoothed.extend(merge(pending, path, key=lambda item: item[1]) if path else pending)
+            pending = []
+        else:
+            smoothed.extend(path)
+        smoothed.append(instruction)
+        last_time, last_x, last_y = deadline, x, y
+
+    smoothed.extend(pending)
+    return smoothed
+
+
+def elide_redundant_positions(program: List[Instruction],
+                              keep_action_positions: bool = False) -> Tuple[List[Instruction], int]:
+    """
+    Remove reposicionamentos do cursor que não mudam nada, acompanhando a última
+    posição definida pelo programa
+
+    Movimentos para a posição atual são descartados; cliques e scroll no lugar onde
+    o cursor já está ficam com arg1 = None e o laço de execução não mexe no cursor.
+    Com keep_action_positions, cliques e scroll mantêm a posição explícita e corrigem
+    o cursor se o usuário ou o sistema o deslocou (só movimentos são eliminados).
+    Retorna o novo programa e a quantidade de atribuições de posição eliminadas
+    """
+    elided_program: List[Instruction] = []
+    elided = 0
+    last = None
+
+    for instruction in program:
+        opcode = instruction[0]
+        if opcode in POSITIONED_OPCODES:
+            position = instruction[2]
+            if position == last:
+                if opcode == OP_MOVE:
+                    elided += 1
+                    continue
+                if not keep_action_positions:
+                    elided += 1
+                    instruction = (opcode, instruction[1], None, instruction[3])
+            last = position
+        elided_program.append(instruction)
+
+    return elided_program, elided
+
+
+def next_action_indices(program: List[Instruction]) -> List[int]:
+    """
+    Para cada instrução, índice da próxima instrução que não é movimento
+    (clique, scroll ou tecla), ou len(program) se não houver. Usado para pular
+    movimentos atrasados sem nunca atravessar uma ação
+    """
+    indices = [0] * len(program)
+    next_action = len(program)
+    for index in range(len(program) - 1, -1, -1):
+        indices[index] = next_action
+        if program[index][0] != OP_MOVE:
+            next_action = index
+    return indices
+
+
+# Passada: (primeira instrução, fim exclusivo, início e duração na linha do tempo, nome do trecho)
+Pass = Tuple[int, int, float, float, Optional[str]]
+
+
+def build_passes(offsets: List[float], segments: Optional[List[Dict[str, Any]]],
+                 speed_multiplier: float, duration: float) -> List[Pass]:
+    """
+    Converte trechos da gravação em passadas sobre o programa compilado
+    
+    Args:
+        offsets: Prazos das instruções (já escalados por speed_multiplier)
+        segments: Trechos {"name", "start", "end", "repetitions"} em segundos da
+            gravação, executados em ordem (None ou vazio = gravação inteira)
+        speed_multiplier: Multiplicador usado na compilação
+        duration: Duração da gravação em segundos
+    """
+    if not segments:
+        return [(0, len(offsets), 0.0, duration / speed_multiplier, None)]
+
+    passes: List[Pass] = []
+    for segment in segments:
+        start = min(max(float(segment.get("start", 0.0)), 0.0), duration) / speed_multiplier
+        end = min(max(float(segment.get("end", duration)), 0.0), duration) / speed_multiplier
+        if end <= start:
+            continue
+        first = bisect_left(offsets, start)
+        stop = bisect_right(offsets, end)
+        repetitions = max(1, int(segment.get("repetitions", 1)))
+        passes.extend([(first, stop, start, end - start, segment.get("name"))] * repetitions)
+    return passes
+
+
+def validate_segments(segments: Any, duration: float) -> List[str]:
+    """Valida a lista de trechos de uma gravação e retorna os problemas encontrados"""
+    if not isinstance(segments, list):
+        return ["'segments' não é uma lista"]
+
+    problems = []
+    for index, segment in enumerate(segments):
+        if not isinstance(segment, dict):
+            problems.append(f"trecho {index} não é um dicionário")
+            continue
+        try:
+            start = float(segment.get("start", 0.0))
+            end = float(segment.get("end", duration))
+            repetitions = int(segment.get("repetitions", 1))
+        except (TypeError, ValueError):
+            problems.append(f"trecho {index} tem valores não numéricos")
+            continue
+        if end <= start:
+            problems.append(f"trecho {index} termina antes de começar")
+        if repetitions < 1:
+            problems.append(f"trecho {index} tem repetições inválidas")
+    return problems
+
+
+# Intervalo (em instruções) entre os instantâneos de botões/teclas pressionados
+# e da posição do cursor
+HELD_CHECKPOINT_INTERVAL = 256
+
+
+def _apply_held(held: set, opcode: int, arg1: Any, arg2: Any) -> None:
+    """Atualiza o conjunto de entradas pressionadas com uma instrução"""
+    if opcode == OP_BUTTON_PRESS:
+        held.add((OP_BUTTON_PRESS, arg2))
+    elif opcode == OP_BUTTON_RELEASE:
+        held.discard((OP_BUTTON_PRESS, arg2))
+    elif opcode == OP_KEY_PRESS:
+        held.add((OP_KEY_PRESS, arg1))
+    elif opcode == OP_KEY_RELEASE:
+        held.discard((OP_KEY_PRESS, arg1))
+
+
+def held_checkpoints(program: List[Instruction], interval: int = HELD_CHECKPOINT_INTERVAL) -> List[frozenset]:
+    """
+    Instantâneos das entradas pressionadas antes de cada bloco de interval instruções
+    Cada entrada é (OP_BUTTON_PRESS, botão) ou (OP_KEY_PRESS, tecla)
+    """
+    checkpoints: List[frozenset] = []
+    held: set = set()
+    for index, (opcode, _, arg1, arg2) in enumerate(program):
+        if index % interval == 0:
+            checkpoints.append(frozenset(held))
+        _apply_held(held, opcode, arg1, arg2)
+    return checkpoints
+
+
+def held_inputs_at(program: List[Instruction], checkpoints: List[frozenset], index: int,
+                   interval: int = HELD_CHECKPOINT_INTERVAL) -> set:
+    """Entradas pressionadas imediatamente antes da instrução index (no máximo interval passos)"""
+    if not checkpoints:
+        return set()
+    block = min(index // interval, len(checkpoints) - 1)
+    held = set(checkpoints[block])
+    for opcode, _, arg1, arg2 in program[block * interval:index]:
+        _apply_held(held, opcode, arg1, arg2)
+    return held
+
+
+def position_checkpoints(program: List[Instruction],
+                         interval: int = HELD_CHECKPOINT_INTERVAL) -> List[Optional[Tuple[int, int]]]:
+    """Instantâneos da posição do cursor antes de cada bloco de interval instruções (None = ainda não posicionado)"""
+    checkpoints: List[Optional[Tuple[int, int]]] = []
+    position = None
+    for index, (opcode, _, arg1, _) in enumerate(program):
+        if index % interval == 0:
+            checkpoints.append(position)
+        if opcode in POSITIONED_OPCODES and arg1 is not None:
+            position = arg1
+    return checkpoints
+
+
+def cursor_position_at(program: List[Instruction], checkpoints: List[Optional[Tuple[int, int]]], index: int,
+                       interval: int = HELD_CHECKPOINT_INTERVAL) -> Optional[Tuple[int, int]]:
+    """
+    Posição em que o programa deixa o cursor antes da instrução index (None se
+    nenhuma instrução anterior o posiciona), no máximo interval passos a partir
+    do instantâneo. Usada ao saltar ou retomar, quando a posição real do cursor
+    não é a que o programa espera
+    """
+    if not checkpoints:
+        return None
+    block = min(index // interval, len(checkpoints) - 1)
+    for position_index in range(min(index, len(program)) - 1, block * interval - 1, -1):
+        instruction = program[position_index]
+        if instruction[0] in POSITIONED_OPCODES and instruction[2] is not None:
+            return instruction[2]
+    return checkpoints[block]
+
+
+class LatenessHistogram:
+    """
+    Histograma de atraso da reprodução (instante executado - instante agendado)
+    Buckets fixos: registrar um evento é uma busca binária e um incremento,
+    sem alocar memória durante a reprodução
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENESS_BUCKETS):
+        self.bounds = bounds
+        # Último bucket acumula os atrasos acima do maior limite
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, lateness: float) -> None:
+        """Registra o atraso de um evento em segundos (adiantamentos contam como zero)"""
+        self.counts[bisect_left(self.bounds, lateness)] += 1
+        self.count += 1
+        if lateness > self.max:
+            self.max = lateness
+
+    def reset(self) -> None:
+        """Zera o histograma mantendo os buckets"""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.max = 0.0
+
+    def merge(self, other: "LatenessHistogram") -> None:
+        """Acumula as contagens de outro histograma com os mesmos buckets"""
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        if other.max > self.max:
+            self.max = other.max
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Retorna o limite superior do bucket que contém o percentil informado (0-1)
+        Resultado limitado ao atraso máximo observado
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, fraction * self.count)
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumo em segundos: p50, p95, p99, máximo e quantidade de eventos"""
+        return {
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "count": self.count
+        }
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Buckets não vazios como (limite superior em segundos, quantidade)"""
+        bounds = self.bounds + (float("inf"),)
+        return [(bounds[i], c) for i, c in enumerate(self.counts) if c]
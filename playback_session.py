@@ -0,0 +1,638 @@
+"""
+Sessão de Reprodução - Mouse Recorder
+Executa o programa compilado de uma gravação com timing preciso, repetições,
+trechos, pausa, busca e velocidade ajustável durante a reprodução
+"""
+
+import time
+import threading
+from collections import deque
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Tuple
+
+from event_buffer import EventBuffer
+from recording_format import RecordingView
+from input_backends import InputBackend, PynputBackend
+from playback_program import (
+    compile_program, interpolate_moves, elide_redundant_positions, cursor_position_at, next_action_indices,
+    build_passes, Pass, held_checkpoints, held_inputs_at, position_checkpoints, LatenessHistogram,
+    OP_MOVE, OP_BUTTON_PRESS, OP_BUTTON_RELEASE, OP_KEY_PRESS, OP_KEY_RELEASE
+)
+
+
+class PlaybackSession:
+    """
+    Gerencia a reprodução de gravações
+    Executa eventos de mouse e teclado com timing preciso e suporte a repetições
+    """
+    
+    # Margem final da espera feita em espera ativa (spin) em vez de sleep
+    SPIN_THRESHOLD = 0.001
+    
+    # Quantidade de desvios por repetição mantidos (limita a memória no modo loop)
+    MAX_DRIFT_HISTORY = 1000
+    
+    # Duração mínima de cada volta no modo loop (passada + intervalo), para que uma
+    # gravação de duração zero com intervalo zero não gire sem esperar
+    MIN_LOOP_PERIOD = 0.05
+    
+    # Janela (segundos) em que uma tecla pressionada pela reprodução é reconhecida
+    # como injetada quando chega ao listener de hotkeys globais
+    INJECTED_KEY_WINDOW = 0.25
+    
+    def __init__(self, events: List[Dict[str, Any]], speed_multiplier: float = 1.0,
+                 backend: Optional[InputBackend] = None, catch_up_threshold: Optional[float] = None,
+                 smooth_rate: Optional[float] = None, elide_positions: bool = True,
+                 reposition_actions: bool = False):
+        """
+        Args:
+            events: Eventos no formato de dict da gravação, ou colunas (RecordingView
+                de um arquivo binário, EventBuffer) compiladas sem montar dicts
+            speed_multiplier: Multiplicador de velocidade
+            backend: Backend de entrada (padrão: pynput)
+            catch_up_threshold: Atraso em segundos a partir do qual movimentos vencidos
+                são pulados até a próxima ação (None = executa todos os movimentos)
+            smooth_rate: Movimentos suaves - posições interpoladas por segundo entre
+                movimentos esparsos, pré-calculadas na compilação (None = desativado)
+            elide_positions: Descarta na compilação reposicionamentos para onde o
+                cursor já está (contados em elided_positions)
+            reposition_actions: Cliques e scroll sempre reposicionam o cursor,
+                corrigindo deslocamentos feitos pelo usuário ou pelo sistema
+        """
+        self.events = events
+        self.speed_multiplier = speed_multiplier
+        self.is_playing = False
+        self.backend = backend or PynputBackend()
+        self.mouse_controller = self.backend.create_mouse_controller()
+        self.keyboard_controller = self.backend.create_keyboard_controller()
+        self.current_repetition = 0
+        self.total_repetitions = 1
+        self.playback_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.repetition_drifts: deque = deque(maxlen=self.MAX_DRIFT_HISTORY)
+        self.loop = False
+        self.loop_gap = 0.0
+        
+        # Controle pela interface: pausa e saltos acordam o worker por wake_event
+        self.wake_event = threading.Event()
+        self._control_lock = threading.Lock()
+        self.paused = False
+        self._pending_seek: Optional[Tuple[Optional[int], float]] = None
+        self._pending_speed: Optional[float] = None
+        self._paused_position: Optional[float] = None
+        self.repetition_start = 0.0
+        self.started_at = 0.0  # perf_counter do início efetivo da reprodução
+        
+        # Início agendado (fim da contagem regressiva) e quanto o worker ficou pronto depois dele
+        self.start_at: Optional[float] = None
+        self.start_latency: Optional[float] = None
+        
+        # Velocidade atual: os prazos compilados (em speed_multiplier) são multiplicados
+        # por time_scale, alterado ao vivo sem recompilar o programa
+        self.current_speed = speed_multiplier
+        self.time_scale = 1.0
+        
+        # Botões/teclas pressionados pela reprodução e instantâneos para os saltos
+        self.held: set = set()
+        self._held_checkpoints: Optional[List[frozenset]] = None
+        self._position_checkpoints: Optional[List[Optional[Tuple[int, int]]]] = None
+        
+        # Atraso de cada evento em relação ao prazo: por repetição e na reprodução inteira
+        self.lateness = LatenessHistogram()
+        self.total_lateness = LatenessHistogram()
+        
+        # Último progresso publicado pelo worker (lido pela interface sob demanda)
+        self.events_done = 0
+        
+        # Eventos compilados uma única vez em instruções com Button/Key resolvidos;
+        # eventos malformados são pulados e contados em skipped_events
+        self.program, self.skipped_events = compile_program(events, speed_multiplier,
+                                                            self.backend.resolve_button,
+                                                            self.backend.resolve_key)
+        if smooth_rate:
+            self.program = interpolate_moves(self.program, smooth_rate)
+            
+        # Nomes das teclas pressionadas pelo programa e instante da última injeção de
+        # cada uma: o listener de hotkeys ignora as que a própria reprodução enviou
+        self._key_names = {
+            arg1: self.backend.key_name(arg1) for opcode, _, arg1, _ in self.program if opcode == OP_KEY_PRESS
+        }
+        self._injected_keys: Dict[str, float] = {}
+            
+        # Reposicionamentos para onde o cursor já está não viram chamadas ao sistema
+        self.elided_positions = 0
+        if elide_positions:
+            self.program, self.elided_positions = elide_redundant_positions(self.program, reposition_actions)
+        
+        # Política de recuperação de atraso: prazos e próxima ação de cada instrução
+        self.catch_up_threshold = catch_up_threshold
+        self.offsets = [instruction[1] for instruction in self.program]
+        self.next_action = next_action_indices(self.program)
+        self.skipped_moves = 0
+        self.repetition_skipped = 0
+        
+        # Passadas sobre o programa (gravação inteira ou trechos) e a passada em execução
+        self.passes: List[Pass] = build_passes(self.offsets, None, speed_multiplier, self.get_duration())
+        self.current_pass: Pass = self.passes[0]
+        
+    def play(self, repetitions: int = 1, callback_progress=None, callback_complete=None,
+             callback_timing=None, progress_interval: float = 0.05, loop: bool = False,
+             loop_gap: float = 0.0, segments: Optional[List[Dict[str, Any]]] = None,
+             start_at: Optional[float] = None) -> None:
+        """
+        Inicia a reprodução dos eventos
+        
+        Args:
+            repetitions: Número de repetições
+            callback_progress: Função chamada para atualizar progresso (no máximo a cada progress_interval)
+            callback_complete: Função chamada ao completar
+            callback_timing: Função chamada ao fim de cada repetição com o relatório de timing
+                (desvio acumulado e percentis p50/p95/p99/máximo do atraso por evento)
+            progress_interval: Intervalo mínimo em segundos entre chamadas de callback_progress
+            loop: Repete indefinidamente até stop() (repetitions é ignorado, total_repetitions = 0)
+            loop_gap: Intervalo em segundos entre o fim de uma repetição e o início da próxima
+                (cada volta dura ao menos MIN_LOOP_PERIOD)
+            segments: Trechos {"name", "start", "end", "repetitions"} (segundos da gravação)
+                tocados em ordem, cada um repetido o seu número de vezes; repetitions
+                repete a sequência inteira (None = gravação inteira)
+            start_at: Instante perf_counter em que a linha do tempo começa (ex.: fim da
+                contagem regressiva); o worker aguarda com precisão até ele (None = imediato)
+        """
+        passes = build_passes(self.offsets, segments, self.speed_multiplier, self.get_duration())
+        if not passes:
+            raise ValueError("Nenhum trecho válido para reproduzir")
+        if loop and all(stop <= first for first, stop, _, _, _ in passes):
+            raise ValueError("Modo loop exige ao menos um evento nos trechos reproduzidos")
+        self.passes = passes
+        self.current_pass = passes[0]
+        
+        # Toda reprodução começa na velocidade compilada; set_speed só vale até o fim dela
+        self.current_speed = self.speed_multiplier
+        self.time_scale = 1.0
+        
+        # Cada passada conta como uma repetição no progresso
+        self.loop = loop
+        self.loop_gap = loop_gap
+        self.total_repetitions = 0 if loop else repetitions * len(passes)
+        self.current_repetition = 0
+        self.events_done = 0
+        self.progress_interval = progress_interval
+        self.is_playing = True
+        self.stop_event.clear()
+        self.wake_event.clear()
+        self.paused = False
+        self._pending_seek = None
+        self._pending_speed = None
+        self._paused_position = None
+        self.held = set()
+        self.repetition_drifts.clear()
+        self.lateness.reset()
+        self.total_lateness.reset()
+        self.skipped_moves = 0
+        self.repetition_skipped = 0
+        self.start_at = start_at
+        self.start_latency = None
+        
+        self.playback_thread = threading.Thread(
+            target=self._playback_worker,
+            args=(callback_progress, callback_complete, callback_timing),
+            daemon=True
+        )
+        self.playback_thread.start()
+        
+    def stop(self) -> None:
+        """Para a reprodução"""
+        self.is_playing = False
+        self.stop_event.set()
+        self.wake_event.set()
+        
+    def pause(self) -> None:
+        """Pausa a reprodução na posição atual (botões e teclas pressionados são soltos)"""
+        with self._control_lock:
+            self.paused = True
+            self.wake_event.set()
+            
+    def resume(self) -> None:
+        """Retoma a reprodução de onde foi pausada"""
+        with self._control_lock:
+            self.paused = False
+            self.wake_event.set()
+            
+    def toggle_pause(self) -> bool:
+        """Alterna entre pausado e reproduzindo; retorna True se ficou pausado"""
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+        return self.paused
+        
+    def set_speed(self, speed: float) -> None:
+        """
+        Altera a velocidade da reprodução em andamento sem reiniciar
+        A linha do tempo é reancorada no evento atual, mantendo a posição
+        """
+        if speed <= 0:
+            return
+        with self._control_lock:
+            self.current_speed = speed
+            if self.is_playing:
+                self._pending_speed = speed
+                self.wake_event.set()
+            else:
+                self.time_scale = self.speed_multiplier / speed
+                
+    def get_duration(self) -> float:
+        """Duração de uma repetição no tempo da gravação (segundos)"""
+        if not self.events:
+            return 0.0
+        try:
+            return float(self.events[-1]["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            # Último evento malformado (pulado na compilação): usa a última instrução
+            return self.offsets[-1] * self.speed_multiplier if self.offsets else 0.0
+        
+    def get_position(self) -> float:
+        """Posição atual na gravação (segundos, no tempo da gravação), dentro da passada atual"""
+        _, _, base, length, _ = self.current_pass
+        if self._paused_position is not None:
+            position = self._paused_position
+        else:
+            position = base + (time.perf_counter() - self.repetition_start) / self.time_scale
+        return min(max(position, base), base + length) * self.speed_multiplier
+        
+    def seek_to_time(self, seconds: float, repetition: Optional[int] = None) -> None:
+        """
+        Salta para um instante da gravação (segundos, no tempo da gravação)
+        
+        Args:
+            seconds: Instante da gravação (limitado ao trecho da passada de destino)
+            repetition: Repetição (passada) de destino (1..total); None = atual
+        """
+        if not self.is_playing:
+            return
+        position = seconds / self.speed_multiplier
+        target_rep = None
+        if repetition is not None:
+            target_rep = max(0, repetition - 1)
+            if self.total_repetitions:
+                target_rep = min(target_rep, self.total_repetitions - 1)
+        with self._control_lock:
+            self._pending_seek = (target_rep, position)
+            self.wake_event.set()
+            
+    def seek_to_percent(self, percent: float) -> None:
+        """
+        Salta para uma porcentagem do progresso total (0-100), como na barra de progresso
+        No modo loop a porcentagem se refere à repetição atual
+        """
+        fraction = min(max(percent / 100.0, 0.0), 1.0)
+        if self.total_repetitions:
+            overall = fraction * self.total_repetitions
+            repetition = min(int(overall), self.total_repetitions - 1)
+            fraction = overall - repetition
+            _, _, base, length, _ = self.passes[repetition % len(self.passes)]
+            self.seek_to_time((base + fraction * length) * self.speed_multiplier, repetition + 1)
+        else:
+            _, _, base, length, _ = self.current_pass
+            self.seek_to_time((base + fraction * length) * self.speed_multiplier)
+            
+    def seek_relative(self, seconds: float) -> None:
+        """Avança (ou volta, se negativo) seconds dentro da repetição atual"""
+        self.seek_to_time(self.get_position() + seconds)
+        
+    def get_progress(self) -> Tuple[int, int, float]:
+        """
+        Retorna (repetição atual, total de repetições, fração da repetição atual)
+        No modo loop o total de repetições é 0
+        """
+        first, stop, _, _, _ = self.current_pass
+        total_events = stop - first
+        progress = (self.events_done - first) / total_events if total_events > 0 else 1.0
+        return self.current_repetition, self.total_repetitions, min(max(progress, 0.0), 1.0)
+        
+    def get_remaining_time(self) -> float:
+        """Tempo real restante estimado (segundos) na velocidade atual; no modo loop, da repetição atual"""
+        _, _, _, length, _ = self.current_pass
+        _, _, progress = self.get_progress()
+        remaining = length * (1.0 - progress)
+        if self.total_repetitions:
+            count = len(self.passes)
+            full_cycles, partial = divmod(max(0, self.total_repetitions - self.current_repetition), count)
+            remaining += full_cycles * sum(item[3] for item in self.passes)
+            remaining += sum(self.passes[(self.current_repetition + k) % count][3] for k in range(partial))
+        return remaining * self.time_scale
+        
+    def _held_at(self, index: int) -> set:
+        """Botões/teclas que a gravação mantém pressionados antes da instrução index"""
+        if index == 0:
+            return set()
+        if self._held_checkpoints is None:
+            self._held_checkpoints = held_checkpoints(self.program)
+        return held_inputs_at(self.program, self._held_checkpoints, index)
+        
+    def _restore_held(self, target: set) -> None:
+        """Solta as entradas que sobram e pressiona as que faltam para chegar em target"""
+        self._set_inputs(self.held - target, False)
+        self._set_inputs(target - self.held, True)
+        self.held = target
+        
+    def _restore_position(self, index: int) -> None:
+        """Leva o cursor para onde o programa o deixa antes da instrução index"""
+        if self._position_checkpoints is None:
+            self._position_checkpoints = position_checkpoints(self.program)
+        position = cursor_position_at(self.program, self._position_checkpoints, index)
+        if position is not None:
+            try:
+                self.mouse_controller.position = position
+            except Exception as e:
+                print(f"Erro ao restaurar posição do cursor: {e}")
+                
+    def _wait_until(self, deadline: float) -> Optional[float]:
+        """
+        Aguarda até o instante absoluto deadline (relógio perf_counter)
+        Dorme até SPIN_THRESHOLD antes do prazo e faz espera ativa no restante.
+        Retorna o instante em que a espera terminou, ou None se a espera foi
+        interrompida (stop, pausa ou salto)
+        """
+        now = time.perf_counter()
+        remaining = deadline - now
+        if remaining > self.SPIN_THRESHOLD:
+            if self.wake_event.wait(remaining - self.SPIN_THRESHOLD):
+                return None
+            now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        return now
+        
+    def _mark_injected(self, key) -> None:
+        """Registra que a reprodução vai pressionar key (antes de enviá-la ao sistema)"""
+        name = self._key_names.get(key)
+        if name is not None:
+            self._injected_keys[name] = time.perf_counter()
+            
+    def is_injected_key(self, key_name: str) -> bool:
+        """
+        Indica se uma tecla vista pelo listener de hotkeys foi pressionada pela própria
+        reprodução há menos de INJECTED_KEY_WINDOW segundos (a marca é consumida)
+        """
+        injected_at = self._injected_keys.pop(key_name, None)
+        return injected_at is not None and time.perf_counter() - injected_at < self.INJECTED_KEY_WINDOW
+        
+    def _set_inputs(self, inputs, pressed: bool) -> None:
+        """Pressiona ou solta um conjunto de entradas (OP_BUTTON_PRESS/OP_KEY_PRESS, objeto)"""
+        for kind, value in inputs:
+            try:
+                if kind == OP_BUTTON_PRESS:
+                    if pressed:
+                        self.mouse_controller.press(value)
+                    else:
+                        self.mouse_controller.release(value)
+                elif pressed:
+                    self._mark_injected(value)
+                    self.keyboard_controller.press(value)
+                else:
+                    self.keyboard_controller.release(value)
+            except Exception as e:
+                print(f"Erro ao restaurar entrada {value}: {e}")
+                
+    def _handle_control(self, rep: int, index: int, repetition_start: float) -> Tuple[int, int, float]:
+        """
+        Atende pausa e saltos pedidos pela interface (executado na thread do worker)
+        Retorna a repetição, o índice da próxima instrução e o novo início da repetição
+        """
+        # Posição na linha do tempo compilada; o evento index ainda não foi executado
+        first, stop, base, length, _ = self.current_pass
+        position = base + (time.perf_counter() - repetition_start) / self.time_scale
+        if index < stop:
+            position = min(position, self.offsets[index])
+            
+        released = False
+        while True:
+            with self._control_lock:
+                self.wake_event.clear()
+                seek = self._pending_seek
+                self._pending_seek = None
+                speed = self._pending_speed
+                self._pending_speed = None
+                paused = self.paused
+                
+            if self.stop_event.is_set():
+                break
+                
+            if speed is not None:
+                self.time_scale = self.speed_multiplier / speed
+                
+            if seek is not None:
+                target_rep, position = seek
+                if target_rep is not None:
+                    rep = target_rep
+                    self.current_pass = self.passes[rep % len(self.passes)]
+                    first, stop, base, length, _ = self.current_pass
+                position = min(max(position, base), base + length)
+                index = bisect_left(self.offsets, position, first, stop)
+                
+                # Botões/teclas pressionados no destino: solta os que sobram, pressiona os que
+                # faltam, com o cursor já onde o programa o deixa nesse ponto
+                target_held = self._held_at(index)
+                if released:
+                    self.held = target_held
+                else:
+                    self._restore_position(index)
+                    self._restore_held(target_held)
+                self.current_repetition = rep + 1
+                self.events_done = index
+                
+            if not paused:
+                break
+                
+            if not released:
+                self._set_inputs(self.held, False)
+                released = True
+            self._paused_position = position
+            self.wake_event.wait()
+            
+        # Durante a pausa o cursor pode ter sido movido: volta a ele antes de
+        # pressionar de novo os botões
+        if released and not self.stop_event.is_set():
+            self._restore_position(index)
+            self._set_inputs(self.held, True)
+        self._paused_position = None
+        
+        # Reancora a linha do tempo: a posição atual corresponde a agora
+        repetition_start = time.perf_counter() - (position - base) * self.time_scale
+        self.repetition_start = repetition_start
+        return rep, index, repetition_start
+        
+    def get_timing_report(self) -> Dict[str, Any]:
+        """Relatório de timing da repetição atual: desvio acumulado e atraso por evento (segundos)"""
+        return {
+            "repetition": self.current_repetition,
+            "segment": self.current_pass[4],
+            "drift": self.repetition_drifts[-1] if self.repetition_drifts else 0.0,
+            "lateness": self.lateness.summary(),
+            "buckets": self.lateness.buckets(),
+            "skipped": self.repetition_skipped,
+            "start_latency": self.start_latency
+        }
+        
+    def _playback_worker(self, callback_progress=None, callback_complete=None, callback_timing=None) -> None:
+        """Worker thread para reprodução dos eventos"""
+        try:
+            program = self.program
+            passes = self.passes
+            mouse_controller = self.mouse_controller
+            keyboard_controller = self.keyboard_controller
+            wait_until = self._wait_until
+            wake_is_set = self.wake_event.is_set
+            held = self.held
+            record_lateness = self.lateness.record
+            offsets = self.offsets
+            next_action = self.next_action
+            mark_injected = self._mark_injected
+            catch_up = self.catch_up_threshold if self.catch_up_threshold is not None else float("inf")
+            
+            # Prazos absolutos: cada evento é agendado a partir do início da
+            # passada, então atrasos de execução não se acumulam, nem entre
+            # passadas (cada uma ocupa length * scale + loop_gap na linha do tempo).
+            # Pausas, saltos e mudanças de velocidade apenas reancoram repetition_start.
+            # A passada executa as instruções [first, stop) direto do programa compilado
+            scale = self.time_scale
+            repetition_start = time.perf_counter()
+            
+            # Início agendado: tudo já foi preparado durante a contagem, resta só
+            # esperar o instante exato (a mesma espera sleep + spin dos eventos).
+            # Se o worker só ficou pronto depois do prazo, começa agora e o atraso
+            # fica registrado em start_latency
+            if self.start_at is not None:
+                ready = wait_until(self.start_at) if self.start_at > repetition_start else None
+                if ready is not None:
+                    repetition_start = self.start_at
+                else:
+                    ready = repetition_start = time.perf_counter()
+                self.start_latency = max(ready, self.start_at) - self.start_at
+            self.started_at = repetition_start
+            
+            rep = 0
+            while self.loop or rep < self.total_repetitions:
+                if self.stop_event.is_set():
+                    break
+                    
+                self.current_pass = passes[rep % len(passes)]
+                first, stop, base, length, _ = self.current_pass
+                self.current_repetition = rep + 1
+                self.events_done = first
+                self.repetition_skipped = 0
+                self.lateness.reset()
+                self.repetition_start = repetition_start
+                
+                # Trechos podem começar com botões/teclas já pressionados e com o
+                # cursor fora do lugar (cliques no trecho podem não reposicioná-lo)
+                if first:
+                    self._restore_position(first)
+                if first or self.held:
+                    self._restore_held(self._held_at(first))
+                    held = self.held
+                
+                if callback_progress:
+                    callback_progress(self.current_repetition, self.total_repetitions, 0)
+                next_progress = time.perf_counter() + self.progress_interval
+                
+                # Prazo da instrução i = anchor + offsets[i] * scale
+                anchor = repetition_start - base * scale
+                i = first
+                while i < stop:
+                    # Pausa, salto ou parada pedidos pela interface
+                    if wake_is_set():
+                        if self.stop_event.is_set():
+                            break
+                        rep, i, repetition_start = self._handle_control(rep, i, repetition_start)
+                        first, stop, base, length, _ = self.current_pass
+                        held = self.held
+                        scale = self.time_scale
+                        anchor = repetition_start - base * scale
+                        continue
+                        
+                    opcode, offset, arg1, arg2 = program[i]
+                    deadline = anchor + offset * scale
+                    now = wait_until(deadline)
+                    if now is None:
+                        continue
+                    lateness = now - deadline
+                    
+                    # Atrasado demais: pula para o último movimento já vencido antes
+                    # da próxima ação (cliques, scroll e teclas nunca são pulados).
+                    # O atraso registrado é o do movimento executado após o salto
+                    if opcode == OP_MOVE and lateness > catch_up:
+                        last = bisect_right(offsets, (now - anchor) / scale, i, min(next_action[i], stop)) - 1
+                        if last > i:
+                            self.repetition_skipped += last - i
+                            self.skipped_moves += last - i
+                            i = last
+                            opcode, offset, arg1, arg2 = program[i]
+                            lateness = now - (anchor + offset * scale)
+                    record_lateness(lateness)
+                        
+                    try:
+                        if opcode == OP_MOVE:
+                            mouse_controller.position = arg1
+                        elif opcode == OP_KEY_PRESS:
+                            mark_injected(arg1)
+                            keyboard_controller.press(arg1)
+                            held.add((OP_KEY_PRESS, arg1))
+                        elif opcode == OP_KEY_RELEASE:
+                            keyboard_controller.release(arg1)
+                            held.discard((OP_KEY_PRESS, arg1))
+                        elif opcode == OP_BUTTON_PRESS:
+                            if arg1 is not None:
+                                mouse_controller.position = arg1
+                            mouse_controller.press(arg2)
+                            held.add((OP_BUTTON_PRESS, arg2))
+                        elif opcode == OP_BUTTON_RELEASE:
+                            if arg1 is not None:
+                                mouse_controller.position = arg1
+                            mouse_controller.release(arg2)
+                            held.discard((OP_BUTTON_PRESS, arg2))
+                        else:
+                            if arg1 is not None:
+                                mouse_controller.position = arg1
+                            mouse_controller.scroll(*arg2)
+                    except Exception as e:
+                        print(f"Erro ao executar evento: {e}")
+                    
+                    # Publica progresso: slot sempre atualizado, callback com taxa limitada
+                    i += 1
+                    self.events_done = i
+                    if callback_progress:
+                        now = time.perf_counter()
+                        if now >= next_progress or i == stop:
+                            next_progress = now + self.progress_interval
+                            callback_progress(*self.get_progress())
+                        
+                self.total_lateness.merge(self.lateness)
+                if self.stop_event.is_set():
+                    break
+                    
+                # Desvio acumulado: quanto a última instrução da passada ficou atrás do agendado
+                if stop > first:
+                    drift = time.perf_counter() - (anchor + offsets[stop - 1] * scale)
+                else:
+                    drift = time.perf_counter() - (repetition_start + length * scale)
+                self.repetition_drifts.append(drift)
+                if callback_timing:
+                    callback_timing(self.get_timing_report())
+                    
+                rep += 1
+                period = length * scale + self.loop_gap
+                if self.loop:
+                    period = max(period, self.MIN_LOOP_PERIOD)
+                repetition_start += period
+                        
+        except Exception as e:
+            print(f"Erro durante reprodução: {e}")
+        finally:
+            # Nunca deixa botões ou teclas presos ao terminar ou ser interrompida
+            self._set_inputs(self.held, False)
+            self.held = set()
+            self.is_playing = False
+            if callback_complete:
+                callback_complete()
@@ -0,0 +1,222 @@
+"""
+Playlist - Mouse Recorder
+Reproduz uma sequência de gravações, preparando a próxima em segundo plano
+"""
+
+import json
+import os
+import time
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from input_backends import InputBackend
+from recording_format import read_recording, validate_recording, RecordingView
+from playback_session import PlaybackSession
+
+
+PLAYLIST_VERSION = 1
+PLAYLIST_EXTENSION = ".playlist.json"
+
+def make_playlist_item(path: str, speed: float = 1.0, repetitions: int = 1,
+                       segment: Optional[str] = None) -> Dict[str, Any]:
+    """Cria um item de playlist (gravação, velocidade, repetições e trecho opcional)"""
+    return {"path": path, "speed": speed, "repetitions": repetitions, "segment": segment}
+
+
+def save_playlist(path: str, items: List[Dict[str, Any]]) -> None:
+    """Salva a playlist em JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"playlist": PLAYLIST_VERSION, "items": items}, f, indent=2, ensure_ascii=False)
+
+
+def load_playlist(path: str) -> List[Dict[str, Any]]:
+    """Carrega uma playlist salva com save_playlist"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("items"), list):
+        raise ValueError("Arquivo de playlist inválido")
+    return [
+        make_playlist_item(item["path"], item.get("speed", 1.0), item.get("repetitions", 1), item.get("segment"))
+        for item in data["items"]
+    ]
+
+
+def load_recording_file(path: str) -> Dict[str, Any]:
+    """
+    Carrega e valida por completo um arquivo de gravação (binário ou JSON)
+    Lança ValueError descrevendo o primeiro problema encontrado
+    """
+    data = read_recording(path)
+    try:
+        validate_recording(data)
+    except ValueError:
+        if isinstance(data, dict) and isinstance(data.get("events"), RecordingView):
+            data["events"].close()
+        raise
+    return data
+
+
+class PlaylistPlayer:
+    """
+    Reproduz os itens de uma playlist em sequência
+    Enquanto um item toca, o próximo é carregado, validado e compilado em uma
+    thread de segundo plano, então a troca de item não espera por disco ou parsing
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], backend: Optional[InputBackend] = None,
+                 session_options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            items: Itens criados com make_playlist_item
+            backend: Backend de entrada compartilhado pelas sessões
+            session_options: Argumentos extras de PlaybackSession (catch_up_threshold, smooth_rate)
+        """
+        self.items = items
+        self.backend = backend
+        self.session_options = session_options or {}
+        self.is_playing = False
+        self.current_index = -1
+        self.current_session = None
+        self.stop_event = threading.Event()
+        self.player_thread: Optional[threading.Thread] = None
+
+        # Tempo entre o fim de um item e o início do próximo, e espera pelo pré-carregamento
+        self.transition_gaps: List[float] = []
+        self.preload_waits: List[float] = []
+
+    def play(self, callback_item=None, callback_complete=None, callback_timing=None, callback_error=None) -> None:
+        """
+        Inicia a playlist
+
+        Args:
+            callback_item: Chamada com (índice, item, sessão) quando um item começa
+            callback_complete: Chamada ao terminar a playlist (ou ao ser interrompida)
+            callback_timing: Repassada às sessões (relatório de timing por repetição)
+            callback_error: Chamada com (índice, item, erro) para itens que não puderam ser carregados
+        """
+        self.is_playing = True
+        self.stop_event.clear()
+        self.transition_gaps = []
+        self.preload_waits = []
+
+        self.player_thread = threading.Thread(
+            target=self._player_worker,
+            args=(callback_item, callback_complete, callback_timing, callback_error),
+            daemon=True
+        )
+        self.player_thread.start()
+
+    def stop(self) -> None:
+        """Para a playlist e a gravação em reprodução"""
+        self.is_playing = False
+        self.stop_event.set()
+        session = self.current_session
+        if session:
+            session.stop()
+
+    def get_progress(self) -> Tuple[int, int]:
+        """Retorna (item atual, total de itens), começando em 1"""
+        return self.current_index + 1, len(self.items)
+
+    def _prepare(self, item: Dict[str, Any]):
+        """Carrega, valida e compila um item (executado na thread de pré-carregamento)"""
+        data = load_recording_file(item["path"])
+        segments = None
+        if item.get("segment"):
+            segments = [s for s in data.get("segments", []) if s.get("name") == item["segment"]]
+            if not segments:
+                raise ValueError(f"trecho '{item['segment']}' não encontrado")
+
+        session = PlaybackSession(data["events"], item.get("speed", 1.0), backend=self.backend,
+                                  **self.session_options)
+        return session, segments
+
+    @staticmethod
+    def _release(session: PlaybackSession) -> None:
+        """Fecha o mmap da gravação de um item que terminou (ou que não vai mais tocar)"""
+        if isinstance(session.events, RecordingView):
+            session.events.close()
+
+    def _start_preload(self, index: int) -> Tuple[threading.Thread, Dict[str, Any]]:
+        """Prepara o item index em segundo plano; o resultado fica no dict retornado"""
+        result: Dict[str, Any] = {}
+
+        def work():
+            try:
+                result["prepared"] = self._prepare(self.items[index])
+            except Exception as e:
+                result["error"] = e
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        return thread, result
+
+    def _player_worker(self, callback_item=None, callback_complete=None, callback_timing=None,
+                       callback_error=None) -> None:
+        """Worker thread que encadeia os itens da playlist"""
+        preload = None
+        try:
+            preload = self._start_preload(0) if self.items else None
+            previous_end: Optional[float] = None
+
+            for index, item in enumerate(self.items):
+                if self.stop_event.is_set():
+                    break
+
+                # Aguarda o item pré-carregado (normalmente já pronto)
+                wait_start = time.perf_counter()
+                thread, result = preload
+                thread.join()
+                self.preload_waits.append(time.perf_counter() - wait_start)
+                preload = None
+
+                if "error" in result:
+                    print(f"Erro ao carregar item da playlist {item['path']}: {result['error']}")
+                    if callback_error:
+                        callback_error(index, item, result["error"])
+                    if index + 1 < len(self.items):
+                        preload = self._start_preload(index + 1)
+                    continue
+
+                session, segments = result["prepared"]
+                if self.stop_event.is_set():
+                    self._release(session)
+                    break
+                self.current_index = index
+                self.current_session = session
+                try:
+                    if callback_item:
+                        callback_item(index, item, session)
+
+                    session.play(repetitions=max(1, int(item.get("repetitions", 1))),
+                                 callback_timing=callback_timing, segments=segments)
+                    if self.stop_event.is_set():
+                        session.stop()
+                    # Só depois de o item começar a tocar o próximo é preparado: o parsing
+                    # segura o GIL e atrasaria a partida se disputasse com ela
+                    if index + 1 < len(self.items):
+                        preload = self._start_preload(index + 1)
+                    session.playback_thread.join()
+                finally:
+                    self._release(session)
+                if previous_end is not None:
+                    self.transition_gaps.append(session.started_at - previous_end)
+                previous_end = time.perf_counter()
+
+        except Exception as e:
+            print(f"Erro durante playlist: {e}")
+        finally:
+            # Item pré-carregado que não chegou a tocar (playlist interrompida)
+            if preload:
+                thread, result = preload
+                thread.join()
+                if "prepared" in result:
+                    self._release(result["prepared"][0])
+            self.is_playing = False
+            if callback_complete:
+                callback_complete()
+
+
+def default_playlist_path(recordings_dir: str = "recordings") -> str:
+    """Caminho padrão da playlist no diretório de gravações"""
+    return os.path.join(recordings_dir, f"playlist{PLAYLIST_EXTENSION}")
@@ -0,0 +1,185 @@
+"""
+Janela de Playlist - Mouse Recorder
+Interface para montar, salvar e reproduzir sequências de gravações
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+from typing import Dict, List, Any
+
+from recording_format import RECORDING_FILETYPES
+from playlist import (
+    make_playlist_item, save_playlist, load_playlist, default_playlist_path, PLAYLIST_EXTENSION
+)
+
+
+class PlaylistWindow:
+    """
+    Janela de playlist
+    Cada item tem velocidade, repetições e trecho próprios
+    """
+
+    def __init__(self, parent=None, recorder=None):
+        self.parent = parent
+        self.recorder = recorder
+        self.window = tk.Toplevel(parent) if parent else tk.Tk()
+        self.window.title("Playlist - Mouse Recorder")
+        self.window.geometry("700x400")
+        self.window.resizable(True, True)
+
+        self.items: List[Dict[str, Any]] = []
+
+        self.setup_ui()
+
+    def setup_ui(self) -> None:
+        """Configura a interface da janela de playlist"""
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # Lista de itens
+        columns = ("file", "speed", "repetitions", "segment")
+        self.tree = ttk.Treeview(frame, columns=columns, show="headings", height=12)
+        self.tree.heading("file", text="Gravação")
+        self.tree.heading("speed", text="Velocidade")
+        self.tree.heading("repetitions", text="Repetições")
+        self.tree.heading("segment", text="Trecho")
+        self.tree.column("file", width=300)
+        self.tree.column("speed", width=90, anchor=tk.CENTER)
+        self.tree.column("repetitions", width=90, anchor=tk.CENTER)
+        self.tree.column("segment", width=150)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<Double-1>", lambda event: self.edit_item())
+
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Botões
+        buttons_frame = ttk.Frame(frame, padding=(10, 0, 0, 0))
+        buttons_frame.pack(side=tk.RIGHT, fill=tk.Y)
+
+        ttk.Button(buttons_frame, text="➕ Adicionar", command=self.add_items).pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="✏️ Editar", command=self.edit_item).pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="➖ Remover", command=self.remove_item).pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="⬆️ Subir", command=lambda: self.move_item(-1)).pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="⬇️ Descer", command=lambda: self.move_item(1)).pack(fill=tk.X, pady=2)
+
+        ttk.Separator(buttons_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
+
+        ttk.Button(buttons_frame, text="💾 Salvar", command=self.save).pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="📁 Abrir", command=self.open).pack(fill=tk.X, pady=2)
+
+        ttk.Separator(buttons_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=8)
+
+        ttk.Button(buttons_frame, text="▶️ Reproduzir", command=self.play, style='Play.TButton').pack(fill=tk.X, pady=2)
+        ttk.Button(buttons_frame, text="⏹️ Parar", command=self.stop, style='Stop.TButton').pack(fill=tk.X, pady=2)
+
+    def refresh(self) -> None:
+        """Atualiza a lista exibida a partir de self.items"""
+        self.tree.delete(*self.tree.get_children())
+        for item in self.items:
+            self.tree.insert("", tk.END, values=(
+                os.path.basename(item["path"]),
+                f"{item['speed']:.1f}x",
+                item["repetitions"],
+                item.get("segment") or "Gravação inteira"
+            ))
+
+    def selected_index(self) -> int:
+        """Índice do item selecionado (-1 se nenhum)"""
+        selection = self.tree.selection()
+        return self.tree.index(selection[0]) if selection else -1
+
+    def add_items(self) -> None:
+        """Adiciona gravações à playlist"""
+        filenames = filedialog.askopenfilenames(
+            parent=self.window,
+            filetypes=RECORDING_FILETYPES,
+            title="Adicionar Gravações"
+        )
+        for filename in filenames:
+            self.items.append(make_playlist_item(filename))
+        self.refresh()
+
+    def edit_item(self) -> None:
+        """Edita velocidade, repetições e trecho do item selecionado"""
+        index = self.selected_index()
+        if index < 0:
+            return
+        item = self.items[index]
+
+        speed = simpledialog.askfloat("Editar item", "Velocidade:", parent=self.window,
+                                      minvalue=0.1, maxvalue=10.0, initialvalue=item["speed"])
+        if speed is None:
+            return
+        repetitions = simpledialog.askinteger("Editar item", "Repetições:", parent=self.window,
+                                              minvalue=1, maxvalue=9999, initialvalue=item["repetitions"])
+        if repetitions is None:
+            return
+        segment = simpledialog.askstring("Editar item", "Trecho (vazio = gravação inteira):", parent=self.window,
+                                         initialvalue=item.get("segment") or "")
+        if segment is None:
+            return
+
+        item.update(speed=speed, repetitions=repetitions, segment=segment.strip() or None)
+        self.refresh()
+
+    def remove_item(self) -> None:
+        """Remove o item selecionado"""
+        index = self.selected_index()
+        if index >= 0:
+            del self.items[index]
+            self.refresh()
+
+    def move_item(self, offset: int) -> None:
+        """Move o item selecionado para cima (-1) ou para baixo (+1)"""
+        index = self.selected_index()
+        target = index + offset
+        if index < 0 or not 0 <= target < len(self.items):
+            return
+        self.items[index], self.items[target] = self.items[target], self.items[index]
+        self.refresh()
+        self.tree.selection_set(self.tree.get_children()[target])
+
+    def save(self) -> None:
+        """Salva a playlist em arquivo"""
+        filename = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=PLAYLIST_EXTENSION,
+            initialfile=os.path.basename(default_playlist_path()),
+            filetypes=[("Playlist", f"*{PLAYLIST_EXTENSION}"), ("All files", "*.*")],
+            title="Salvar Playlist"
+        )
+        if filename:
+            try:
+                save_playlist(filename, self.items)
+            except OSError as e:
+                messagebox.showerror("Erro", f"Erro ao salvar playlist:\n{e}", parent=self.window)
+
+    def open(self) -> None:
+        """Abre uma playlist salva"""
+        filename = filedialog.askopenfilename(
+            parent=self.window,
+            filetypes=[("Playlist", f"*{PLAYLIST_EXTENSION}"), ("All files", "*.*")],
+            title="Abrir Playlist"
+        )
+        if filename:
+            try:
+                self.items = load_playlist(filename)
+                self.refresh()
+            except (OSError, ValueError, KeyError) as e:
+                messagebox.showerror("Erro", f"Erro ao abrir playlist:\n{e}", parent=self.window)
+
+    def play(self) -> None:
+        """Reproduz a playlist na janela principal"""
+        if not self.items:
+            messagebox.showwarning("Aviso", "A playlist está vazia.", parent=self.window)
+            return
+        if self.recorder:
+            self.recorder.start_playlist([dict(item) for item in self.items])
+
+    def stop(self) -> None:
+        """Para a playlist em reprodução"""
+        if self.recorder:
+            self.recorder.stop_all()
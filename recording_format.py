@@ -0,0 +1,749 @@
+"""
+Formato de Gravação - Mouse Recorder
+Formato binário compacto (.mrec) carregado via mmap, com JSON mantido para importação/exportação
+e compressão zlib/lzma opcional, detectada pelos bytes iniciais. Os eventos podem ainda
+ser gravados como deltas em varint (delta_encoding) em vez de colunas fixas
+"""
+
+import gzip
+import io
+import json
+import lzma
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+from event_buffer import (
+    EventBuffer, make_event, NO_NAME,
+    EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE, EVENT_SCROLL, EVENT_KEY_PRESS, EVENT_KEY_RELEASE
+)
+from delta_encoding import encode_events, decode_events
+from playback_program import validate_segments
+
+
+BINARY_MAGIC = b"MREC"
+BINARY_VERSION = 1
+# Versão dos arquivos com eventos em delta/varint: leitores da versão 1 os recusam
+DELTA_VERSION = 2
+BINARY_EXTENSION = ".mrec"
+JSON_EXTENSION = ".json"
+
+# Tipos de arquivo dos diálogos de abrir/salvar
+RECORDING_FILETYPES = [
+    ("Gravação Mouse Recorder", f"*{BINARY_EXTENSION}"),
+    ("JSON (exportação)", f"*{JSON_EXTENSION}"),
+    ("All files", "*.*")
+]
+
+# Cabeçalho: magic, versão, flags, número de eventos, bytes dos metadados, bytes da tabela de nomes
+HEADER = struct.Struct("<4sHHQII")
+
+# Flags do cabeçalho
+FLAG_DELTA_VARINT = 0x0001   # eventos em linhas delta/varint logo após a tabela de nomes
+KNOWN_FLAGS = FLAG_DELTA_VARINT
+
+# Colunas de largura fixa, em ordem de escrita (maiores primeiro: todas ficam alinhadas)
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamps_ns", "q"),
+    ("xs", "i"),
+    ("ys", "i"),
+    ("dxs", "h"),
+    ("dys", "h"),
+    ("name_ids", "h"),
+    ("types", "B"),
+)
+COLUMN_ALIGNMENT = 8
+
+# Limites das colunas de 16 bits (dx/dy de scroll e identificador do nome)
+INT16_MIN, INT16_MAX = -2**15, 2**15 - 1
+
+EVENT_TYPE_NAMES = {
+    EVENT_MOVE: "move",
+    EVENT_CLICK_PRESS: "click",
+    EVENT_CLICK_RELEASE: "click",
+    EVENT_SCROLL: "scroll",
+    EVENT_KEY_PRESS: "key_press",
+    EVENT_KEY_RELEASE: "key_release"
+}
+
+# Campos obrigatórios de cada tipo de evento no formato de dict (além de "timestamp")
+EVENT_FIELDS = {
+    "move": ("x", "y"),
+    "click": ("x", "y", "button", "action"),
+    "scroll": ("x", "y", "dx", "dy"),
+    "key_press": ("key",),
+    "key_release": ("key",)
+}
+
+# memoryview.cast usa a ordem de bytes da máquina; o arquivo é sempre little-endian
+NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Compressão: o arquivo inteiro (JSON ou binário) passa por um fluxo gzip (zlib) ou xz (lzma)
+COMPRESSION_METHODS = ("zlib", "lzma")
+COMPRESSION_MAGIC = {
+    "zlib": b"\x1f\x8b",
+    "lzma": b"\xfd7zXZ\x00"
+}
+
+# Nível zlib: o padrão do gzip (9) custa bem mais tempo para quase nenhum ganho nestes dados
+ZLIB_LEVEL = 6
+
+# Eventos por bloco ao escrever/ler colunas: nenhuma coluna é copiada inteira de uma vez
+CHUNK_EVENTS = 65536
+
+# Bytes por leitura ao decodificar eventos em delta/varint
+DELTA_READ_BYTES = 256 * 1024
+
+# Caracteres por leitura ao percorrer um JSON em fluxo (resumo para o catálogo)
+JSON_READ_CHARS = 256 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+def _column_bytes(column, typecode: str, start: int, stop: int) -> bytes:
+    """Converte column[start:stop] (array ou memoryview) para os bytes little-endian do arquivo"""
+    if isinstance(column, array) and column.typecode == typecode:
+        data = column[start:stop]
+    else:
+        try:
+            data = array(typecode, column[start:stop])
+        except OverflowError:
+            raise ValueError(f"Valor fora do intervalo da coluna '{typecode}' do formato binário")
+    if not NATIVE_LITTLE_ENDIAN:
+        data.byteswap()
+    return data.tobytes()
+
+
+def _check_column_ranges(columns, names: List[str], count: int) -> None:
+    """
+    Verifica, antes de escrever, se os eventos cabem nas colunas de 16 bits do
+    formato binário (também no delta/varint, que é lido de volta para as mesmas colunas)
+    Colunas que já são de 16 bits (RecordingView de um .mrec) não precisam de verificação
+    """
+    if len(names) > INT16_MAX + 1:
+        raise ValueError(f"Gravação com {len(names)} nomes de botões/teclas: "
+                         f"o formato binário aceita até {INT16_MAX + 1}")
+    for attribute in ("dxs", "dys"):
+        column = getattr(columns, attribute)
+        typecode = column.format if isinstance(column, memoryview) else column.typecode
+        if not count or typecode == "h":
+            continue
+        values = column[:count]
+        if min(values) < INT16_MIN or max(values) > INT16_MAX:
+            raise ValueError(f"Scroll fora do intervalo do formato binário "
+                             f"({INT16_MIN} a {INT16_MAX}) na coluna '{attribute}'")
+
+
+def compression_from_settings(settings) -> Optional[str]:
+    """Método de compressão configurado (None se a compressão estiver desativada)"""
+    if not settings.get("compression_enabled", False):
+        return None
+    method = settings.get("compression_method", "zlib")
+    return method if method in COMPRESSION_METHODS else "zlib"
+
+
+def _open_output(path: str, compression: Optional[str]):
+    """Abre um arquivo binário para escrita, comprimindo em fluxo se pedido"""
+    if compression is None:
+        return open(path, 'wb')
+    if compression == "zlib":
+        return gzip.open(path, 'wb', compresslevel=ZLIB_LEVEL)
+    if compression == "lzma":
+        return lzma.open(path, 'wb')
+    raise ValueError(f"Compressão desconhecida: {compression}")
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Método de compressão do arquivo pelos bytes iniciais (None = sem compressão)"""
+    with open(path, 'rb') as f:
+        head = f.read(max(len(magic) for magic in COMPRESSION_MAGIC.values()))
+    for method, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return method
+    return None
+
+
+def open_recording_stream(path: str):
+    """Abre o arquivo para leitura binária, descomprimindo em fluxo quando necessário"""
+    compression = detect_compression(path)
+    if compression == "zlib":
+        return gzip.open(path, 'rb')
+    if compression == "lzma":
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+@contextmanager
+def _decompression_errors():
+    """Converte os erros de um fluxo comprimido truncado ou corrompido em ValueError"""
+    try:
+        yield
+    except (EOFError, lzma.LZMAError, zlib.error, gzip.BadGzipFile) as e:
+        raise ValueError(f"Arquivo comprimido truncado ou corrompido: {e}") from e
+
+
+def _write_binary_stream(f, data: Dict[str, Any], delta: bool = False) -> None:
+    """
+    Escreve a gravação no formato binário em um arquivo aberto, coluna a coluna, em
+    blocos; com delta=True os eventos vão como linhas delta/varint, também em blocos
+    """
+    events = data.get("events", [])
+    if isinstance(events, (EventBuffer, RecordingView)):
+        columns, names, count = events, events.names, len(events)
+    else:
+        columns = EventBuffer.from_events(events)
+        names, count = columns.names, len(columns)
+    _check_column_ranges(columns, names, count)
+
+    metadata = {key: value for key, value in data.items() if key != "events"}
+    metadata_bytes = json.dumps(metadata, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+    names_bytes = json.dumps(names, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+    if delta:
+        f.write(HEADER.pack(BINARY_MAGIC, DELTA_VERSION, FLAG_DELTA_VARINT, count,
+                            len(metadata_bytes), len(names_bytes)))
+        f.write(metadata_bytes)
+        f.write(names_bytes)
+        for block in encode_events(columns, 0, count, CHUNK_EVENTS):
+            f.write(block)
+        return
+
+    header_size = HEADER.size + len(metadata_bytes) + len(names_bytes)
+    padding = -header_size % COLUMN_ALIGNMENT
+
+    f.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, count, len(metadata_bytes), len(names_bytes)))
+    f.write(metadata_bytes)
+    f.write(names_bytes)
+    f.write(bytes(padding))
+    for attribute, typecode in COLUMNS:
+        column = getattr(columns, attribute)
+        for start in range(0, count, CHUNK_EVENTS):
+            f.write(_column_bytes(column, typecode, start, min(start + CHUNK_EVENTS, count)))
+
+
+def _write_json_stream(f, data: Dict[str, Any]) -> None:
+    """
+    Escreve a gravação em JSON (indent=2) em um arquivo binário aberto
+    Os metadados vêm antes de "events", então podem ser lidos sem os eventos
+    """
+    export = {key: value for key, value in data.items() if key != "events"}
+    events = data.get("events", [])
+    export["events"] = events if isinstance(events, list) else list(events)
+    text = io.TextIOWrapper(f, encoding='utf-8')
+    json.dump(export, text, indent=2, ensure_ascii=False)
+    text.flush()
+    text.detach()
+
+
+def write_binary(path: str, data: Dict[str, Any], compression: Optional[str] = None,
+                 delta: bool = False) -> None:
+    """
+    Salva uma gravação no formato binário
+    Aceita eventos como lista de dicts, EventBuffer ou RecordingView. O arquivo é
+    escrito ao lado e renomeado no fim; um RecordingView mapeado sobre o mesmo
+    caminho é copiado para a memória antes (no Windows não se substitui um
+    arquivo mapeado)
+    """
+    _detach_target(path, data)
+    temp_path = f"{path}.tmp"
+    try:
+        with _open_output(temp_path, compression) as f:
+            _write_binary_stream(f, data, delta)
+    except BaseException:
+        # Gravação recusada ou interrompida: não deixa o arquivo parcial para trás
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+
+def _detach_target(path: str, data: Dict[str, Any]) -> None:
+    """Solta o mmap dos eventos se eles vierem do próprio arquivo que será substituído"""
+    events = data.get("events")
+    if (isinstance(events, RecordingView) and os.path.exists(path)
+            and os.path.normcase(os.path.abspath(events.path)) == os.path.normcase(os.path.abspath(path))):
+        events.detach()
+
+
+def _read_header(f) -> Tuple[int, int, int, int]:
+    """Lê e valida o cabeçalho; retorna (eventos, bytes dos metadados, bytes dos nomes, flags)"""
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("Arquivo binário truncado")
+    magic, version, flags, count, metadata_length, names_length = HEADER.unpack(raw)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Não é um arquivo de gravação binário")
+    if version not in (BINARY_VERSION, DELTA_VERSION):
+        raise ValueError(f"Versão do formato binário não suportada: {version}")
+    if flags & ~KNOWN_FLAGS:
+        raise ValueError(f"Flags do formato binário não suportadas: {flags:#x}")
+    return count, metadata_length, names_length, flags
+
+
+class RecordingView:
+    """
+    Visão somente leitura, sem cópia, dos eventos de um arquivo binário
+    As colunas são memoryviews tipadas sobre o mmap do arquivo, com os mesmos
+    nomes de atributo do EventBuffer; eventos individuais são montados como
+    dicts legados apenas quando acessados. Arquivos comprimidos ou com eventos
+    em delta/varint não podem ser mapeados: as colunas são descomprimidas ou
+    decodificadas em blocos direto para arrays
+    """
+
+    def __init__(self, path: str, stream=None):
+        """
+        Args:
+            path: Arquivo binário
+            stream: Fluxo já aberto (ex.: descompressão) posicionado no início dos
+                dados; as colunas são lidas dele em vez de mapeadas
+        """
+        self.path = path
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+        if stream is not None:
+            self._read_stream(stream)
+            return
+
+        with open(path, 'rb') as f:
+            count, metadata_length, names_length, flags = _read_header(f)
+            self.metadata: Dict[str, Any] = json.loads(f.read(metadata_length).decode("utf-8"))
+            self.names: List[str] = json.loads(f.read(names_length).decode("utf-8"))
+            if flags & FLAG_DELTA_VARINT:
+                self._decode_rows(f, count)
+                return
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._size = count
+        offset = HEADER.size + metadata_length + names_length
+        offset += -offset % COLUMN_ALIGNMENT
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+
+        for attribute, typecode in COLUMNS:
+            length = count * struct.calcsize(typecode)
+            if offset + length > len(self._mmap):
+                self.close()
+                raise ValueError("Arquivo binário truncado")
+            raw = buffer[offset:offset + length]
+            if NATIVE_LITTLE_ENDIAN:
+                column = raw.cast(typecode)
+                self._views.extend((raw, column))
+            else:
+                column = array(typecode, raw.tobytes())
+                column.byteswap()
+                raw.release()
+            setattr(self, attribute, column)
+            offset += length
+
+    def _read_stream(self, f) -> None:
+        """Lê cabeçalho, metadados e colunas de um fluxo sequencial, em blocos de CHUNK_EVENTS"""
+        count, metadata_length, names_length, flags = _read_header(f)
+        self.metadata = json.loads(f.read(metadata_length).decode("utf-8"))
+        self.names = json.loads(f.read(names_length).decode("utf-8"))
+        if flags & FLAG_DELTA_VARINT:
+            self._decode_rows(f, count)
+            return
+        f.read(-(HEADER.size + metadata_length + names_length) % COLUMN_ALIGNMENT)
+        self._size = count
+
+        for attribute, typecode in COLUMNS:
+            column = array(typecode)
+            for start in range(0, count, CHUNK_EVENTS):
+                length = (min(start + CHUNK_EVENTS, count) - start) * column.itemsize
+                chunk = f.read(length)
+                if len(chunk) < length:
+                    raise ValueError("Arquivo binário truncado")
+                column.frombytes(chunk)
+            if not NATIVE_LITTLE_ENDIAN:
+                column.byteswap()
+            setattr(self, attribute, column)
+
+    def _decode_rows(self, f, count: int) -> None:
+        """Decodifica as linhas delta/varint do fluxo para as colunas de um EventBuffer"""
+        buffer = EventBuffer(count)
+        append = buffer.append
+        reads = iter(lambda: f.read(DELTA_READ_BYTES), b"")
+        try:
+            for row in decode_events(reads, count):
+                append(*row)
+        except OverflowError:
+            raise ValueError("Arquivo binário corrompido: valor fora do intervalo das colunas")
+        self._size = count
+        for attribute, _ in COLUMNS:
+            setattr(self, attribute, getattr(buffer, attribute))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self.event_at(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("índice de evento fora do intervalo")
+        return self.event_at(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self._size):
+            yield self.event_at(index)
+
+    def event_at(self, index: int) -> Dict[str, Any]:
+        """Materializa um evento no formato de dict legado"""
+        name_id = self.name_ids[index]
+        return make_event(
+            self.types[index], self.xs[index], self.ys[index], self.dxs[index], self.dys[index],
+            self.names[name_id] if name_id != NO_NAME else None, self.timestamps_ns[index]
+        )
+
+    def to_events(self) -> List[Dict[str, Any]]:
+        """Monta a lista de dicts legada (ex.: para exportar em JSON)"""
+        return list(self)
+
+    def type_counts(self) -> Dict[str, int]:
+        """Quantidade de eventos por tipo, contada direto na coluna de tipos"""
+        counts: Dict[str, int] = {}
+        for code, count in Counter(self.types).items():
+            name = EVENT_TYPE_NAMES.get(code, "unknown")
+            counts[name] = counts.get(name, 0) + count
+        return counts
+
+    def verify(self) -> None:
+        """Confere tipos, nomes e ordem dos timestamps; lança ValueError no primeiro problema"""
+        names = len(self.names)
+        last = 0
+        for index in range(self._size):
+            if self.types[index] not in EVENT_TYPE_NAMES:
+                raise ValueError(f"evento {index} tem tipo inválido: {self.types[index]}")
+            if not NO_NAME <= self.name_ids[index] < names:
+                raise ValueError(f"evento {index} referencia um nome inexistente")
+            timestamp = self.timestamps_ns[index]
+            if timestamp < last:
+                raise ValueError(f"evento {index} fora de ordem")
+            last = timestamp
+
+    def detach(self) -> None:
+        """
+        Copia as colunas mapeadas para a memória e fecha o mmap; a visão continua
+        utilizável e o arquivo pode ser substituído ou apagado
+        """
+        if self._mmap is None:
+            return
+        for attribute, typecode in COLUMNS:
+            column = getattr(self, attribute)
+            if isinstance(column, memoryview):
+                setattr(self, attribute, array(typecode, column.tobytes()))
+        self.close()
+
+    def close(self) -> None:
+        """Libera as colunas e o mmap (a visão não pode mais ser usada)"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _view_data(view: RecordingView) -> Dict[str, Any]:
+    """Dados da gravação: metadados + "events" como RecordingView"""
+    data = dict(view.metadata)
+    data["events"] = view
+    return data
+
+
+def read_binary(path: str) -> Dict[str, Any]:
+    """Carrega uma gravação binária (via mmap, ou em blocos se estiver comprimida)"""
+    if detect_compression(path) is None:
+        return _view_data(RecordingView(path))
+    with _decompression_errors(), open_recording_stream(path) as f:
+        return _view_data(RecordingView(path, stream=f))
+
+
+def is_binary_recording(path: str) -> bool:
+    """Detecta o formato binário pelos bytes iniciais (já descomprimidos), independente da extensão"""
+    with open_recording_stream(path) as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_recording(path: str) -> Dict[str, Any]:
+    """
+    Carrega uma gravação binária ou JSON, comprimida ou não, detectando o
+    formato pelo conteúdo. Binários sem compressão são mapeados via mmap
+    """
+    with _decompression_errors():
+        if is_binary_recording(path):
+            return read_binary(path)
+        with open_recording_stream(path) as f:
+            return json.load(io.TextIOWrapper(f, encoding='utf-8'))
+
+
+class _JsonScanner:
+    """
+    Lê um JSON em blocos, um valor por vez, sem carregar o arquivo inteiro
+    Um valor só é aceito quando algo o segue no buffer (um número no fim do
+    bloco pode continuar no próximo)
+    """
+
+    def __init__(self, f):
+        self._text = io.TextIOWrapper(f, encoding='utf-8')
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        if self._eof:
+            raise ValueError("JSON de gravação truncado ou inválido")
+        chunk = self._text.read(JSON_READ_CHARS)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Próximo caractere que não é espaço (sem consumi-lo)"""
+        while True:
+            self._pos = JSON_WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            self._fill()
+
+    def expect(self, characters: str) -> str:
+        """Consome o próximo caractere, que precisa ser um de characters"""
+        character = self.peek()
+        if character not in characters:
+            raise ValueError("JSON de gravação inválido")
+        self._pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decodifica o próximo valor JSON completo"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                pass
+            self._fill()
+
+
+def _scan_json_members(scanner: _JsonScanner, metadata: Dict[str, Any], first: bool) -> bool:
+    """
+    Lê pares chave/valor do objeto de nível superior para metadata até "events" ou
+    o fim do objeto. Retorna True se parou no início da lista de eventos
+    """
+    if first and scanner.peek() == "}":
+        scanner.expect("}")
+        return False
+    while True:
+        key = scanner.value()
+        scanner.expect(":")
+        if key == "events":
+            return True
+        metadata[key] = scanner.value()
+        if scanner.expect(",}") == "}":
+            return False
+
+
+def _iter_json_events(scanner: _JsonScanner) -> Iterator[Any]:
+    """Decodifica os eventos da lista um a um e consome o separador após ela"""
+    scanner.expect("[")
+    if scanner.peek() == "]":
+        scanner.expect("]")
+        return
+    # Laço direto sobre o buffer (o caminho quente do resumo de JSON grandes); um
+    # evento cortado no fim do bloco é decodificado de novo após o próximo bloco
+    decode = scanner._decoder.raw_decode
+    skip = JSON_WHITESPACE.match
+    while True:
+        buffer, pos = scanner._buffer, scanner._pos
+        try:
+            while True:
+                value, pos = decode(buffer, skip(buffer, pos).end())
+                pos = skip(buffer, pos).end()
+                separator = buffer[pos]
+                if separator not in ",]":
+                    raise ValueError("JSON de gravação inválido")
+                scanner._pos = pos + 1
+                yield value
+                if separator == "]":
+                    return
+                pos += 1
+        except (json.JSONDecodeError, IndexError):
+            scanner._fill()
+
+
+def validate_recording(data: Any) -> None:
+    """
+    Valida por completo uma gravação carregada (eventos em dicts ou RecordingView,
+    e trechos, se houver); lança ValueError descrevendo o primeiro problema
+    """
+    if not isinstance(data, dict):
+        raise ValueError("dados não são um dicionário")
+    events = data.get("events")
+    if isinstance(events, RecordingView):
+        events.verify()
+    elif not isinstance(events, list):
+        raise ValueError("'events' ausente ou não é uma lista")
+    else:
+        last_timestamp = 0.0
+        for index, event in enumerate(events):
+            if not isinstance(event, dict):
+                raise ValueError(f"evento {index} não é um dicionário")
+            fields = EVENT_FIELDS.get(event.get("type"))
+            if fields is None:
+                raise ValueError(f"evento {index} tem tipo inválido: {event.get('type')}")
+            missing = [field for field in fields + ("timestamp",) if field not in event]
+            if missing:
+                raise ValueError(f"evento {index} sem campos: {missing}")
+            if event["timestamp"] < last_timestamp:
+                raise ValueError(f"evento {index} fora de ordem")
+            last_timestamp = event["timestamp"]
+
+    if "segments" in data:
+        problems = validate_segments(data["segments"], data.get("duration", 0.0))
+        if problems:
+            raise ValueError("; ".join(problems))
+
+
+def _summarize_binary(f) -> Tuple[Dict[str, Any], Dict[str, int], set]:
+    """Lê de um fluxo binário só metadados, nomes e as colunas de tipos e de nomes"""
+    count, metadata_length, names_length, flags = _read_header(f)
+    metadata = json.loads(f.read(metadata_length).decode("utf-8"))
+    names = json.loads(f.read(names_length).decode("utf-8"))
+    metadata.setdefault("total_events", count)
+
+    if flags & FLAG_DELTA_VARINT:
+        reads = iter(lambda: f.read(DELTA_READ_BYTES), b"")
+        types = array("B")
+        name_ids = array("h")
+        for row in decode_events(reads, count):
+            types.append(row[0])
+            name_ids.append(row[5])
+    else:
+        f.seek(-(HEADER.size + metadata_length + names_length) % COLUMN_ALIGNMENT, os.SEEK_CUR)
+        columns: Dict[str, array] = {}
+        for attribute, typecode in COLUMNS:
+            length = count * struct.calcsize(typecode)
+            if attribute not in ("types", "name_ids"):
+                f.seek(length, os.SEEK_CUR)
+                continue
+            column = array(typecode)
+            for start in range(0, length, CHUNK_EVENTS * column.itemsize):
+                chunk = f.read(min(CHUNK_EVENTS * column.itemsize, length - start))
+                if not chunk or len(chunk) % column.itemsize:
+                    raise ValueError("Arquivo binário truncado")
+                column.frombytes(chunk)
+            if len(column) < count:
+                raise ValueError("Arquivo binário truncado")
+            if not NATIVE_LITTLE_ENDIAN:
+                column.byteswap()
+            columns[attribute] = column
+        types, name_ids = columns["types"], columns["name_ids"]
+
+    counts: Dict[str, int] = {}
+    for code, code_count in Counter(types).items():
+        name = EVENT_TYPE_NAMES.get(code, "unknown")
+        counts[name] = counts.get(name, 0) + code_count
+    key_ids = {
+        name_id for code, name_id in zip(types, name_ids)
+        if (code == EVENT_KEY_PRESS or code == EVENT_KEY_RELEASE) and name_id != NO_NAME
+    }
+    return metadata, counts, {names[name_id] for name_id in key_ids}
+
+
+def _summarize_json(f) -> Tuple[Dict[str, Any], Dict[str, int], set]:
+    """Lê um JSON de gravação em fluxo, contando os eventos um a um sem montar a lista"""
+    scanner = _JsonScanner(f)
+    if scanner.peek() != "{":
+        raise ValueError("JSON de gravação não é um objeto")
+    scanner.expect("{")
+    metadata: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    keys = set()
+    total = 0
+
+    # Metadados antes e (em JSON antigos) depois de "events"
+    if _scan_json_members(scanner, metadata, first=True):
+        for event in _iter_json_events(scanner):
+            event_type = event.get("type", "unknown")
+            counts[event_type] = counts.get(event_type, 0) + 1
+            if event_type in ("key_press", "key_release") and event.get("key") is not None:
+                keys.add(event["key"])
+            total += 1
+        if scanner.expect(",}") == ",":
+            _scan_json_members(scanner, metadata, first=False)
+    else:
+        raise ValueError("'events' ausente na gravação")
+
+    metadata.setdefault("total_events", total)
+    return metadata, counts, keys
+
+
+def read_recording_summary(path: str) -> Dict[str, Any]:
+    """
+    Metadados da gravação mais "event_counts" (por tipo) e "keys" (teclas usadas),
+    para o catálogo. Lê o mínimo: no binário, o cabeçalho e só as colunas de tipos
+    e de nomes; no JSON, os eventos um por vez, sem montar a lista
+    """
+    with _decompression_errors():
+        binary = is_binary_recording(path)
+        with open_recording_stream(path) as f:
+            metadata, counts, keys = _summarize_binary(f) if binary else _summarize_json(f)
+    metadata["event_counts"] = counts
+    metadata["keys"] = keys
+    return metadata
+
+
+def write_recording(path: str, data: Dict[str, Any], compression: Optional[str] = None,
+                    delta: bool = False) -> None:
+    """
+    Salva a gravação: JSON para arquivos .json (exportação), binário nos demais
+
+    Args:
+        path: Arquivo de destino (a extensão não muda com a compressão)
+        data: Dados da gravação
+        compression: "zlib", "lzma" ou None; o conteúdo é comprimido em fluxo, à
+            medida que é escrito
+        delta: Grava os eventos do binário como deltas em varint (ignorado no JSON)
+    """
+    if not path.lower().endswith(JSON_EXTENSION):
+        write_binary(path, data, compression, delta)
+        return
+
+    _detach_target(path, data)
+    temp_path = f"{path}.tmp"
+    with _open_output(temp_path, compression) as f:
+        _write_json_stream(f, data)
+    os.replace(temp_path, path)
+
+
+def count_event_types(events) -> Dict[str, int]:
+    """Quantidade de eventos por tipo, para listas de dicts, RecordingView ou EventBuffer"""
+    if isinstance(events, RecordingView):
+        return events.type_counts()
+    counts: Dict[str, int] = {}
+    if isinstance(events, EventBuffer):
+        for code, count in Counter(events.types[:len(events)]).items():
+            name = EVENT_TYPE_NAMES.get(code, "unknown")
+            counts[name] = counts.get(name, 0) + count
+        return counts
+    for event in events:
+        event_type = event.get("type", "unknown")
+        counts[event_type] = counts.get(event_type, 0) + 1
+    return counts
+
+
+def is_recording_file(filename: str) -> bool:
+    """Arquivos reconhecidos como gravação pela extensão"""
+    return filename.endswith(BINARY_EXTENSION) or filename.endswith(JSON_EXTENSION)
@@ -0,0 +1,189 @@
+"""
+Journal de Gravação - Mouse Recorder
+Arquivo append-only (write-ahead) onde os eventos são gravados durante a captura,
+permitindo recuperar a gravação após um travamento
+"""
+
+import json
+import os
+import datetime
+import uuid
+from typing import Dict, List, Any, Iterator, Optional
+
+from event_buffer import EventBuffer, make_event, NO_NAME
+
+
+# Versão 2: timestamps em nanossegundos inteiros
+JOURNAL_VERSION = 2
+JOURNAL_EXTENSION = ".journal"
+
+
+class RecordingJournal:
+    """
+    Journal de eventos de uma gravação em andamento
+    Formato JSON Lines: uma linha de cabeçalho, uma linha compacta por evento
+    [tipo, x, y, dx, dy, nome, timestamp_ns] e uma linha de encerramento
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events_written = 0
+        self._file = None
+
+    @staticmethod
+    def new_path(recordings_dir: str = "recordings") -> str:
+        """
+        Gera o caminho de um novo journal no diretório de gravações
+        Data/hora com milissegundos ordenam os journals; o sufixo aleatório evita
+        colisão entre gravações iniciadas no mesmo instante
+        """
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return os.path.join(recordings_dir, f"journal_{timestamp}_{uuid.uuid4().hex[:8]}{JOURNAL_EXTENSION}")
+
+    def open(self, header: Optional[Dict[str, Any]] = None) -> None:
+        """Cria o arquivo e escreve o cabeçalho"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._file = open(self.path, 'w', encoding='utf-8')
+        record = {"journal": JOURNAL_VERSION, "started_at": datetime.datetime.now().isoformat()}
+        record.update(header or {})
+        self._write_line(record)
+        self._file.flush()
+
+    def _write_line(self, record: Any) -> None:
+        self._file.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+        self._file.write("\n")
+
+    def write_events(self, buffer: EventBuffer, start: int = 0, stop: Optional[int] = None) -> int:
+        """Acrescenta os eventos buffer[start:stop] ao journal e retorna quantos foram escritos"""
+        stop = len(buffer) if stop is None else stop
+        for index in range(start, stop):
+            self._write_line(buffer.row_at(index))
+
+        written = max(0, stop - start)
+        self.events_written += written
+        return written
+
+    def sync(self) -> None:
+        """Força a gravação dos dados pendentes no disco (flush + fsync)"""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self, footer: Optional[Dict[str, Any]] = None) -> None:
+        """Escreve a linha de encerramento e fecha o arquivo"""
+        if not self._file:
+            return
+        record = {"end": True, "total_events": self.events_written}
+        record.update(footer or {})
+        self._write_line(record)
+        self.sync()
+        self._file.close()
+        self._file = None
+
+    def _iter_rows(self) -> Iterator[List[Any]]:
+        """
+        Lê o journal linha a linha devolvendo as linhas compactas dos eventos
+        Uma última linha truncada (escrita interrompida) é ignorada
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if isinstance(record, list):
+                    yield record
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Lê o journal devolvendo eventos no formato de dict legado"""
+        for record in self._iter_rows():
+            yield make_event(*record)
+
+    def read_buffer(self) -> EventBuffer:
+        """Lê os eventos do journal direto para as colunas de um EventBuffer, sem montar dicts"""
+        buffer = EventBuffer(max(1, self.events_written))
+        append = buffer.append
+        intern = buffer.intern
+        for code, x, y, dx, dy, name, timestamp_ns in self._iter_rows():
+            append(code, x, y, dx, dy, intern(name) if name is not None else NO_NAME, timestamp_ns)
+        return buffer
+
+    def read_header(self) -> Dict[str, Any]:
+        """Lê a linha de cabeçalho do journal"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+    def read_footer(self) -> Optional[Dict[str, Any]]:
+        """Lê a linha de encerramento do journal (None se o journal não foi encerrado)"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - 4096))
+                lines = f.read().rstrip(b"\n").split(b"\n")
+            record = json.loads(lines[-1])
+        except (OSError, ValueError):
+            return None
+        if isinstance(record, dict) and record.get("end", False) is True:
+            return record
+        return None
+
+    def is_finished(self) -> bool:
+        """Verifica se o journal foi encerrado corretamente (linha final presente)"""
+        return self.read_footer() is not None
+
+    def recover(self) -> Dict[str, Any]:
+        """Reconstrói a gravação a partir do journal (interrompido ou encerrado sem salvar)"""
+        header = self.read_header()
+        events = self.read_buffer()
+        started_at = header.get("started_at", datetime.datetime.now().isoformat())
+        name_suffix = os.path.splitext(os.path.basename(self.path))[0].replace("journal_", "")
+
+        return {
+            "name": f"Recuperada_{name_suffix}",
+            "duration": events.last_timestamp(),
+            "total_events": len(events),
+            "created_at": started_at,
+            "recovered": True,
+            "events": events
+        }
+
+    @staticmethod
+    def find_unfinished(recordings_dir: str = "recordings") -> List["RecordingJournal"]:
+        """
+        Lista os journals a recuperar, do mais antigo ao mais recente: os não encerrados
+        (gravação interrompida) e os encerrados cuja gravação não chegou a ser salva
+        Um journal encerrado cujo arquivo saved_as já existe sobrou de um travamento
+        entre o salvamento e o descarte: é removido aqui
+        """
+        journals = []
+        try:
+            filenames = sorted(os.listdir(recordings_dir))
+        except OSError:
+            return journals
+
+        for filename in filenames:
+            if not filename.endswith(JOURNAL_EXTENSION):
+                continue
+            journal = RecordingJournal(os.path.join(recordings_dir, filename))
+            footer = journal.read_footer()
+            saved_as = footer.get("saved_as") if footer else None
+            if saved_as and os.path.exists(saved_as):
+                journal.discard()
+            else:
+                journals.append(journal)
+        return journals
+
+    def discard(self) -> None:
+        """Remove o arquivo do journal"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,366 @@
+"""
+Biblioteca de Gravações - Mouse Recorder
+Catálogo SQLite das gravações do diretório, com consultas indexadas
+por nome, data, duração, quantidade de eventos e teclas usadas
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Set, Tuple
+
+from event_buffer import EVENT_KEY_PRESS, EVENT_KEY_RELEASE, NO_NAME
+from recording_format import read_recording_summary, count_event_types, is_recording_file, EVENT_TYPE_NAMES
+from playlist import PLAYLIST_EXTENSION
+
+
+LIBRARY_FILENAME = "library.sqlite3"
+
+# Versão do esquema: o catálogo é derivado dos arquivos, então é recriado se mudar
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    filename TEXT PRIMARY KEY,
+    valid INTEGER NOT NULL,
+    name TEXT,
+    created_at TEXT,
+    duration REAL,
+    total_events INTEGER,
+    moves INTEGER,
+    clicks INTEGER,
+    scrolls INTEGER,
+    key_presses INTEGER,
+    key_releases INTEGER,
+    file_size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_name ON recordings(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_recordings_created_at ON recordings(created_at);
+CREATE INDEX IF NOT EXISTS idx_recordings_modified_at ON recordings(modified_at);
+CREATE INDEX IF NOT EXISTS idx_recordings_duration ON recordings(duration);
+CREATE INDEX IF NOT EXISTS idx_recordings_total_events ON recordings(total_events);
+CREATE TABLE IF NOT EXISTS recording_keys (
+    key TEXT NOT NULL,
+    filename TEXT NOT NULL REFERENCES recordings(filename) ON DELETE CASCADE,
+    PRIMARY KEY (key, filename)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_recording_keys_filename ON recording_keys(filename);
+"""
+
+# Colunas de contagem por tipo de evento (nomes de count_event_types -> coluna)
+COUNT_COLUMNS = {
+    "move": "moves",
+    "click": "clicks",
+    "scroll": "scrolls",
+    "key_press": "key_presses",
+    "key_release": "key_releases"
+}
+
+# Ordenações aceitas por query
+ORDER_COLUMNS = ("modified_at", "created_at", "name", "duration", "total_events", "file_size")
+
+
+def summarize_events(events) -> Tuple[Dict[str, int], Set[str]]:
+    """
+    Contagem por tipo e conjunto de teclas usadas, para lista de dicts,
+    EventBuffer ou RecordingView (colunas lidas direto, sem montar dicts)
+    """
+    if hasattr(events, "timestamps_ns"):
+        size = len(events)
+        types = events.types[:size]
+        counts: Dict[str, int] = {}
+        for code, count in Counter(types).items():
+            name = EVENT_TYPE_NAMES.get(code, "unknown")
+            counts[name] = counts.get(name, 0) + count
+        key_ids = {
+            name_id for code, name_id in zip(types, events.name_ids[:size])
+            if (code == EVENT_KEY_PRESS or code == EVENT_KEY_RELEASE) and name_id != NO_NAME
+        }
+        return counts, {events.names[name_id] for name_id in key_ids}
+
+    keys = {event["key"] for event in events
+            if event.get("type") in ("key_press", "key_release") and event.get("key") is not None}
+    return count_event_types(events), keys
+
+
+def summarize_recording(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Resumo no formato de read_recording_summary para dados já carregados na memória"""
+    events = data.get("events", [])
+    counts, keys = summarize_events(events)
+    summary = {key: value for key, value in data.items() if key != "events"}
+    summary.setdefault("total_events", len(events))
+    summary["event_counts"] = counts
+    summary["keys"] = keys
+    return summary
+
+
+class RecordingLibrary:
+    """
+    Catálogo das gravações de um diretório em SQLite
+    Cada arquivo é lido uma única vez (ou quando tamanho/mtime mudam); as
+    listagens e buscas consultam só o banco, sem varrer o diretório
+    """
+
+    def __init__(self, recordings_dir: str = "recordings", db_path: Optional[str] = None):
+        """
+        Args:
+            recordings_dir: Diretório das gravações
+            db_path: Arquivo do banco (padrão: library.sqlite3 no diretório das gravações)
+        """
+        self.recordings_dir = recordings_dir
+        self.db_path = db_path or os.path.join(recordings_dir, LIBRARY_FILENAME)
+        # Salvamentos podem vir de outras threads (ex.: sincronização em segundo plano)
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # O catálogo é só um cache dos arquivos: nenhuma falha nele impede a aplicação de abrir
+        try:
+            self._open(self.db_path)
+        except sqlite3.OperationalError as e:
+            # Banco inacessível (bloqueado, sem permissão): não é apagado
+            print(f"Catálogo da biblioteca indisponível ({e}); usando catálogo em memória")
+            self._open(":memory:")
+        except sqlite3.DatabaseError as e:
+            print(f"Catálogo da biblioteca corrompido ({e}); recriando {self.db_path}")
+            self._rebuild()
+
+    def _open(self, db_path: str) -> None:
+        """Conecta ao banco e cria as tabelas"""
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._create_schema()
+
+    def _rebuild(self) -> None:
+        """Apaga o banco corrompido e cria um vazio (em memória, se nem isso for possível)"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        try:
+            for suffix in ("", "-journal", "-wal", "-shm"):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+            self._open(self.db_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Erro ao recriar catálogo da biblioteca ({e}); usando catálogo em memória")
+            self._open(":memory:")
+
+    def _create_schema(self) -> None:
+        """Cria as tabelas, recriando o catálogo se o esquema for de outra versão"""
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS recording_keys")
+                self._connection.execute("DROP TABLE IF EXISTS recordings")
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._connection.close()
+
+    def _filename_of(self, filepath: str) -> Optional[str]:
+        """Nome do arquivo se ele estiver no diretório da biblioteca (None caso contrário)"""
+        directory = os.path.dirname(os.path.abspath(filepath))
+        if directory != os.path.abspath(self.recordings_dir):
+            return None
+        return os.path.basename(filepath)
+
+    def _store(self, filename: str, file_stats: os.stat_result, summary: Optional[Dict[str, Any]]) -> None:
+        """Grava a linha do arquivo (summary=None marca o arquivo como inválido); sem commit"""
+        modified_at = datetime.datetime.fromtimestamp(file_stats.st_mtime).isoformat()
+        self._connection.execute("DELETE FROM recording_keys WHERE filename = ?", (filename,))
+
+        if summary is None:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO recordings (filename, valid, file_size, mtime_ns, modified_at) "
+                "VALUES (?, 0, ?, ?, ?)",
+                (filename, file_stats.st_size, file_stats.st_mtime_ns, modified_at)
+            )
+            return
+
+        counts = summary["event_counts"]
+        self._connection.execute(
+            "INSERT OR REPLACE INTO recordings VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                filename,
+                summary.get("name", filename),
+                summary.get("created_at") or modified_at,
+                summary.get("duration", 0),
+                summary["total_events"],
+                *(counts.get(event_type, 0) for event_type in COUNT_COLUMNS),
+                file_stats.st_size,
+                file_stats.st_mtime_ns,
+                modified_at
+            )
+        )
+        self._connection.executemany(
+            "INSERT INTO recording_keys (key, filename) VALUES (?, ?)",
+            ((key, filename) for key in summary["keys"])
+        )
+
+    def _read_summary(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Resume o arquivo (metadados, contagens e teclas, sem carregar os eventos);
+        None para arquivos ilegíveis. Chamado fora do lock: consultas não esperam a leitura
+        """
+        try:
+            summary = read_recording_summary(os.path.join(self.recordings_dir, filename))
+            return summary if isinstance(summary, dict) else None
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError, OSError):
+            # Arquivos comprimidos truncados ou corrompidos chegam como ValueError
+            return None
+
+    def add(self, filepath: str, data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Registra um arquivo recém-salvo; com data (os dados que acabaram de ser
+        escritos) o arquivo nem é relido. Retorna False para arquivos fora do
+        diretório da biblioteca
+        """
+        filename = self._filename_of(filepath)
+        if filename is None:
+            return False
+        file_stats = os.stat(filepath)
+        summary = self._read_summary(filename) if data is None else summarize_recording(data)
+        with self._lock, self._connection:
+            self._store(filename, file_stats, summary)
+        return True
+
+    def remove(self, filepaths: Iterable[str]) -> None:
+        """Remove do catálogo arquivos apagados"""
+        filenames = [(name,) for name in map(self._filename_of, filepaths) if name is not None]
+        with self._lock, self._connection:
+            self._connection.executemany("DELETE FROM recordings WHERE filename = ?", filenames)
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Confere o diretório com o catálogo: lê só arquivos novos ou com tamanho/mtime
+        diferentes e remove os que sumiram. Retorna (atualizados, removidos)
+        """
+        with self._lock:
+            known = {
+                row["filename"]: (row["file_size"], row["mtime_ns"])
+                for row in self._connection.execute("SELECT filename, file_size, mtime_ns FROM recordings")
+            }
+        updated = 0
+        seen = set()
+
+        try:
+            with os.scandir(self.recordings_dir) as entries:
+                for entry in entries:
+                    # Playlists ficam no mesmo diretório mas não são gravações
+                    if (not is_recording_file(entry.name) or entry.name.endswith(PLAYLIST_EXTENSION)
+                            or not entry.is_file()):
+                        continue
+                    try:
+                        file_stats = entry.stat()
+                    except OSError:
+                        continue
+                    seen.add(entry.name)
+                    if known.get(entry.name) == (file_stats.st_size, file_stats.st_mtime_ns):
+                        continue
+                    summary = self._read_summary(entry.name)
+                    with self._lock, self._connection:
+                        self._store(entry.name, file_stats, summary)
+                    updated += 1
+        except OSError as e:
+            print(f"Erro ao sincronizar biblioteca de gravações: {e}")
+            return updated, 0
+
+        missing = [name for name in known if name not in seen]
+        with self._lock, self._connection:
+            self._connection.executemany("DELETE FROM recordings WHERE filename = ?",
+                                         [(name,) for name in missing])
+        return updated, len(missing)
+
+    def query(self, name: Optional[str] = None, created_from: Optional[str] = None,
+              created_before: Optional[str] = None, min_duration: Optional[float] = None,
+              max_duration: Optional[float] = None, min_events: Optional[int] = None,
+              max_events: Optional[int] = None, min_counts: Optional[Dict[str, int]] = None,
+              keys: Sequence[str] = (), order_by: str = "modified_at", descending: bool = True,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Busca gravações no catálogo; filtros omitidos não restringem
+
+        Args:
+            name: Trecho do nome (sem diferenciar maiúsculas) ou do nome do arquivo;
+                % e _ são procurados literalmente
+            created_from: Data/hora ISO mínima de criação (inclusiva)
+            created_before: Data/hora ISO máxima de criação (exclusiva)
+            min_duration, max_duration: Duração em segundos
+            min_events, max_events: Total de eventos
+            min_counts: Mínimo por tipo, ex.: {"click": 1, "key_press": 10}
+            keys: Teclas que precisam ter sido usadas (todas)
+            order_by: Uma de ORDER_COLUMNS
+            descending: Ordem decrescente
+            limit: Máximo de resultados
+        """
+        conditions = ["valid = 1"]
+        params: List[Any] = []
+
+        if name:
+            conditions.append("(name LIKE ? ESCAPE '\\' OR filename LIKE ? ESCAPE '\\')")
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            params.extend((pattern, pattern))
+        for column, operator, value in (("created_at", ">=", created_from), ("created_at", "<", created_before),
+                                        ("duration", ">=", min_duration), ("duration", "<=", max_duration),
+                                        ("total_events", ">=", min_events), ("total_events", "<=", max_events)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        for event_type, minimum in (min_counts or {}).items():
+            if event_type not in COUNT_COLUMNS:
+                raise ValueError(f"Tipo de evento desconhecido: {event_type}")
+            conditions.append(f"{COUNT_COLUMNS[event_type]} >= ?")
+            params.append(minimum)
+        for key in keys:
+            conditions.append("filename IN (SELECT filename FROM recording_keys WHERE key = ?)")
+            params.append(key)
+
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Ordenação desconhecida: {order_by}")
+        sql = (f"SELECT * FROM recordings WHERE {' AND '.join(conditions)} "
+               f"ORDER BY {order_by} {'DESC' if descending else 'ASC'}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._row_to_recording(row) for row in rows]
+
+    def _row_to_recording(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Linha do banco no formato de FileManager.list_recordings (+ contagens por tipo)"""
+        return {
+            "filename": row["filename"],
+            "filepath": os.path.join(self.recordings_dir, row["filename"]),
+            "name": row["name"],
+            "duration": row["duration"],
+            "total_events": row["total_events"],
+            "created_at": row["created_at"],
+            "file_size": row["file_size"],
+            "modified_at": row["modified_at"],
+            "event_counts": {event_type: row[column] for event_type, column in COUNT_COLUMNS.items()}
+        }
+
+    def keys_used(self) -> List[str]:
+        """Todas as teclas presentes em alguma gravação (para filtros da interface)"""
+        with self._lock:
+            rows = self._connection.execute("SELECT DISTINCT key FROM recording_keys ORDER BY key").fetchall()
+        return [row["key"] for row in rows]
+
+    def keys_of(self, filepath: str) -> List[str]:
+        """Teclas usadas em uma gravação"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM recording_keys WHERE filename = ? ORDER BY key",
+                (os.path.basename(filepath),)
+            ).fetchall()
+        return [row["key"] for row in rows]
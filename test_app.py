@@ -0,0 +1,981 @@
+"""
+Testes - Mouse Recorder
+Verificações de corretude da captura e dos formatos de gravação (os tempos ficam em benchmark.py)
+"""
+
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from delta_encoding import zigzag, unzigzag, write_varint, read_varint, encode_events, decode_events
+from event_buffer import (
+    EventBuffer, NO_NAME, EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE, EVENT_SCROLL,
+    EVENT_KEY_PRESS, EVENT_KEY_RELEASE
+)
+from input_backends import FakeBackend
+from mouse_recorder import MouseRecorder, RecordingSession
+from playback_program import (
+    OP_MOVE, OP_BUTTON_PRESS, OP_KEY_PRESS, POSITIONED_OPCODES, build_passes, elide_redundant_positions,
+    position_checkpoints, cursor_position_at
+)
+from playback_session import PlaybackSession
+from playlist import PlaylistPlayer, make_playlist_item
+from recording_journal import RecordingJournal
+from recording_format import (
+    EVENT_TYPE_NAMES, detect_compression, read_recording, read_recording_summary, write_recording,
+    validate_recording
+)
+from recording_library import RecordingLibrary
+from utils import PerformanceMonitor
+
+
+# Campos na ordem das linhas de decode_events
+FIELDS = ("types", "xs", "ys", "dxs", "dys", "name_ids", "timestamps_ns")
+
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+INT16_MIN, INT16_MAX = -2**15, 2**15 - 1
+
+
+def make_random_buffer(total_events: int, seed: int = 1234) -> EventBuffer:
+    """
+    Buffer com coordenadas negativas, saltos grandes, timestamps repetidos e teclas
+    com x/y (o formato não pode depender de teclas não terem posição)
+    """
+    rng = random.Random(seed)
+    buffer = EventBuffer(total_events)
+    names = [buffer.intern(name) for name in ("Button.left", "Button.right", "a", "Key.shift", "ç")]
+    x = y = timestamp = 0
+    for _ in range(total_events):
+        code = rng.choice((EVENT_MOVE, EVENT_MOVE, EVENT_MOVE, EVENT_CLICK_PRESS, EVENT_CLICK_RELEASE,
+                           EVENT_SCROLL, EVENT_KEY_PRESS, EVENT_KEY_RELEASE))
+        timestamp += rng.choice((0, 0, 1, rng.randrange(1_000_000), rng.randrange(10**12)))
+        if rng.random() < 0.01:
+            x, y = rng.randrange(INT32_MIN, INT32_MAX + 1), rng.randrange(INT32_MIN, INT32_MAX + 1)
+        elif rng.random() < 0.7:
+            x = max(INT32_MIN, min(INT32_MAX, x + rng.randrange(-40, 41)))
+            y = max(INT32_MIN, min(INT32_MAX, y + rng.randrange(-40, 41)))
+        if code in (EVENT_KEY_PRESS, EVENT_KEY_RELEASE):
+            kx, ky = (rng.randrange(-5000, 5000), rng.randrange(-5000, 5000)) if rng.random() < 0.1 else (0, 0)
+            buffer.append(code, kx, ky, 0, 0, rng.choice(names), timestamp)
+        elif code == EVENT_SCROLL:
+            buffer.append(code, x, y, rng.randrange(INT16_MIN, INT16_MAX + 1),
+                          rng.randrange(INT16_MIN, INT16_MAX + 1), NO_NAME, timestamp)
+        elif code == EVENT_MOVE:
+            buffer.append(code, x, y, 0, 0, NO_NAME, timestamp)
+        else:
+            buffer.append(code, x, y, 0, 0, rng.choice(names), timestamp)
+    return buffer
+
+
+def make_extreme_buffer() -> EventBuffer:
+    """Limites das colunas do formato binário, saltos entre eles e timestamps que voltam"""
+    buffer = EventBuffer()
+    button = buffer.intern("Button.left")
+    key = buffer.intern("Key.esc")
+    rows = (
+        (EVENT_MOVE, INT32_MIN, INT32_MIN, 0, 0, NO_NAME, 0),
+        (EVENT_MOVE, INT32_MAX, INT32_MAX, 0, 0, NO_NAME, 2**63 - 1),
+        (EVENT_CLICK_PRESS, INT32_MAX, INT32_MIN, 0, 0, button, 0),
+        (EVENT_SCROLL, 0, 0, INT16_MIN, INT16_MAX, NO_NAME, 2**62),
+        (EVENT_SCROLL, 0, 0, INT16_MAX, INT16_MIN, NO_NAME, 1),
+        (EVENT_KEY_PRESS, INT32_MIN, INT32_MAX, 0, 0, key, 2**63 - 1),
+        (EVENT_KEY_RELEASE, 0, 0, 0, 0, key, 2**63 - 1),
+        (EVENT_CLICK_RELEASE, INT32_MAX, INT32_MIN, 0, 0, button, 2**63 - 1),
+    )
+    for row in rows:
+        buffer.append(*row)
+    return buffer
+
+
+def columns_of(source, count=None):
+    """Colunas como listas (EventBuffer tem capacidade maior que o número de eventos)"""
+    count = len(source) if count is None else count
+    return {field: list(getattr(source, field)[:count]) for field in FIELDS}
+
+
+def rows_to_columns(rows):
+    """Linhas de decode_events convertidas para o formato de columns_of"""
+    return {field: list(values) for field, values in zip(FIELDS, zip(*rows))}
+
+
+class TestVarint(unittest.TestCase):
+    """Zigzag e varint nos extremos de 64 bits"""
+
+    VALUES = (0, 1, -1, 2, -2, 63, -64, 64, -65, 127, 128, 2**31 - 1, -2**31, 2**32,
+              2**63 - 1, -2**63, 2**64 - 1, -(2**64))
+
+    def test_zigzag_round_trip(self):
+        for value in self.VALUES:
+            self.assertGreaterEqual(zigzag(value), 0)
+            self.assertEqual(unzigzag(zigzag(value)), value)
+
+    def test_zigzag_order(self):
+        self.assertEqual([zigzag(value) for value in (0, -1, 1, -2, 2)], [0, 1, 2, 3, 4])
+
+    def test_varint_round_trip(self):
+        out = bytearray()
+        for value in self.VALUES:
+            write_varint(out, zigzag(value))
+        pos = 0
+        for value in self.VALUES:
+            encoded, pos = read_varint(out, pos)
+            self.assertEqual(unzigzag(encoded), value)
+        self.assertEqual(pos, len(out))
+
+    def test_varint_truncated(self):
+        out = bytearray()
+        write_varint(out, 2**40)
+        with self.assertRaises(IndexError):
+            read_varint(bytes(out[:-1]), 0)
+
+
+class TestDeltaEncoding(unittest.TestCase):
+    """Reconstrução bit a bit das colunas por encode_events/decode_events"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.buffer = make_random_buffer(20_000)
+        cls.encoded = b"".join(encode_events(cls.buffer))
+
+    def assert_decodes(self, chunks, buffer, count=None):
+        rows = list(decode_events(chunks, len(buffer) if count is None else count))
+        self.assertEqual(rows_to_columns(rows), columns_of(buffer))
+
+    def test_round_trip_chunk_sizes(self):
+        for chunk_size in (7, 4096, len(self.encoded)):
+            with self.subTest(chunk_size=chunk_size):
+                chunks = (self.encoded[i:i + chunk_size] for i in range(0, len(self.encoded), chunk_size))
+                self.assert_decodes(chunks, self.buffer)
+
+    def test_split_at_every_byte(self):
+        # Cortes em todas as posições de um evento: blocos de 1 byte e cada divisão em dois blocos
+        buffer = make_random_buffer(300, seed=99)
+        encoded = b"".join(encode_events(buffer))
+        self.assert_decodes((encoded[i:i + 1] for i in range(len(encoded))), buffer)
+        for split in range(len(encoded) + 1):
+            self.assert_decodes([encoded[:split], encoded[split:]], buffer)
+
+    def test_encoder_chunk_boundaries(self):
+        # O estado do codificador atravessa os blocos, inclusive de um evento só
+        for chunk_events in (1, 3, 4096):
+            with self.subTest(chunk_events=chunk_events):
+                encoded = b"".join(encode_events(self.buffer, chunk_events=chunk_events))
+                self.assertEqual(encoded, self.encoded)
+
+    def test_partial_range(self):
+        encoded = b"".join(encode_events(self.buffer, 0, 500))
+        rows = list(decode_events([encoded], 500))
+        self.assertEqual(rows_to_columns(rows), columns_of(self.buffer, 500))
+
+    def test_extreme_values(self):
+        buffer = make_extreme_buffer()
+        encoded = b"".join(encode_events(buffer))
+        self.assert_decodes([encoded], buffer)
+        self.assert_decodes((encoded[i:i + 1] for i in range(len(encoded))), buffer)
+
+    def test_truncated_stream_rejected(self):
+        buffer = make_random_buffer(200, seed=7)
+        encoded = b"".join(encode_events(buffer))
+        for cut in range(len(encoded)):
+            with self.assertRaises(ValueError):
+                list(decode_events([encoded[:cut]], len(buffer)))
+
+    def test_truncated_mid_event_without_count(self):
+        buffer = make_extreme_buffer()
+        encoded = b"".join(encode_events(buffer))
+        with self.assertRaises(ValueError):
+            list(decode_events([encoded[:-1]]))
+
+    def test_empty_stream(self):
+        self.assertEqual(b"".join(encode_events(EventBuffer())), b"")
+        self.assertEqual(list(decode_events([], 0)), [])
+
+
+class TestBinaryRecordingFile(unittest.TestCase):
+    """Arquivos .mrec com colunas de largura fixa (mapeados via mmap)"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, buffer, filename="gravacao.mrec", delta=False):
+        path = os.path.join(self.directory.name, filename)
+        write_recording(path, {"name": "binario", "total_events": len(buffer), "events": buffer}, delta=delta)
+        return path
+
+    def read_events(self, path):
+        events = read_recording(path)["events"]
+        self.addCleanup(events.close)
+        return events
+
+    def test_round_trip_all_event_types(self):
+        buffer = make_random_buffer(3000, seed=21)
+        events = self.read_events(self.write(buffer))
+        self.assertEqual(set(events.types[:len(events)]), set(EVENT_TYPE_NAMES))
+        self.assertEqual(events.names, buffer.names)
+        self.assertEqual(columns_of(events), columns_of(buffer))
+        self.assertEqual(events.to_events(), buffer.to_events())
+
+    def test_round_trip_extreme_values(self):
+        buffer = make_extreme_buffer()
+        self.assertEqual(columns_of(self.read_events(self.write(buffer))), columns_of(buffer))
+
+    def test_names_are_interned(self):
+        # Cada nome aparece uma vez na tabela, por mais eventos que o usem
+        events = [{"type": "key_press", "key": "a", "timestamp": i * 0.001} for i in range(500)]
+        events += [{"type": "click", "x": 1, "y": 2, "button": "Button.left", "action": "press",
+                    "timestamp": 1.0}]
+        path = os.path.join(self.directory.name, "nomes.mrec")
+        write_recording(path, {"name": "nomes", "events": events})
+        view = self.read_events(path)
+        self.assertEqual(view.names, ["a", "Button.left"])
+        self.assertEqual([event.get("key", event.get("button")) for event in view.to_events()],
+                         ["a"] * 500 + ["Button.left"])
+
+    def test_verify_accepts_valid_file(self):
+        buffer = EventBuffer.from_events(make_recording("binario")["events"])
+        self.read_events(self.write(buffer)).verify()
+
+    def test_truncated_file_rejected(self):
+        path = self.write(make_random_buffer(1000, seed=3))
+        with open(path, 'r+b') as f:
+            f.seek(-10, os.SEEK_END)
+            f.truncate()
+        with self.assertRaises(ValueError):
+            read_recording(path)
+
+    def test_verify_rejects_corrupt_columns(self):
+        buffer = EventBuffer.from_events(make_recording("binario")["events"])
+        count = len(buffer)
+        # A coluna de tipos (1 byte) é a última do arquivo; a de nomes (2 bytes) vem antes dela
+        corruptions = {
+            "tipo": (-1, b"\x63"),
+            "nome": (-count - 2 * count, (len(buffer.names) + 5).to_bytes(2, "little", signed=True)),
+        }
+        for label, (offset, value) in corruptions.items():
+            with self.subTest(corruption=label):
+                path = self.write(buffer, f"corrompido_{label}.mrec")
+                with open(path, 'r+b') as f:
+                    f.seek(offset, os.SEEK_END)
+                    f.write(value)
+                with self.assertRaises(ValueError):
+                    self.read_events(path).verify()
+
+    def test_scroll_out_of_int16_range_rejected(self):
+        buffer = EventBuffer()
+        buffer.append(EVENT_SCROLL, 0, 0, 0, INT16_MAX + 1, NO_NAME, 0)
+        for delta in (False, True):
+            with self.subTest(delta=delta):
+                with self.assertRaises(ValueError):
+                    self.write(buffer, delta=delta)
+                self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_too_many_names_rejected(self):
+        buffer = EventBuffer()
+        for i in range(INT16_MAX + 2):
+            buffer.append(EVENT_KEY_PRESS, 0, 0, 0, 0, buffer.intern(f"k{i}"), i)
+        for delta in (False, True):
+            with self.subTest(delta=delta):
+                with self.assertRaises(ValueError):
+                    self.write(buffer, delta=delta)
+                self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class TestCompressedRecordingFile(unittest.TestCase):
+    """Gravações comprimidas em fluxo (zlib/gzip e lzma/xz), binárias e JSON"""
+
+    CODECS = ("zlib", "lzma")
+    FILENAMES = ("comprimido.mrec", "comprimido.json")
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.buffer = make_random_buffer(3000, seed=8)
+
+    def write(self, filename, compression):
+        path = os.path.join(self.directory.name, f"{compression}_{filename}")
+        write_recording(path, {"name": "comprimido", "events": self.buffer}, compression)
+        return path
+
+    def test_round_trip_each_codec(self):
+        for compression in self.CODECS:
+            for filename in self.FILENAMES:
+                with self.subTest(compression=compression, filename=filename):
+                    path = self.write(filename, compression)
+                    self.assertEqual(detect_compression(path), compression)
+                    loaded = read_recording(path)
+                    events = loaded["events"]
+                    if isinstance(events, list):
+                        self.assertEqual(events, self.buffer.to_events())
+                    else:
+                        self.addCleanup(events.close)
+                        self.assertEqual(columns_of(events), columns_of(self.buffer))
+                    self.assertEqual(loaded["name"], "comprimido")
+                    self.assertEqual(sum(read_recording_summary(path)["event_counts"].values()),
+                                     len(self.buffer))
+
+    def test_truncated_stream_raises_value_error(self):
+        for compression in self.CODECS:
+            for filename in self.FILENAMES:
+                with self.subTest(compression=compression, filename=filename):
+                    path = self.write(filename, compression)
+                    with open(path, 'r+b') as f:
+                        f.truncate(os.path.getsize(path) // 2)
+                    with self.assertRaises(ValueError):
+                        read_recording(path)
+                    with self.assertRaises(ValueError):
+                        read_recording_summary(path)
+
+    def test_corrupt_stream_raises_value_error(self):
+        for compression in self.CODECS:
+            with self.subTest(compression=compression):
+                path = self.write("comprimido.mrec", compression)
+                with open(path, 'r+b') as f:
+                    f.seek(os.path.getsize(path) // 2)
+                    f.write(b"\xff" * 64)
+                with self.assertRaises(ValueError):
+                    read_recording(path)
+
+
+class TestDeltaRecordingFile(unittest.TestCase):
+    """Arquivos .mrec com eventos em delta/varint, com e sem compressão"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def assert_file_round_trip(self, buffer, compression):
+        path = os.path.join(self.directory.name, f"delta_{compression}.mrec")
+        write_recording(path, {"name": "delta", "total_events": len(buffer), "events": buffer},
+                        compression, delta=True)
+        loaded = read_recording(path)
+        events = loaded["events"]
+        self.addCleanup(events.close)
+        self.assertEqual(loaded["name"], "delta")
+        self.assertEqual(events.names, buffer.names)
+        self.assertEqual(columns_of(events), columns_of(buffer))
+
+    def test_file_round_trip(self):
+        buffer = make_random_buffer(5000)
+        for compression in (None, "zlib", "lzma"):
+            with self.subTest(compression=compression):
+                self.assert_file_round_trip(buffer, compression)
+
+    def test_file_extreme_values(self):
+        self.assert_file_round_trip(make_extreme_buffer(), None)
+
+    def test_matches_plain_binary(self):
+        buffer = make_random_buffer(2000, seed=5)
+        plain_path = os.path.join(self.directory.name, "plain.mrec")
+        delta_path = os.path.join(self.directory.name, "delta.mrec")
+        write_recording(plain_path, {"name": "plain", "events": buffer})
+        write_recording(delta_path, {"name": "delta", "events": buffer}, delta=True)
+        plain = read_recording(plain_path)["events"]
+        delta = read_recording(delta_path)["events"]
+        self.addCleanup(plain.close)
+        self.addCleanup(delta.close)
+        self.assertEqual(delta.to_events(), plain.to_events())
+
+    def test_truncated_file_rejected(self):
+        buffer = make_random_buffer(2000, seed=11)
+        path = os.path.join(self.directory.name, "truncated.mrec")
+        write_recording(path, {"name": "truncated", "events": buffer}, delta=True)
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-3])
+        with self.assertRaises(ValueError):
+            read_recording(path)
+
+
+class TestCaptureClock(unittest.TestCase):
+    """Timestamps da captura vêm só do relógio monotônico (perf_counter_ns)"""
+
+    STEP_NS = 10_000_000
+    SAMPLES = 20
+
+    def record_with_clock(self, queued_capture: bool) -> EventBuffer:
+        """
+        Grava movimentos pelos callbacks do listener com perf_counter_ns controlado
+        pelo teste, enquanto o relógio de parede salta 1 hora para trás no meio
+        """
+        clock = [10**12]
+        wall = [1_700_000_000.0]
+
+        def wall_time():
+            return wall[0]
+
+        with mock.patch("time.perf_counter_ns", lambda: clock[0]), mock.patch("time.time", wall_time):
+            session = RecordingSession(queued_capture=queued_capture, backend=FakeBackend())
+            session.start_recording(record_mouse=True, record_keyboard=False)
+            listener = session.mouse_listener
+            for i in range(self.SAMPLES):
+                clock[0] += self.STEP_NS
+                if i == self.SAMPLES // 2:
+                    wall[0] -= 3600.0
+                listener.inject({"type": "move", "x": i, "y": i})
+            session.stop_recording()
+        return session.collect_events()
+
+    def assert_timestamps(self, events: EventBuffer):
+        timestamps = list(events.timestamps_ns[:len(events)])
+        self.assertEqual(timestamps, [(i + 1) * self.STEP_NS for i in range(self.SAMPLES)])
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_queued_capture_ignores_wall_clock(self):
+        self.assert_timestamps(self.record_with_clock(queued_capture=True))
+
+    def test_direct_capture_ignores_wall_clock(self):
+        self.assert_timestamps(self.record_with_clock(queued_capture=False))
+
+    def test_out_of_order_pushes_are_saved_in_order(self):
+        # Mouse e teclado leem o relógio em threads distintas: o teclado pode
+        # enfileirar depois um instante anterior ao do mouse
+        clock = [10**12]
+        with mock.patch("time.perf_counter_ns", lambda: clock[0]):
+            session = RecordingSession(queued_capture=True, backend=FakeBackend())
+            session.start_recording(record_mouse=True, record_keyboard=True)
+            clock[0] += 2000
+            session._push_mouse_move(1, 1)
+            clock[0] -= 1000
+            session._push_key_press("a")
+            clock[0] += 5000
+            session._push_key_release("a")
+            session.stop_recording()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "gravacao.mrec")
+            write_recording(path, session.to_dict("ordem"))
+            data = read_recording(path)
+            validate_recording(data)
+            timestamps = list(data["events"].timestamps_ns[:len(data["events"])])
+            data["events"].close()
+        self.assertEqual(timestamps, [2000, 2000, 6000])
+
+
+class TestStopRecording(unittest.TestCase):
+    """Callbacks que chegam durante ou depois de stop_recording"""
+
+    def test_late_callbacks_are_ignored(self):
+        session = RecordingSession(queued_capture=True, backend=FakeBackend())
+        session.start_recording(record_mouse=True, record_keyboard=True)
+        session._push_mouse_move(1, 1)
+        session._push_key_press("a")
+        session.stop_recording()
+
+        # Callback atrasado de um listener já parado: sem erro e sem evento novo
+        session._push_mouse_move(2, 2)
+        session._push_mouse_click(2, 2, "left", True)
+        session._push_key_release("a")
+        self.assertEqual(session.get_event_count(), 2)
+
+    def test_disabled_device_is_not_recorded(self):
+        session = RecordingSession(queued_capture=True, backend=FakeBackend())
+        session.start_recording(record_mouse=False, record_keyboard=True)
+        session._push_mouse_move(1, 1)
+        session._push_mouse_scroll(1, 1, 0, 1)
+        session._push_key_press("a")
+        session.stop_recording()
+        self.assertEqual([event["type"] for event in session.collect_events()], ["key_press"])
+
+
+    def test_playback_hotkeys_are_recorded(self):
+        session = RecordingSession(queued_capture=True, backend=FakeBackend())
+        session.start_recording(record_mouse=False, record_keyboard=True)
+        for key in ("f9", "f8", "f6", "f7", "esc"):
+            session._push_key_press(key)
+        session.stop_recording()
+        self.assertEqual([event["key"] for event in session.collect_events()], ["f8", "f6", "f7"])
+
+
+class TestRecordingJournal(unittest.TestCase):
+    """Journal da gravação em streaming e recuperação após travamento"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def record(self, total_events: int, saved_as: str) -> RecordingSession:
+        session = RecordingSession(journal_dir=self.tmp.name, sync_events=1, backend=FakeBackend())
+        session.start_recording(record_mouse=True, record_keyboard=False)
+        for i in range(total_events):
+            session.mouse_listener.inject({"type": "move", "x": i, "y": i})
+        session.stop_recording(saved_as=saved_as)
+        return session
+
+    def test_journal_forces_queued_capture(self):
+        # Com journal o fsync roda na consumidora, nunca na thread do listener
+        sync_threads = []
+        original_sync = RecordingJournal.sync
+
+        def sync(journal):
+            sync_threads.append(threading.current_thread())
+            original_sync(journal)
+
+        session = RecordingSession(queued_capture=False, journal_dir=self.tmp.name,
+                                   sync_events=1, backend=FakeBackend())
+        self.assertTrue(session.queued_capture)
+        with mock.patch.object(RecordingJournal, "sync", sync):
+            session.start_recording(record_mouse=True, record_keyboard=False)
+            hook_thread = threading.Thread(target=lambda: [
+                session.mouse_listener.inject({"type": "move", "x": i, "y": i}) for i in range(10)
+            ])
+            hook_thread.start()
+            hook_thread.join()
+            session.stop_recording()
+        self.assertTrue(sync_threads)
+        self.assertNotIn(hook_thread, sync_threads)
+        self.assertEqual(session.get_event_count(), 10)
+
+    def test_truncated_journal_is_recovered(self):
+        # Travamento no meio da escrita: sem encerramento e com a última linha cortada
+        buffer = EventBuffer()
+        for i in range(20):
+            buffer.append(EVENT_MOVE, i, i, 0, 0, NO_NAME, (i + 1) * 1000)
+        journal = RecordingJournal(RecordingJournal.new_path(self.tmp.name))
+        journal.open({"record_mouse": True})
+        journal.write_events(buffer)
+        journal.sync()
+        journal._file.close()
+        with open(journal.path, 'r+b') as f:
+            f.seek(-5, os.SEEK_END)
+            f.truncate()
+
+        journals = RecordingJournal.find_unfinished(self.tmp.name)
+        self.assertEqual([j.path for j in journals], [journal.path])
+        self.assertFalse(journals[0].is_finished())
+        data = journals[0].recover()
+        self.assertTrue(data["recovered"])
+        self.assertEqual(data["total_events"], 19)
+        self.assertEqual([(event["x"], event["y"]) for event in data["events"]],
+                         [(i, i) for i in range(19)])
+
+    def test_finished_journal_with_saved_recording_is_removed(self):
+        saved_as = os.path.join(self.tmp.name, "auto_save.mrec")
+        session = self.record(5, saved_as=saved_as)
+        write_recording(saved_as, session.to_dict("salva"))
+
+        self.assertEqual(RecordingJournal.find_unfinished(self.tmp.name), [])
+        self.assertFalse(os.path.exists(session.journal.path))
+
+    def test_finished_journal_without_saved_recording_is_recovered(self):
+        # Travamento entre fechar o journal e concluir o auto-save
+        session = self.record(5, saved_as=os.path.join(self.tmp.name, "auto_save.mrec"))
+
+        journals = RecordingJournal.find_unfinished(self.tmp.name)
+        self.assertEqual([journal.path for journal in journals], [session.journal.path])
+        self.assertTrue(journals[0].is_finished())
+        self.assertEqual(journals[0].recover()["total_events"], 5)
+
+
+class TestPlaybackTimingMetrics(unittest.TestCase):
+    """Relatórios de timing gravados em lote em performance_metrics.json"""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_timing_is_saved_on_flush_with_null_open_bucket(self):
+        monitor = PerformanceMonitor()
+        report = {"repetition": 1, "p50": 0.001, "p95": 0.002, "p99": 0.003, "max": 0.004,
+                  "drift": 0.0, "skipped": 0, "buckets": [(0.001, 3), (float("inf"), 1)]}
+        monitor.record_playback_timing(report)
+        monitor.record_playback_timing(dict(report, repetition=2))
+        self.assertFalse(os.path.exists("performance_metrics.json"))
+
+        monitor.flush()
+        with open("performance_metrics.json", encoding="utf-8") as f:
+            text = f.read()
+        self.assertNotIn("Infinity", text)
+        saved = PerformanceMonitor().metrics
+        self.assertEqual(len(saved["playback_timing_log"]), 2)
+        self.assertEqual(saved["last_playback_buckets"], [[0.001, 3], [None, 1]])
+        self.assertIn("> 10s", PerformanceMonitor().get_performance_report())
+
+
+class TestLoopPlayback(unittest.TestCase):
+    """Modo loop com gravações de duração zero"""
+
+    def test_zero_length_loop_waits_between_passes(self):
+        events = [{"type": "move", "x": 1, "y": 1, "timestamp": 0.0}]
+        session = PlaybackSession(events, 1.0, backend=FakeBackend())
+        reports = []
+        session.play(loop=True, loop_gap=0.0, callback_timing=reports.append)
+        time.sleep(0.3)
+        session.stop()
+        session.playback_thread.join(1.0)
+        self.assertLessEqual(len(reports), 0.3 / PlaybackSession.MIN_LOOP_PERIOD + 2)
+
+    def test_loop_without_events_is_rejected(self):
+        session = PlaybackSession([], 1.0, backend=FakeBackend())
+        with self.assertRaises(ValueError):
+            session.play(loop=True)
+
+
+class SlowFakeBackend(FakeBackend):
+    """FakeBackend em que cada movimento custa um tempo fixo (reprodução que se atrasa)"""
+
+    def __init__(self, move_cost: float):
+        super().__init__()
+        self.move_cost = move_cost
+
+    def record(self, operation, value):
+        if operation == "move":
+            time.sleep(self.move_cost)
+        super().record(operation, value)
+
+
+class TestCatchUp(unittest.TestCase):
+    """Recuperação de atraso: só movimentos vencidos são pulados"""
+
+    def make_events(self, moves: int = 200, interval: float = 0.001):
+        events = []
+        for i in range(moves):
+            timestamp = i * interval
+            events.append({"type": "move", "x": i, "y": 2 * i, "timestamp": timestamp})
+            if i % 40 == 39:
+                events.append({"type": "click", "x": i + 1, "y": 0, "button": "left",
+                               "action": "press", "timestamp": timestamp})
+                events.append({"type": "click", "x": i + 1, "y": 0, "button": "left",
+                               "action": "release", "timestamp": timestamp})
+                events.append({"type": "scroll", "x": i + 1, "y": 0, "dx": 0, "dy": -1, "timestamp": timestamp})
+                events.append({"type": "key_press", "key": "a", "timestamp": timestamp})
+                events.append({"type": "key_release", "key": "a", "timestamp": timestamp})
+        # A gravação termina com ações seguidas de um último movimento (posição final)
+        events.append({"type": "move", "x": 1000, "y": 500, "timestamp": moves * interval})
+        return events
+
+    def play(self, events, backend, **options):
+        session = PlaybackSession(events, backend=backend, **options)
+        session.play(repetitions=1)
+        session.playback_thread.join(10.0)
+        return session
+
+    def test_late_moves_are_skipped_but_actions_are_not(self):
+        events = self.make_events()
+        reference = FakeBackend()
+        self.play(events, reference, speed_multiplier=1e9)
+
+        slow = SlowFakeBackend(0.003)
+        session = self.play(events, slow, catch_up_threshold=0.01)
+
+        def actions(backend):
+            return [(op, value) for _, op, value in backend.operations if op != "move"]
+
+        def moves(backend):
+            return [value for _, op, value in backend.operations if op == "move"]
+
+        def action_positions(backend):
+            # Posição aplicada logo antes de cada clique (parte da ação, nunca pulada)
+            operations = backend.operations
+            return [operations[i - 1][2] for i in range(1, len(operations)) if operations[i][1] == "press"]
+
+        self.assertGreater(session.skipped_moves, 0)
+        self.assertLess(len(moves(slow)), len(moves(reference)))
+        self.assertEqual(actions(slow), actions(reference))
+        self.assertEqual(action_positions(slow), [(i + 1, 0) for i in range(39, 200, 40)])
+        self.assertEqual(moves(slow)[-1], moves(reference)[-1])
+        self.assertEqual(moves(slow)[-1], (1000, 500))
+
+    def test_no_moves_skipped_without_threshold(self):
+        session = self.play(self.make_events(moves=40), SlowFakeBackend(0.002))
+        self.assertEqual(session.skipped_moves, 0)
+
+
+class TestBuildPasses(unittest.TestCase):
+    """Trechos da gravação convertidos em passadas sobre o programa"""
+
+    OFFSETS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+
+    def test_whole_recording_without_segments(self):
+        self.assertEqual(build_passes(self.OFFSETS, None, 1.0, 0.5), [(0, 6, 0.0, 0.5, None)])
+        self.assertEqual(build_passes(self.OFFSETS, [], 2.0, 1.0), [(0, 6, 0.0, 0.5, None)])
+
+    def test_segment_includes_events_on_both_boundaries(self):
+        passes = build_passes(self.OFFSETS, [{"name": "meio", "start": 0.1, "end": 0.3}], 1.0, 0.5)
+        self.assertEqual(len(passes), 1)
+        first, stop, base, length, name = passes[0]
+        self.assertEqual((first, stop, name), (1, 4, "meio"))
+        self.assertAlmostEqual(base, 0.1)
+        self.assertAlmostEqual(length, 0.2)
+
+    def test_segment_times_follow_speed(self):
+        # Trechos em segundos da gravação; os prazos já estão divididos pela velocidade
+        passes = build_passes(self.OFFSETS, [{"start": 0.4, "end": 0.8}], 2.0, 1.0)
+        first, stop, base, length, _ = passes[0]
+        self.assertEqual((first, stop), (2, 5))
+        self.assertAlmostEqual(base, 0.2)
+        self.assertAlmostEqual(length, 0.2)
+
+    def test_segments_are_clamped_skipped_and_repeated(self):
+        segments = [
+            {"name": "tudo", "start": -1.0, "end": 99.0},
+            {"name": "vazio", "start": 0.3, "end": 0.3},
+            {"name": "fim", "start": 0.45, "repetitions": 3},
+        ]
+        passes = build_passes(self.OFFSETS, segments, 1.0, 0.5)
+        self.assertEqual([p[4] for p in passes], ["tudo", "fim", "fim", "fim"])
+        self.assertEqual(passes[0][:3], (0, 6, 0.0))
+        self.assertEqual(passes[1][:2], (5, 6))
+
+
+class TestPlaylistPlayer(unittest.TestCase):
+    """Encadeamento dos itens com pré-carregamento do próximo"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_items(self, count: int, seconds: float = 0.1):
+        items = []
+        for index in range(count):
+            events = [{"type": "move", "x": index, "y": i, "timestamp": seconds * i / 10} for i in range(11)]
+            path = os.path.join(self.tmp.name, f"item_{index}.mrec")
+            write_recording(path, {"name": f"item_{index}", "events": events})
+            items.append(make_playlist_item(path))
+        return items
+
+    def play(self, player, **callbacks):
+        # Registra cada preparação e se o item anterior ainda tocava nesse momento
+        prepared = []
+        original_prepare = player._prepare
+
+        def prepare(item):
+            previous = player.current_session
+            session, segments = original_prepare(item)
+            prepared.append((item["path"], previous is not None and previous.is_playing, session))
+            return session, segments
+
+        player._prepare = prepare
+        player.play(**callbacks)
+        player.player_thread.join(10.0)
+        return prepared
+
+    def test_moves_on_to_preloaded_next_item(self):
+        items = self.make_items(3)
+        backend = FakeBackend()
+        started = []
+        player = PlaylistPlayer(items, backend=backend)
+        prepared = self.play(player, callback_item=lambda index, item, session: started.append((index, session)))
+
+        self.assertEqual([index for index, _ in started], [0, 1, 2])
+        self.assertEqual([path for path, _, _ in prepared], [item["path"] for item in items])
+        # O próximo item é preparado enquanto o anterior ainda toca, e é essa sessão que toca
+        self.assertEqual([playing for _, playing, _ in prepared], [False, True, True])
+        self.assertEqual([session for _, session in started], [session for _, _, session in prepared])
+        self.assertEqual(len(player.transition_gaps), 2)
+        self.assertEqual([value for _, op, value in backend.operations if op == "move"][-1], (2, 10))
+
+    def test_recordings_are_closed(self):
+        player = PlaylistPlayer(self.make_items(3), backend=FakeBackend())
+        prepared = self.play(player)
+        self.assertEqual(len(prepared), 3)
+        for _, _, session in prepared:
+            self.assertIsNone(session.events._mmap)
+
+    def test_stop_closes_preloaded_item(self):
+        player = PlaylistPlayer(self.make_items(3, seconds=0.5), backend=FakeBackend())
+        prepared = self.play(player, callback_item=lambda index, item, session: player.stop())
+        self.assertEqual(len(prepared), 2)
+        for _, _, session in prepared:
+            self.assertIsNone(session.events._mmap)
+
+
+class TestCursorPositions(unittest.TestCase):
+    """Eliminação de movimentos redundantes e posição do cursor nos saltos"""
+
+    PROGRAM = [
+        (OP_MOVE, 0.0, (5, 5), None),
+        (OP_MOVE, 0.1, (5, 5), None),
+        (OP_BUTTON_PRESS, 0.2, (5, 5), "left"),
+        (OP_MOVE, 0.3, (5, 5), None),
+        (OP_BUTTON_PRESS, 0.4, (6, 6), "left"),
+    ]
+
+    def test_clicks_in_place_skip_position(self):
+        elided_program, elided = elide_redundant_positions(self.PROGRAM)
+        self.assertEqual(elided, 3)
+        self.assertEqual(elided_program, [self.PROGRAM[0], (OP_BUTTON_PRESS, 0.2, None, "left"), self.PROGRAM[4]])
+        checkpoints = position_checkpoints(elided_program)
+        self.assertEqual(cursor_position_at(elided_program, checkpoints, 2), (5, 5))
+
+    def test_clicks_keep_explicit_position_when_asked(self):
+        elided_program, elided = elide_redundant_positions(self.PROGRAM, keep_action_positions=True)
+        self.assertEqual(elided, 2)
+        self.assertEqual(elided_program, [self.PROGRAM[0], self.PROGRAM[2], self.PROGRAM[4]])
+
+    def test_checkpoints_match_full_scan(self):
+        rng = random.Random(3)
+        program = []
+        for index in range(1000):
+            if rng.random() < 0.2:
+                program.append((OP_KEY_PRESS, index * 0.001, "a", None))
+            else:
+                program.append((OP_MOVE, index * 0.001, (rng.randrange(100), rng.randrange(100)), None))
+
+        checkpoints = position_checkpoints(program, interval=64)
+        for index in range(len(program) + 1):
+            expected = None
+            for instruction in program[:index]:
+                if instruction[0] in POSITIONED_OPCODES:
+                    expected = instruction[2]
+            self.assertEqual(cursor_position_at(program, checkpoints, index, interval=64), expected)
+
+
+class TestCompileProgram(unittest.TestCase):
+    """Eventos malformados são pulados e contados, sem abortar a reprodução"""
+
+    def test_malformed_events_are_counted(self):
+        events = [
+            {"type": "move", "x": 1, "y": 1, "timestamp": 0.0},
+            {"type": "click", "x": 1, "timestamp": 0.1},
+            {"type": "bogus", "timestamp": 0.2},
+            {"type": "key_press", "key": "a", "timestamp": 0.3},
+            {"type": "move", "x": 2, "y": 2, "timestamp": None},
+        ]
+        session = PlaybackSession(events, 1.0, backend=FakeBackend())
+        self.assertEqual(session.skipped_events, 3)
+        self.assertEqual([instruction[0] for instruction in session.program], [OP_MOVE, OP_KEY_PRESS])
+        self.assertAlmostEqual(session.get_duration(), 0.3)
+
+
+class TestInjectedHotkeys(unittest.TestCase):
+    """Teclas de hotkey tocadas pela própria reprodução não a controlam"""
+
+    def test_played_keys_are_recognized_once(self):
+        events = [
+            {"type": "key_press", "key": "f8", "timestamp": 0.0},
+            {"type": "key_release", "key": "f8", "timestamp": 0.01},
+        ]
+        session = PlaybackSession(events, 1.0, backend=FakeBackend())
+        session.play()
+        session.playback_thread.join(1.0)
+        self.assertFalse(session.is_injected_key("f6"))
+        self.assertTrue(session.is_injected_key("f8"))
+        # Um F8 seguinte é do usuário
+        self.assertFalse(session.is_injected_key("f8"))
+
+    def test_hotkey_listener_ignores_played_f8(self):
+        session = PlaybackSession([{"type": "key_press", "key": "f8", "timestamp": 0.0}], 1.0,
+                                  backend=FakeBackend())
+        session.play()
+        session.playback_thread.join(1.0)
+        app = SimpleNamespace(input_backend=FakeBackend(), playlist_player=None, playback_session=session,
+                              is_playing=True, update_queue=queue.Queue())
+        MouseRecorder.on_key_press(app, "f8")
+        self.assertTrue(app.update_queue.empty())
+        MouseRecorder.on_key_press(app, "f8")
+        self.assertEqual(app.update_queue.get_nowait(), ('hotkey', 'pause'))
+
+    def test_old_injection_expires(self):
+        session = PlaybackSession([{"type": "key_press", "key": "f8", "timestamp": 0.0}], 1.0,
+                                  backend=FakeBackend())
+        session.play()
+        session.playback_thread.join(1.0)
+        with mock.patch("time.perf_counter", lambda: float("inf")):
+            self.assertFalse(session.is_injected_key("f8"))
+
+
+def make_recording(name: str, keys=("a",), moves: int = 3) -> dict:
+    """Gravação pequena com movimentos, um clique, scroll e as teclas informadas"""
+    events = [{"type": "move", "x": i, "y": i, "timestamp": i * 0.01} for i in range(moves)]
+    timestamp = moves * 0.01
+    events.append({"type": "click", "x": 1, "y": 1, "button": "left", "action": "press", "timestamp": timestamp})
+    events.append({"type": "scroll", "x": 1, "y": 1, "dx": 0, "dy": -1, "timestamp": timestamp})
+    for key in keys:
+        events.append({"type": "key_press", "key": key, "timestamp": timestamp})
+        events.append({"type": "key_release", "key": key, "timestamp": timestamp})
+    return {"name": name, "duration": timestamp, "created_at": "2026-01-01T00:00:00", "events": events}
+
+
+class TestRecordingLibrary(unittest.TestCase):
+    """Catálogo SQLite: atualização incremental, resumo sem carregar eventos e consultas"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.library = RecordingLibrary(self.dir)
+
+    def tearDown(self):
+        self.library.close()
+        self.tmp.cleanup()
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.dir, filename)
+
+    def test_summary_of_every_format(self):
+        data = make_recording("Resumo", keys=("a", "b"))
+        variants = {"plano.mrec": {}, "delta.mrec": {"delta": True}, "zlib.mrec": {"compression": "zlib"},
+                    "lzma.mrec": {"compression": "lzma"}, "export.json": {}, "export_gz.json": {"compression": "zlib"}}
+        for filename, options in variants.items():
+            with self.subTest(filename=filename):
+                write_recording(self.path(filename), data, **options)
+                summary = read_recording_summary(self.path(filename))
+                self.assertEqual(summary["name"], "Resumo")
+                self.assertEqual(summary["total_events"], 9)
+                self.assertEqual(summary["event_counts"],
+                                 {"move": 3, "click": 1, "scroll": 1, "key_press": 2, "key_release": 2})
+                self.assertEqual(summary["keys"], {"a", "b"})
+
+    def test_legacy_json_with_metadata_after_events(self):
+        with open(self.path("antigo.json"), "w", encoding="utf-8") as f:
+            f.write('{"events": [{"type": "key_press", "key": "x", "timestamp": 0.0}], "name": "Antigo"}')
+        summary = read_recording_summary(self.path("antigo.json"))
+        self.assertEqual((summary["name"], summary["total_events"], summary["keys"]), ("Antigo", 1, {"x"}))
+
+    def test_incremental_sync(self):
+        write_recording(self.path("um.mrec"), make_recording("Um"))
+        write_recording(self.path("dois.mrec"), make_recording("Dois", keys=("b",)))
+        self.assertEqual(self.library.sync(), (2, 0))
+        self.assertEqual(self.library.sync(), (0, 0))
+
+        write_recording(self.path("um.mrec"), make_recording("Um", keys=("z",), moves=10))
+        stats = os.stat(self.path("um.mrec"))
+        os.utime(self.path("um.mrec"), ns=(stats.st_atime_ns, stats.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.library.sync(), (1, 0))
+        self.assertEqual(self.library.keys_of(self.path("um.mrec")), ["z"])
+        self.assertEqual(self.library.query(name="um")[0]["event_counts"]["move"], 10)
+
+        os.remove(self.path("dois.mrec"))
+        self.assertEqual(self.library.sync(), (0, 1))
+        self.assertEqual([row["name"] for row in self.library.query()], ["Um"])
+
+    def test_corrupt_file_is_invalid(self):
+        with open(self.path("quebrado.mrec"), "wb") as f:
+            f.write(b"MREC\x01")
+        self.assertEqual(self.library.sync(), (1, 0))
+        self.assertEqual(self.library.query(), [])
+
+    def test_queries(self):
+        write_recording(self.path("a.mrec"), make_recording("100% certo", keys=("a",)))
+        write_recording(self.path("b.mrec"), make_recording("1000 certo", keys=("a", "b"), moves=20))
+        write_recording(self.path("c.mrec"), make_recording("x_y", keys=()))
+        self.library.sync()
+
+        def names(**filters):
+            return sorted(row["name"] for row in self.library.query(**filters))
+
+        self.assertEqual(names(name="100%"), ["100% certo"])
+        self.assertEqual(names(name="x_y"), ["x_y"])
+        self.assertEqual(names(name="_"), ["x_y"])
+        self.assertEqual(names(keys=["a", "b"]), ["1000 certo"])
+        self.assertEqual(names(min_counts={"move": 10}), ["1000 certo"])
+        self.assertEqual(names(max_events=6), ["x_y"])
+        self.assertEqual(self.library.keys_used(), ["a", "b"])
+        with self.assertRaises(ValueError):
+            self.library.query(order_by="filename; DROP TABLE recordings")
+
+
+if __name__ == "__main__":
+    unittest.main()
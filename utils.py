@@ -4,12 +4,18 @@ Funções auxiliares e ferramentas de suporte
 """
 
 import json
+import math
 import os
+import time
 import datetime
-from typing import Dict, List, Any, Tuple
+import sqlite3
+from typing import Dict, List, Any, Optional, Tuple
 import tkinter as tk
 from tkinter import messagebox
 
+from recording_format import write_recording, compression_from_settings, BINARY_EXTENSION
+from recording_library import RecordingLibrary
+
 
 class RecordingAnalyzer:
     """
@@ -125,60 +131,70 @@ class RecordingAnalyzer:
 class FileManager:
     """
     Gerenciador de arquivos para gravações
-    Organiza e mantém histórico de gravações
+    Organiza e mantém histórico de gravações. Metadados, contagens e teclas de
+    cada arquivo ficam no catálogo SQLite (RecordingLibrary): listar e buscar
+    consultam o banco em vez de varrer o diretório
     """
     
-    def __init__(self, recordings_dir: str = "recordings"):
+    def __init__(self, recordings_dir: str = "recordings", compression: Optional[str] = None,
+                 delta: bool = False, settings=None):
+        """
+        Args:
+            recordings_dir: Diretório das gravações
+            compression: Compressão dos backups ("zlib", "lzma" ou None)
+            delta: Grava os eventos dos backups como deltas em varint
+            settings: Configurações (ex.: SettingsManager) consultadas a cada backup;
+                quando informadas, substituem compression e delta
+        """
         self.recordings_dir = recordings_dir
+        self.compression = compression
+        self.delta = delta
+        self.settings = settings
         self.ensure_directory()
+        self.library = RecordingLibrary(recordings_dir)
         
     def ensure_directory(self) -> None:
         """Garante que o diretório de gravações existe"""
         if not os.path.exists(self.recordings_dir):
             os.makedirs(self.recordings_dir)
             
-    def list_recordings(self) -> List[Dict[str, Any]]:
-        """Lista todas as gravações disponíveis"""
-        recordings = []
+    def sync_library(self) -> Tuple[int, int]:
+        """
+        Atualiza o catálogo com arquivos criados, alterados ou apagados por fora
+        da aplicação (só esses são lidos). Retorna (atualizados, removidos)
+        """
+        return self.library.sync()
         
+    def register_recording(self, filepath: str, recording_data: Optional[Dict[str, Any]] = None) -> None:
+        """Registra no catálogo um arquivo recém-salvo (com os dados salvos, o arquivo não é relido)"""
         try:
-            for filename in os.listdir(self.recordings_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(self.recordings_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            
-                        file_stats = os.stat(filepath)
-                        recordings.append({
-                            "filename": filename,
-                            "filepath": filepath,
-                            "name": data.get("name", filename),
-                            "duration": data.get("duration", 0),
-                            "total_events": data.get("total_events", 0),
-                            "created_at": data.get("created_at", ""),
-                            "file_size": file_stats.st_size,
-                            "modified_at": datetime.datetime.fromtimestamp(file_stats.st_mtime).isoformat()
-                        })
-                    except (json.JSONDecodeError, KeyError):
-                        # Ignora arquivos inválidos
-                        continue
-                        
-        except OSError:
-            pass
+            self.library.add(filepath, recording_data)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Erro ao registrar {os.path.basename(filepath)} na biblioteca: {e}")
             
-        # Ordena por data de modificação (mais recente primeiro)
-        recordings.sort(key=lambda x: x["modified_at"], reverse=True)
-        return recordings
+    def list_recordings(self) -> List[Dict[str, Any]]:
+        """Lista todas as gravações do catálogo (mais recente primeiro)"""
+        return self.library.query()
+        
+    def search_recordings(self, **filters) -> List[Dict[str, Any]]:
+        """Busca gravações no catálogo; filtros de RecordingLibrary.query"""
+        return self.library.query(**filters)
+        
+    def get_save_options(self) -> Tuple[Optional[str], bool]:
+        """Compressão e codificação delta dos backups (lidas das configurações atuais, se houver)"""
+        if self.settings is not None:
+            return compression_from_settings(self.settings), self.settings.get("delta_encoding", False)
+        return self.compression, self.delta
         
     def backup_recording(self, recording_data: Dict[str, Any], prefix: str = "backup") -> str:
         """Cria backup de uma gravação"""
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{prefix}_{timestamp}.json"
+        filename = f"{prefix}_{timestamp}{BINARY_EXTENSION}"
         filepath = os.path.join(self.recordings_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(recording_data, f, indent=2, ensure_ascii=False)
+        compression, delta = self.get_save_options()
+        write_recording(filepath, recording_data, compression, delta)
+        self.register_recording(filepath, recording_data)
             
         return filepath
         
@@ -188,7 +204,7 @@ class FileManager:
         Retorna número de arquivos removidos
         """
         recordings = self.list_recordings()
-        removed_count = 0
+        removed: List[str] = []
         
         # Remove por quantidade
         if len(recordings) > max_files:
@@ -196,7 +212,7 @@ class FileManager:
             for recording in excess_files:
                 try:
                     os.remove(recording["filepath"])
-                    removed_count += 1
+                    removed.append(recording["filepath"])
                 except OSError:
                     pass
                     
@@ -205,12 +221,14 @@ class FileManager:
         for recording in recordings:
             try:
                 modified_date = datetime.datetime.fromisoformat(recording["modified_at"])
-                if modified_date < cutoff_date:
+                if modified_date < cutoff_date and recording["filepath"] not in removed:
                     os.remove(recording["filepath"])
-                    removed_count += 1
+                    removed.append(recording["filepath"])
             except (ValueError, OSError):
                 pass
                 
+        self.library.remove(removed)
+        removed_count = len(removed)
         return removed_count
 
 
@@ -281,6 +299,10 @@ class PerformanceMonitor:
     Coleta métricas de uso e performance
     """
     
+    # Intervalo mínimo (segundos) entre gravações do arquivo por relatórios de timing;
+    # o restante é salvo por flush() ao fim da reprodução
+    TIMING_SAVE_INTERVAL = 30.0
+    
     def __init__(self):
         self.metrics = {
             "recording_sessions": 0,
@@ -292,6 +314,8 @@ class PerformanceMonitor:
             "errors_count": 0,
             "last_session": None
         }
+        self._timing_dirty = False
+        self._last_timing_save = time.monotonic()
         self.load_metrics()
         
     def load_metrics(self) -> None:
@@ -311,6 +335,13 @@ class PerformanceMonitor:
                 json.dump(self.metrics, f, indent=2, ensure_ascii=False)
         except OSError:
             pass
+        self._timing_dirty = False
+        self._last_timing_save = time.monotonic()
+            
+    def flush(self) -> None:
+        """Salva relatórios de timing ainda não gravados (fim da reprodução, fechamento)"""
+        if self._timing_dirty:
+            self.save_metrics()
             
     def record_recording_session(self, duration: float, events_count: int) -> None:
         """Registra uma sessão de gravação"""
@@ -351,6 +382,42 @@ class PerformanceMonitor:
         
         self.save_metrics()
         
+    def record_playback_timing(self, report: Dict[str, Any]) -> None:
+        """
+        Registra o relatório de timing de uma repetição da reprodução
+        (desvio acumulado e percentis do atraso por evento, em segundos)
+        O arquivo é regravado no máximo a cada TIMING_SAVE_INTERVAL segundos
+        """
+        lateness = report.get("lateness", {})
+        entry = {
+            "repetition": report.get("repetition", 0),
+            "drift": report.get("drift", 0.0),
+            "p50": lateness.get("p50", 0.0),
+            "p95": lateness.get("p95", 0.0),
+            "p99": lateness.get("p99", 0.0),
+            "max": lateness.get("max", 0.0),
+            "events": lateness.get("count", 0),
+            "skipped": report.get("skipped", 0),
+            "timestamp": datetime.datetime.now().isoformat()
+        }
+        
+        if "playback_timing_log" not in self.metrics:
+            self.metrics["playback_timing_log"] = []
+            
+        self.metrics["playback_timing_log"].append(entry)
+        # Bucket aberto (acima do último limite) como null: JSON não tem Infinity
+        self.metrics["last_playback_buckets"] = [
+            [None if math.isinf(upper) else upper, count] for upper, count in report.get("buckets", [])
+        ]
+        
+        # Mantém apenas as últimas 50 repetições
+        if len(self.metrics["playback_timing_log"]) > 50:
+            self.metrics["playback_timing_log"] = self.metrics["playback_timing_log"][-50:]
+            
+        self._timing_dirty = True
+        if time.monotonic() - self._last_timing_save >= self.TIMING_SAVE_INTERVAL:
+            self.save_metrics()
+        
     def record_error(self, error_type: str, error_message: str) -> None:
         """Registra um erro"""
         self.metrics["errors_count"] += 1
@@ -387,6 +454,26 @@ class PerformanceMonitor:
             last = self.metrics["last_session"]
             report.append(f"\nÚltima sessão: {last['type']} - {last['duration']:.2f}s")
             
+        timing_log = self.metrics.get("playback_timing_log")
+        if timing_log:
+            report.append("\n=== ATRASO NA REPRODUÇÃO (por evento) ===")
+            report.append(f"{'Repetição':>9}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'máx':>9}  {'desvio':>9}  {'pulados':>7}")
+            for entry in timing_log[-10:]:
+                report.append(
+                    f"{entry['repetition']:>9}  {entry['p50'] * 1000:>7.3f}ms  {entry['p95'] * 1000:>7.3f}ms  "
+                    f"{entry['p99'] * 1000:>7.3f}ms  {entry['max'] * 1000:>7.3f}ms  {entry['drift'] * 1000:>+7.2f}ms  "
+                    f"{entry.get('skipped', 0):>7}"
+                )
+                
+            buckets = self.metrics.get("last_playback_buckets", [])
+            if buckets:
+                report.append("\nDistribuição da última repetição:")
+                largest = max(count for _, count in buckets)
+                for bound, count in buckets:
+                    label = f"≤ {bound * 1000:g}ms" if bound is not None and bound != float("inf") else "> 10s"
+                    bar = "█" * max(1, round(count / largest * 30))
+                    report.append(f"  {label:>12} {bar} {count}")
+            
         return "\n".join(report)
 
 